@@ -0,0 +1,126 @@
+"""
+Affinity-law speed conversion for the Pump Selection Tool.
+
+At speed ratio r = n2 / n1 a pump delivers Q2 = r * Q1 at H2 = r² * H1.
+With curves fitted over the relative flow Q / max_flow, rescaling a curve
+is just multiplying its coefficients by r² and its flow range by r, so the
+whole catalog is converted to another frequency or VFD speed in one step.
+"""
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Tuple
+from curve_fits import CurveFits, horner
+from config import AFFINITY
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def affinity_scale(
+    coefficients: np.ndarray,
+    max_flow: np.ndarray,
+    ratios: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale fitted curves to other speeds with the affinity laws.
+    Args:
+        coefficients (np.ndarray): (n, degree + 1) coefficients over Q / max_flow
+        max_flow (np.ndarray): Largest fitted flow per curve (LPM)
+        ratios (np.ndarray): Speed ratio per curve (target / native speed)
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Rescaled (coefficients, max_flow)
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+    return coefficients * (ratios ** 2)[:, None], max_flow * ratios
+
+
+class SpeedEngine:
+    """
+    Fitted curves of every pump (by catalog position) at any frequency.
+
+    Rescaled curve sets are cached per target frequency, so repeated
+    searches at the same speed reuse them.
+    """
+
+    def __init__(self, fits: CurveFits, curve_rows: np.ndarray, native_hz: np.ndarray):
+        # Pumps without a curve (row -1) pick a trailing all-NaN row, which
+        # also covers a catalog with no curve data at all
+        coefficients = np.vstack((fits.coefficients, np.full((1, fits.degree + 1), np.nan)))
+        max_flow = np.append(fits.max_flow, np.nan)
+        self._coefficients = coefficients[curve_rows]
+        self._max_flow = max_flow[curve_rows]
+        self.native_hz = np.asarray(native_hz, dtype=np.float64)
+        self._cache: "OrderedDict[float, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ratios(self, target_hz: Optional[float]) -> np.ndarray:
+        """
+        Speed ratio of every pump for a target frequency.
+        Args:
+            target_hz (Optional[float]): Target frequency, None for native speed
+        Returns:
+            np.ndarray: target / native frequency (NaN where the native frequency is unknown)
+        """
+        if target_hz is None:
+            return np.ones(len(self.native_hz))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = target_hz / self.native_hz
+        return np.where(self.native_hz > 0, ratios, np.nan)
+
+    def curves_at(self, target_hz: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fitted curves of every pump rescaled to a target frequency (cached per frequency).
+        Args:
+            target_hz (Optional[float]): Target frequency, None for native speed
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Read-only (coefficients, max_flow) by pump
+                position; NaN for pumps without a curve or a known frequency
+        """
+        key = None if target_hz is None else float(target_hz)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        curves = affinity_scale(self._coefficients, self._max_flow, self.ratios(key))
+        for values in curves:
+            values.setflags(write=False)
+        with self._lock:
+            self._cache[key] = curves
+            while len(self._cache) > AFFINITY["cache_size"]:
+                self._cache.popitem(last=False)
+        return curves
+
+    def minimum_speed(self, positions: np.ndarray, flow_lpm: float, head_m: float) -> np.ndarray:
+        """
+        Lowest speed at which each pump reaches the duty point, by vectorized bisection
+        on the speed ratio within AFFINITY's VFD range.
+        Args:
+            positions (np.ndarray): Pump positions
+            flow_lpm (float): Duty flow in LPM
+            head_m (float): Duty head in meters
+        Returns:
+            np.ndarray: Minimum frequency in Hz per pump (NaN if unreachable)
+        """
+        coefficients = self._coefficients[positions]
+        max_flow = self._max_flow[positions]
+
+        def reaches(ratio):
+            # Duty flow within the rescaled flow range and rescaled head at that flow >= duty head
+            scaled_max_flow = max_flow * ratio
+            heads = horner(coefficients * (ratio ** 2)[:, None], flow_lpm / scaled_max_flow)
+            return (flow_lpm <= scaled_max_flow) & (heads >= head_m)
+
+        low = np.full(len(positions), AFFINITY["min_speed_ratio"])
+        high = np.full(len(positions), AFFINITY["max_speed_ratio"])
+        reachable = reaches(high)
+        at_minimum = reaches(low)
+        for _ in range(AFFINITY["iterations"]):
+            middle = (low + high) / 2
+            ok = reaches(middle)
+            high = np.where(ok, middle, high)
+            low = np.where(ok, low, middle)
+
+        ratio = np.where(at_minimum, AFFINITY["min_speed_ratio"], high)
+        return np.where(reachable, ratio * self.native_hz[positions], np.nan)
+
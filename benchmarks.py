@@ -0,0 +1,286 @@
+"""
+Benchmarks for the Pump Selection Tool's numerical code.
+
+Each benchmark times one component against the current data, or a
+synthetic catalog of a given size, and prints the results. Correctness
+checks live in tests/ and run with pytest.
+
+Usage:
+    python benchmarks.py                      # all benchmarks on the current data
+    python benchmarks.py curve_fits --synthetic 100000
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from catalog import PumpCatalog, synthetic_catalog
+import logging
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS: Dict[str, Callable[[PumpCatalog], None]] = {}
+
+def benchmark(func: Callable[[PumpCatalog], None]) -> Callable[[PumpCatalog], None]:
+    """Register a benchmark under its name without the bench_ prefix."""
+    BENCHMARKS[func.__name__[len("bench_"):]] = func
+    return func
+
+def best_of(run: Callable[[], object], repeat: int = 20) -> float:
+    """Fastest of several runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+@benchmark
+def bench_curves(catalog: PumpCatalog) -> None:
+    """Memory of the wide curve table against the ragged store, and the store's build time."""
+    from curves import CurveStore
+
+    # The wide table as the loader delivers it: one object column per head value
+    long = catalog.curve_store.long_frame()
+    wide = long.pivot(index="Model No.", columns="Head (M)", values="Flow (LPM)")
+    wide.columns = [f"{head:g}M" for head in wide.columns]
+    wide = wide.reset_index().astype(object)
+    store = CurveStore(wide)
+    wide_bytes = int(wide.memory_usage(deep=True).sum())
+    print(f"{len(store)} models, {len(store.points)} points")
+    print(f"wide object table: {wide_bytes:,} bytes, ragged store: {store.nbytes():,} bytes")
+    print(f"store built in {best_of(lambda: CurveStore(wide), repeat=5):.1f} ms")
+
+# Redraws the plot 20 times once rendered and appends median/p95 frame times to the page
+FRAME_TIME_SCRIPT = """
+var gd = document.getElementById('{plot_id}');
+var xmax = gd._fullLayout.xaxis.range[1], times = [];
+function step(i) {
+    if (i >= 20) {
+        times.sort(function(a, b) { return a - b; });
+        document.body.insertAdjacentHTML('beforeend', '<pre>frame time (ms): median '
+            + times[10].toFixed(1) + ', p95 ' + times[18].toFixed(1) + '</pre>');
+        return;
+    }
+    var t0 = performance.now();
+    Plotly.relayout(gd, {'xaxis.range': [0, xmax * (i % 2 ? 0.8 : 1.0)]}).then(function() {
+        requestAnimationFrame(function() { times.push(performance.now() - t0); step(i + 1); });
+    });
+}
+step(0);
+"""
+
+@benchmark
+def bench_charts(catalog: PumpCatalog, n_pumps: int = 40) -> None:
+    """
+    Websocket payload of a 1-pump and a 10-pump chart with and without compact
+    serialization, then figure JSON size and build time of an n-pump comparison
+    with SVG and WebGL traces. Writes an HTML file per mode that reports the
+    browser frame time when opened.
+    """
+    import plotly.io as pio
+    from config import CHART_RENDERING
+    from visualization import create_pump_curve_chart, create_comparison_chart
+
+    store = catalog.curve_store
+    models = store.models[:n_pumps]
+    saved = dict(CHART_RENDERING)
+    try:
+        for compact in [False, True]:
+            CHART_RENDERING["compact_payload"] = compact
+            # Streamlit sends exactly this JSON on every rerun that draws the chart
+            single = len(pio.to_json(create_pump_curve_chart(store, models[0], 100, 20), validate=False))
+            ten = len(pio.to_json(create_comparison_chart(store, models[:10], 100, 20), validate=False))
+            print(f"compact={compact}: 1 pump {single:,} bytes, 10 pumps {ten:,} bytes")
+        for mode, threshold in [("svg", len(models)), ("webgl", 0)]:
+            CHART_RENDERING["webgl_threshold"] = threshold
+            start = time.perf_counter()
+            fig = create_comparison_chart(store, models, 100, 20)
+            elapsed = (time.perf_counter() - start) * 1000
+            path = f"comparison_{mode}_{len(models)}.html"
+            fig.write_html(path, include_plotlyjs="cdn", post_script=FRAME_TIME_SCRIPT)
+            print(f"{mode}: {len(models)} pumps, {len(fig.to_json()):,} bytes JSON, built in {elapsed:.1f} ms -> {path}")
+    finally:
+        CHART_RENDERING.update(saved)
+
+@benchmark
+def bench_curve_fits(catalog: PumpCatalog) -> None:
+    """Fit time and quality of every curve, and one evaluation of all fits."""
+    from curve_fits import CurveFits
+
+    start = time.perf_counter()
+    fits = CurveFits(catalog.curve_store)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(fits)} models fitted (degree {fits.degree}) in {elapsed:.1f} ms")
+    print(f"median R² {np.nanmedian(fits.r2):.4f}, median RMSE {np.nanmedian(fits.rmse):.2f} m")
+    flows = np.random.default_rng(0).uniform(0, 1, len(fits)) * fits.max_flow
+    print(f"whole catalog evaluated in {best_of(lambda: fits.heads(flows)):.3f} ms")
+
+@benchmark
+def bench_operating_points(catalog: PumpCatalog) -> None:
+    """Operating points of the whole catalog on one system curve."""
+    from operating_point import solve_operating_points
+
+    coefficients, max_flow = catalog.speeds.curves_at(None)
+    flows, _ = solve_operating_points(coefficients, max_flow, 10.0, 5.0)
+    elapsed = best_of(lambda: solve_operating_points(coefficients, max_flow, 10.0, 5.0))
+    print(f"{len(flows)} pumps solved in {elapsed:.2f} ms, {np.count_nonzero(~np.isnan(flows))} with an operating point")
+
+@benchmark
+def bench_affinity(catalog: PumpCatalog) -> None:
+    """Rescaling every curve to a frequency (cold and cached), and minimum VFD speeds."""
+    positions = np.arange(len(catalog))
+    for target_hz in [50.0, 60.0, 50.0]:
+        start = time.perf_counter()
+        catalog.speeds.curves_at(target_hz)
+        print(f"curves at {target_hz} Hz in {(time.perf_counter() - start) * 1000:.3f} ms")
+    speeds = catalog.speeds.minimum_speed(positions, 100.0, 10.0)
+    elapsed = best_of(lambda: catalog.speeds.minimum_speed(positions, 100.0, 10.0))
+    print(f"minimum speed of {len(positions)} pumps in {elapsed:.2f} ms, "
+          f"{np.count_nonzero(~np.isnan(speeds))} reachable")
+
+@benchmark
+def bench_combinations(catalog: PumpCatalog) -> None:
+    """Combination search for a duty point beyond any single pump."""
+    from combinations import find_combinations
+
+    flow = float(np.nanmax(catalog.columns["Q Rated/LPM"])) * 1.5
+    head = float(np.nanmax(catalog.columns["Head Rated/M"])) * 0.5
+    params = {
+        "category": None, "frequency": None, "phase": None,
+        "flow_lpm": flow, "head_m": head, "particle_size": 0.0
+    }
+    combinations = find_combinations(catalog, params)
+    elapsed = best_of(lambda: find_combinations(catalog, params), repeat=5)
+    print(f"{len(combinations)} arrangements for {flow:.0f} LPM at {head:.1f} m in {elapsed:.1f} ms")
+    for combination in combinations:
+        print(combination)
+
+@benchmark
+def bench_nearest(catalog: PumpCatalog) -> None:
+    """Nearest-pump index build and query latency per partition."""
+    from nearest import NearestIndex
+
+    start = time.perf_counter()
+    index = NearestIndex(catalog)
+    print(f"index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    rng = np.random.default_rng(0)
+    for category in [None] + catalog.categories[:2]:
+        index.query(100.0, 10.0, 0.0, category=category)  # assemble the partition
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.query(rng.uniform(10, 3000), rng.uniform(1, 80), 0.0, category=category)
+        print(f"category={category}: {(time.perf_counter() - start):.3f} ms/query")
+
+@benchmark
+def bench_pareto(catalog: PumpCatalog, d: int = 3) -> None:
+    """Skyline and front peeling on correlated objectives, one row per pump, against a pairwise scan."""
+    from config import PARETO
+    from pareto import skyline, pareto_order
+
+    n = len(catalog)
+    rng = np.random.default_rng(0)
+    # Correlated objectives, like margin and power across pump sizes
+    size = rng.lognormal(0, 1, n)[:, None]
+    objectives = size * rng.uniform(0.5, 1.5, (n, d))
+    mask = skyline(objectives)
+    print(f"skyline of {n} rows x {d} objectives: {mask.sum()} rows in "
+          f"{best_of(lambda: skyline(objectives), repeat=5):.2f} ms")
+    print(f"{PARETO['max_fronts']} fronts peeled and ordered in "
+          f"{best_of(lambda: pareto_order(objectives), repeat=5):.2f} ms")
+    if n <= 5000:
+        # All pairs at once: O(n²) memory, so only for moderate sizes
+        start = time.perf_counter()
+        dominated = ((objectives[:, None, :] <= objectives[None, :, :]).all(axis=2)
+                     & (objectives[:, None, :] < objectives[None, :, :]).any(axis=2)).any(axis=0)
+        print(f"pairwise scan in {(time.perf_counter() - start) * 1000:.2f} ms, "
+              f"identical: {np.array_equal(~dominated, mask)}")
+
+@benchmark
+def bench_energy(catalog: PumpCatalog) -> None:
+    """Cost pass over the whole catalog next to a plain and a Lifecycle Cost search."""
+    from energy import energy_costs
+    from ranking import run_search
+
+    params = {
+        "category": None, "frequency": None, "phase": None, "flow_lpm": 100.0, "head_m": 10.0,
+        "particle_size": 0.0, "result_percent": 100, "ranking": "Best Match", "friction": 2.0
+    }
+    positions = np.arange(len(catalog))
+    print(f"Best Match search: {best_of(lambda: run_search(catalog, params)):.2f} ms")
+    print(f"costs of all {len(positions)} pumps: "
+          f"{best_of(lambda: energy_costs(catalog, positions, params)):.2f} ms")
+    print(f"Lifecycle Cost search: "
+          f"{best_of(lambda: run_search(catalog, dict(params, ranking='Lifecycle Cost'))):.2f} ms")
+
+@benchmark
+def bench_model_search(catalog: PumpCatalog, size: int = 100000) -> None:
+    """Lookup latency on the catalog and on a large synthetic set of model numbers."""
+    import pandas as pd
+    from model_search import ModelSearchIndex, SEARCH_COLUMNS
+
+    def per_query(index, queries, repeat=200):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                index.search(query)
+        return (time.perf_counter() - start) / (repeat * len(queries)) * 1000
+
+    queries = [str(m)[:n] for m in catalog.pumps[SEARCH_COLUMNS[0]].head(20) for n in (2, 4, 6)] + ["0636", "hp 06", "HP-O636"]
+    start = time.perf_counter()
+    index = ModelSearchIndex(catalog)
+    print(f"{len(index)} keys indexed in {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{per_query(index, queries):.3f} ms/query")
+    for query in ["0636", "hp 06", "HP-O636"]:
+        print(query, "->", [label for label, _, _ in index.search(query)][:5])
+
+    rng = np.random.default_rng(0)
+    series = rng.choice(["HP", "SP", "VS", "DW", "GR"], size)
+    synthetic = pd.DataFrame({
+        "Model No.": [f"{s}-{n:05d}{c}" for s, n, c in zip(series, rng.integers(0, 99999, size), rng.choice(list("ABCT "), size))],
+        "Model": [f"{s}{n}" for s, n in zip(series, rng.integers(0, 99999, size))],
+        "Q Rated/LPM": 100.0, "Head Rated/M": 10.0
+    })
+    start = time.perf_counter()
+    large = ModelSearchIndex(PumpCatalog(synthetic, pd.DataFrame({"Model No.": []})))
+    print(f"{len(large)} synthetic keys indexed in {(time.perf_counter() - start) * 1000:.0f} ms, "
+          f"{per_query(large, ['HP-12', 'SP 4401', 'VS0999', '7731', 'DW-1234B'], repeat=50):.3f} ms/query")
+
+@benchmark
+def bench_export(catalog: PumpCatalog) -> None:
+    """Time and peak memory of a package for the whole catalog (EXPORT["max_datasheets"] datasheets)."""
+    import resource
+    from tempfile import TemporaryFile
+    from export import export_package
+
+    columns = list(catalog.pumps.columns)
+    params = {"flow_lpm": 100.0, "head_m": 10.0, "frequency": None, "friction": 2.0}
+    with TemporaryFile() as archive:
+        summary = export_package(catalog, catalog.id_order, columns, params, archive)
+        size = archive.tell()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{summary} -> {size / 1024:.0f} KB archive, peak RSS {peak:.0f} MB")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the Pump Selection Tool")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks to run, all if none: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Use a synthetic catalog of N pumps instead of the current data")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    if args.synthetic:
+        catalog = synthetic_catalog(args.synthetic)
+    else:
+        from data_loader import load_catalog
+        catalog = load_catalog()
+    print(f"{len(catalog)} pumps, {len(catalog.curve_store)} curves")
+    for name in args.names or list(BENCHMARKS):
+        print(f"\n== {name}")
+        BENCHMARKS[name](catalog)
+    return 0
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""
+Shared, read-only pump catalog for the Pump Selection Tool.
+
+The catalog is built once per process and handed to every Streamlit session.
+Sessions never copy it; they keep only row-position arrays and their query
+parameters and gather rows from the catalog when rendering.
+"""
+import sys
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from curves import CurveStore
+from curve_fits import CurveFits
+from affinity import SpeedEngine
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns coerced to numbers once at build time
+NUMERIC_COLUMNS = [
+    "Q Rated/LPM", "Head Rated/M", "Max Flow (LPM)", "Max Head (M)",
+    "Frequency (Hz)", "Phase", "Pass Solid Dia(mm)", "HP", "Power(KW)"
+]
+
+# Numeric columns where missing values are treated as 0 when filtering
+ZERO_FILLED_COLUMNS = ["Q Rated/LPM", "Head Rated/M", "Pass Solid Dia(mm)"]
+
+
+def _normalize_pumps(pumps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean and type the raw pump table once so sessions never have to.
+    Args:
+        pumps (pd.DataFrame): Raw pump data
+    Returns:
+        pd.DataFrame: Cleaned pump data with a fresh RangeIndex
+    """
+    pumps = pumps.reset_index(drop=True)
+
+    if "Category" in pumps.columns:
+        # Convert all category values to strings and strip whitespace
+        pumps["Category"] = pumps["Category"].astype(str).str.strip()
+        # Replace NaN, None, etc. with empty string for consistent handling
+        pumps["Category"] = pumps["Category"].replace(["nan", "None", "NaN"], "")
+
+    for col in NUMERIC_COLUMNS:
+        if col in pumps.columns:
+            pumps[col] = pd.to_numeric(pumps[col], errors="coerce")
+            if col in ZERO_FILLED_COLUMNS:
+                pumps[col] = pumps[col].fillna(0)
+
+    return pumps
+
+
+def fingerprint(*frames: pd.DataFrame) -> str:
+    """
+    Content hash of one or more DataFrames, computed once at ingest.
+    Args:
+        *frames (pd.DataFrame): Frames to hash (columns and values)
+    Returns:
+        str: Short hex digest identifying the content
+    """
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update("|".join(map(str, frame.columns)).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable cell values (e.g. lists from JSON columns) - hash their text
+            digest.update(pd.util.hash_pandas_object(frame.astype(str), index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    """Return a read-only array so shared columns cannot be mutated in place."""
+    values = np.array(values, copy=True)
+    values.setflags(write=False)
+    return values
+
+
+class PumpCatalog:
+    """
+    Immutable pump and curve catalog shared by all sessions of the process.
+
+    Attributes:
+        pumps (pd.DataFrame): Cleaned pump data (treat as read-only)
+        curve_store (CurveStore): Pump curves as compact ragged arrays
+        curve_fits (CurveFits): Polynomial H(Q) fit of every curve, in curve_store order
+        curve_rows (np.ndarray): Curve row of every pump, -1 without a curve
+        speeds (SpeedEngine): Pump curves rescaled to other frequencies
+        columns (Dict[str, np.ndarray]): Read-only typed columns used for filtering
+        loaded_at (datetime): When the underlying data was loaded
+        checked_at (datetime): When the source was last checked for changes
+        version (str): Content fingerprint - the key for every derived cache
+        source_versions (Tuple[str, ...]): Cheap per-table version probes at load time
+    """
+
+    def __init__(
+        self,
+        pumps: pd.DataFrame,
+        curves: pd.DataFrame,
+        loaded_at: Optional[datetime] = None,
+        source_versions: Tuple[str, ...] = ()
+    ):
+        self.version = fingerprint(pumps, curves)
+        self.source_versions = source_versions
+        self.pumps = _normalize_pumps(pumps)
+        # The wide curve table is packed once and not kept
+        self.curve_store = CurveStore(curves)
+        self.curve_fits = CurveFits(self.curve_store)
+        self.loaded_at = loaded_at or datetime.now()
+        self.checked_at = self.loaded_at
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for col in NUMERIC_COLUMNS:
+            if col in self.pumps.columns:
+                self.columns[col] = _read_only(self.pumps[col].to_numpy(dtype=np.float64))
+        if "Category" in self.pumps.columns:
+            self.columns["Category"] = _read_only(self.pumps["Category"].to_numpy(dtype=object))
+            # Integer codes so category filtering is a plain integer comparison
+            codes, uniques = pd.factorize(self.pumps["Category"])
+            self.columns["Category Code"] = _read_only(codes.astype(np.int32))
+            self._category_codes = {cat: code for code, cat in enumerate(uniques)}
+        else:
+            self._category_codes = {}
+
+        # Default display order (by ID), computed once so searches never sort
+        self.id_order = _read_only(np.arange(len(self.pumps), dtype=np.int64))
+        for sort_column in ["id", "ID", "Model", "Model No."]:
+            if sort_column in self.pumps.columns:
+                self.id_order = _read_only(
+                    np.argsort(self.pumps[sort_column].to_numpy(), kind="stable")
+                )
+                break
+
+        # Option lists are derived once instead of on every rerun
+        self.categories: List[str] = sorted(
+            c for c in self.pumps["Category"].unique()
+            if c and c.strip() and c.lower() not in ["nan", "none"]
+        ) if "Category" in self.pumps.columns else []
+        self.frequencies: List[float] = sorted(
+            pd.unique(self.columns["Frequency (Hz)"][~np.isnan(self.columns["Frequency (Hz)"])])
+        ) if "Frequency (Hz)" in self.columns else []
+        self.phases: List[float] = [
+            p for p in sorted(pd.unique(self.columns["Phase"][~np.isnan(self.columns["Phase"])]))
+            if p in [1, 3]
+        ] if "Phase" in self.columns else []
+        self.curve_models = frozenset(self.curve_store.models)
+        # Curve row of every pump (-1 without a curve), matched on the model
+        # column the curve panel uses
+        key_column = "Model" if "Model" in self.pumps.columns else "Model No."
+        self.curve_rows = _read_only(
+            self.pumps[key_column].map(self.curve_store.model_index).fillna(-1).to_numpy(dtype=np.int64)
+            if key_column in self.pumps.columns else np.full(len(self.pumps), -1, dtype=np.int64)
+        )
+        # Curves of every pump at any frequency, via the affinity laws
+        self.speeds = SpeedEngine(
+            self.curve_fits,
+            self.curve_rows,
+            self.columns.get("Frequency (Hz)", np.full(len(self.pumps), np.nan))
+        )
+
+    def __len__(self) -> int:
+        return len(self.pumps)
+
+    @property
+    def empty(self) -> bool:
+        return self.pumps.empty
+
+    def select(
+        self,
+        category: Optional[str] = None,
+        frequency: Optional[float] = None,
+        phase: Optional[int] = None,
+        min_flow: float = 0.0,
+        min_head: float = 0.0,
+        min_solid: float = 0.0
+    ) -> np.ndarray:
+        """
+        Evaluate all search predicates as one fused mask over the typed columns.
+        Args:
+            category (Optional[str]): Category to match, all if None
+            frequency (Optional[float]): Frequency (Hz) to match, all if None
+            phase (Optional[int]): Phase to match, all if None
+            min_flow (float): Minimum rated flow in LPM, ignored if <= 0
+            min_head (float): Minimum rated head in meters, ignored if <= 0
+            min_solid (float): Minimum passable solid size in mm, ignored if <= 0
+        Returns:
+            np.ndarray: Positions of matching rows, in ID order
+        """
+        mask = np.ones(len(self.pumps), dtype=bool)
+        cols = self.columns
+
+        if category is not None:
+            code = self._category_codes.get(category)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            np.logical_and(mask, cols["Category Code"] == code, out=mask)
+        if frequency is not None and "Frequency (Hz)" in cols:
+            np.logical_and(mask, cols["Frequency (Hz)"] == frequency, out=mask)
+        if phase is not None and "Phase" in cols:
+            np.logical_and(mask, cols["Phase"] == phase, out=mask)
+        if min_flow > 0:
+            np.logical_and(mask, cols["Q Rated/LPM"] >= min_flow, out=mask)
+        if min_head > 0:
+            np.logical_and(mask, cols["Head Rated/M"] >= min_head, out=mask)
+        if min_solid > 0 and "Pass Solid Dia(mm)" in cols:
+            np.logical_and(mask, cols["Pass Solid Dia(mm)"] >= min_solid, out=mask)
+
+        # Walk the precomputed ID order so the result needs no sort
+        return self.id_order[mask[self.id_order]]
+
+    def power_kw(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Motor power of some rows in kW, from HP where kW is missing.
+        Args:
+            positions (np.ndarray): Row positions into the catalog
+        Returns:
+            np.ndarray: Power in kW (inf where neither column is known)
+        """
+        n = len(positions)
+        power = self.columns["Power(KW)"][positions] if "Power(KW)" in self.columns else np.full(n, np.nan)
+        if "HP" in self.columns:
+            power = np.where(np.isnan(power), self.columns["HP"][positions] * 0.7457, power)
+        return np.where(np.isnan(power), np.inf, power)
+
+    def rows(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Gather catalog rows by position, optionally restricted to some columns.
+        Args:
+            positions (np.ndarray): Row positions into the catalog
+            columns (Optional[List[str]]): Columns to gather, all if None
+        Returns:
+            pd.DataFrame: Gathered rows in the order of ``positions``
+        """
+        if columns is None:
+            return self.pumps.iloc[positions]
+        return self.pumps.iloc[positions, self.pumps.columns.get_indexer(columns)]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the catalog, in bytes."""
+        total = int(self.pumps.memory_usage(deep=True).sum())
+        total += self.curve_store.nbytes()
+        total += int(self.curve_fits.coefficients.nbytes)
+        total += sum(int(v.nbytes) for v in self.columns.values())
+        return total
+
+
+def _value_nbytes(value: Any) -> int:
+    """Approximate size of a session-state value, in bytes."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(_value_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_value_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def memory_report(catalog: PumpCatalog, session_state: Mapping[str, Any]) -> Dict[str, int]:
+    """
+    Compare the shared catalog footprint with one session's own state.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        session_state (Mapping[str, Any]): A session's state
+    Returns:
+        Dict[str, int]: Catalog bytes, session bytes and catalog row count
+    """
+    session_bytes = 0
+    for key in list(session_state.keys()):
+        try:
+            session_bytes += _value_nbytes(session_state[key])
+        except Exception:
+            continue
+    return {
+        "catalog_rows": len(catalog),
+        "catalog_bytes": catalog.nbytes(),
+        "session_bytes": session_bytes
+    }
+
+
+class CatalogRefresher:
+    """
+    Keep the shared catalog fresh from a background thread.
+
+    Stale-while-revalidate: readers always get the current catalog
+    immediately, while a daemon thread rebuilds it every ``interval``
+    seconds (or on request) and swaps the new version in atomically.
+    Only the very first load blocks the caller. ``build`` receives the
+    catalog being served and may return it unchanged to skip a swap.
+    """
+
+    def __init__(self, build: Callable[[Optional[PumpCatalog]], PumpCatalog], interval: float):
+        self._build = build
+        self._interval = interval
+        self._catalog: Optional[PumpCatalog] = None
+        self._first_load = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshing = False
+        self.last_error: Optional[str] = None
+
+    def current(self) -> PumpCatalog:
+        """
+        Return the current catalog, loading it synchronously only the first time.
+        Returns:
+            PumpCatalog: The latest successfully built catalog
+        """
+        catalog = self._catalog
+        if catalog is not None:
+            return catalog
+        with self._first_load:
+            if self._catalog is None:
+                self._catalog = self._build(None)
+                self._start()
+        return self._catalog
+
+    def request_refresh(self) -> None:
+        """Ask the background thread to reload now instead of waiting for the schedule."""
+        self._start()
+        self._wake.set()
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="catalog-refresher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            self.refreshing = True
+            try:
+                catalog = self._build(self._catalog)
+                self.last_error = None
+                if catalog is self._catalog:
+                    continue
+                # Reference assignment is atomic - readers see the old or the new version
+                self._catalog = catalog
+                logger.info(f"Catalog refreshed: {len(catalog)} pump records (version {catalog.version})")
+            except Exception as e:
+                # Keep serving the previous version
+                self.last_error = str(e)
+                logger.error(f"Background catalog refresh failed: {str(e)}")
+            finally:
+                self.refreshing = False
+
+
+def format_age(since: datetime, now: Optional[datetime] = None) -> str:
+    """
+    Format the time elapsed since a moment as a short human-readable age.
+    Args:
+        since (datetime): The earlier moment
+        now (Optional[datetime]): Reference time, defaults to datetime.now()
+    Returns:
+        str: Age such as "45s", "12m" or "3h"
+    """
+    seconds = max(0, int(((now or datetime.now()) - since).total_seconds()))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+
+def synthetic_catalog(n: int = 500, seed: int = 0) -> PumpCatalog:
+    """
+    Random but plausible catalog for self-contained checks and benchmarks.
+    Pumps spread over a few categories, 50/60 Hz and 1/3 phase; about two
+    thirds have a curve, some order codes ("Model No.") differ from the curve
+    model ("Model"), and some have no known power.
+    Args:
+        n (int): Number of pumps
+        seed (int): Random seed
+    Returns:
+        PumpCatalog: The synthetic catalog
+    """
+    rng = np.random.default_rng(seed)
+    flow = np.round(rng.lognormal(5, 1, n), 1)
+    head = np.round(rng.lognormal(2.5, 0.7, n), 1)
+    models = [f"SP-{i:04d}" for i in range(n)]
+    # Hydraulic power LPM x m / 6116 kW at 40-75% efficiency
+    power = np.round(flow * head / 6116 / rng.uniform(0.4, 0.75, n), 2)
+    unknown_kw = rng.random(n) < 0.1
+    unknown_hp = unknown_kw & (rng.random(n) < 0.5)
+    pumps = pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "Model": models,
+        "Model No.": [f"{m}-T" if i % 5 == 0 else m for i, m in enumerate(models)],
+        "Category": rng.choice(["Dirty Water", "Clean Water", "Booster", "Sewage", ""], n),
+        "Frequency (Hz)": rng.choice([50, 60], n),
+        "Phase": rng.choice([1, 3], n),
+        "Q Rated/LPM": flow,
+        "Head Rated/M": head,
+        "Max Flow (LPM)": np.round(flow * 1.6, 1),
+        "Max Head (M)": np.round(head * 1.4, 1),
+        "Pass Solid Dia(mm)": rng.choice([0, 5, 8, 10, 25, 50], n),
+        "HP": np.where(unknown_hp, np.nan, np.round(power / 0.7457, 2)),
+        "Power(KW)": np.where(unknown_kw, np.nan, power)
+    })
+
+    # Curves Q(h) = max flow x sqrt(1 - h / shut-off head), keyed on "Model"
+    with_curve = rng.random(n) < 2 / 3
+    heads = [1, 2, 3, 5, 7.5, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100]
+    shut_off = pumps["Max Head (M)"].to_numpy()[with_curve, None]
+    with np.errstate(invalid="ignore"):
+        flows = pumps["Max Flow (LPM)"].to_numpy()[with_curve, None] * np.sqrt(1 - np.array(heads) / shut_off)
+    curves = pd.DataFrame(np.round(flows, 1), columns=[f"{h}M" for h in heads])
+    curves.insert(0, "Model No.", np.array(models)[with_curve])
+    return PumpCatalog(pumps, curves)
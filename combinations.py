@@ -0,0 +1,200 @@
+"""
+Multi-pump combination search for the Pump Selection Tool.
+
+When no single pump meets the duty point, two or more pumps can share it:
+in parallel the flows add at the duty head, in series the heads add at the
+duty flow. Each candidate's contribution is evaluated once, vectorized, and
+the combinatorial space is pruned with rated/max flow and head bounds so it
+stays small for catalogs of thousands of models.
+"""
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional
+from catalog import PumpCatalog
+from operating_point import solve_operating_points
+from curve_fits import horner
+from config import COMBINATIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def flow_at_head(catalog: PumpCatalog, positions: np.ndarray, head_m: float,
+                 target_hz: Optional[float] = None) -> np.ndarray:
+    """
+    Flow each pump delivers against a given head.
+    Pumps with a curve use the fitted curve (capped at the measured range);
+    others are credited their rated flow if their rated head reaches the head.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Pump positions
+        head_m (float): Head in meters
+        target_hz (Optional[float]): Evaluate at this frequency (affinity laws), native if None
+    Returns:
+        np.ndarray: Flow in LPM (0 where the pump cannot reach the head)
+    """
+    coefficients, max_flow = catalog.speeds.curves_at(target_hz)
+    coefficients, max_flow = coefficients[positions], max_flow[positions]
+    ratios = catalog.speeds.ratios(target_hz)[positions]
+
+    flows, _ = solve_operating_points(coefficients, max_flow, head_m, 0.0)
+    # Still above the head at the end of the measured curve - credit the measured range only
+    flows = np.where(horner(coefficients, 1.0) >= head_m, max_flow, flows)
+
+    rated_flow = catalog.columns["Q Rated/LPM"][positions] * ratios
+    rated_head = catalog.columns["Head Rated/M"][positions] * ratios ** 2
+    rated = np.where(rated_head >= head_m, rated_flow, 0.0)
+    has_curve = np.isfinite(max_flow)
+    return np.nan_to_num(np.where(has_curve, flows, rated), nan=0.0)
+
+
+def head_at_flow(catalog: PumpCatalog, positions: np.ndarray, flow_lpm: float,
+                 target_hz: Optional[float] = None) -> np.ndarray:
+    """
+    Head each pump develops at a given flow.
+    Pumps with a curve use the fitted curve (0 beyond the measured range);
+    others are credited their rated head if their rated flow reaches the flow.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Pump positions
+        flow_lpm (float): Flow in LPM
+        target_hz (Optional[float]): Evaluate at this frequency (affinity laws), native if None
+    Returns:
+        np.ndarray: Head in meters (0 where the pump cannot pass the flow)
+    """
+    coefficients, max_flow = catalog.speeds.curves_at(target_hz)
+    coefficients, max_flow = coefficients[positions], max_flow[positions]
+    ratios = catalog.speeds.ratios(target_hz)[positions]
+
+    with np.errstate(invalid="ignore"):
+        heads = np.where(flow_lpm <= max_flow, horner(coefficients, flow_lpm / max_flow), 0.0)
+
+    rated_flow = catalog.columns["Q Rated/LPM"][positions] * ratios
+    rated_head = catalog.columns["Head Rated/M"][positions] * ratios ** 2
+    rated = np.where(rated_flow >= flow_lpm, rated_head, 0.0)
+    has_curve = np.isfinite(max_flow)
+    return np.maximum(np.nan_to_num(np.where(has_curve, heads, rated), nan=0.0), 0.0)
+
+
+def _identical(positions, contribution, required, power, arrangement, max_pumps) -> List[Dict[str, Any]]:
+    """N identical pumps: the smallest N whose summed contribution meets the requirement."""
+    with np.errstate(divide="ignore"):
+        count = np.ceil(required / contribution)
+    count = np.maximum(count, 2)
+    ok = (contribution > 0) & (count <= max_pumps)
+    return [
+        {"arrangement": arrangement, "positions": (int(p),) * int(n), "total_power": float(w) * int(n)}
+        for p, n, w in zip(positions[ok], count[ok], power[ok])
+    ]
+
+
+def _mixed_pairs(positions, contribution, required, power, arrangement) -> List[Dict[str, Any]]:
+    """
+    Two different pumps: for each pump, the lowest-power partner that covers the rest.
+    Candidates are sorted by contribution so the feasible partners are a suffix,
+    and a suffix minimum of power gives each pump's best partner in O(n log n).
+    """
+    useful = contribution > 0
+    positions, contribution, power = positions[useful], contribution[useful], power[useful]
+    if len(positions) < 2:
+        return []
+    order = np.argsort(contribution, kind="stable")
+    positions, contribution, power = positions[order], contribution[order], power[order]
+
+    # Index of the lowest-power pump in every suffix: the "records" (pumps using no
+    # more power than any later one) have non-decreasing power, so the first record
+    # at or after i is the minimum of suffix i
+    suffix_min = np.minimum.accumulate(power[::-1])[::-1]
+    records = np.flatnonzero(power == suffix_min)
+    suffix_best = records[np.searchsorted(records, np.arange(len(power)))]
+
+    start = np.searchsorted(contribution, required - contribution, side="left")
+    has_partner = start < len(positions)
+    partner = np.where(has_partner, suffix_best[np.minimum(start, len(positions) - 1)], -1)
+    # A pump that is its own best partner is covered by the identical pair, which costs less
+    ok = has_partner & (partner != np.arange(len(positions)))
+    pairs = set()
+    results = []
+    for a, b in zip(np.flatnonzero(ok), partner[ok]):
+        key = (min(a, b), max(a, b))
+        if key in pairs:
+            continue
+        pairs.add(key)
+        results.append({
+            "arrangement": arrangement,
+            "positions": (int(positions[key[0]]), int(positions[key[1]])),
+            "total_power": float(power[a] + power[b])
+        })
+    return results
+
+
+def find_combinations(catalog: PumpCatalog, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Find parallel and series arrangements that meet the searched duty point.
+    Tries N identical pumps (up to COMBINATIONS["max_pumps"]) and pairs of different
+    pumps, in parallel and in series, within COMBINATIONS["time_budget"] seconds.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        params (Dict[str, Any]): Search parameters of the failed search
+    Returns:
+        List[Dict[str, Any]]: Up to COMBINATIONS["max_results"] arrangements
+            (arrangement, positions, total_power), lowest total power and fewest pumps first
+    """
+    flow_lpm, head_m = params["flow_lpm"], params["head_m"]
+    if flow_lpm <= 0 or head_m <= 0:
+        return []
+    deadline = time.monotonic() + COMBINATIONS["time_budget"]
+    max_pumps = COMBINATIONS["max_pumps"]
+    target_hz = params["frequency"] if params.get("speed_conversion") else None
+
+    # Same category/frequency/phase/solid filters as the search, without the duty point
+    candidates = catalog.select(
+        category=params["category"],
+        frequency=None if target_hz is not None else params["frequency"],
+        phase=params["phase"],
+        min_solid=params["particle_size"]
+    )
+    ratios = catalog.speeds.ratios(target_hz)[candidates]
+    candidates = candidates[~np.isnan(ratios)]
+    ratios = ratios[~np.isnan(ratios)]
+    cols = catalog.columns
+
+    def bound(column, rated_column, scale):
+        # Upper bound per candidate; missing max values fall back to the rated ones
+        rated = cols[rated_column][candidates]
+        values = cols[column][candidates] if column in cols else rated
+        return np.where(np.isnan(values), rated, values) * scale
+
+    max_flow = bound("Max Flow (LPM)", "Q Rated/LPM", ratios)
+    max_head = bound("Max Head (M)", "Head Rated/M", ratios ** 2)
+
+    results: List[Dict[str, Any]] = []
+    stages = [
+        # In parallel every pump must reach the duty head; identical pumps must
+        # also carry the flow together
+        ("parallel", max_head >= head_m, max_flow * max_pumps >= flow_lpm,
+         lambda positions: flow_at_head(catalog, positions, head_m, target_hz), flow_lpm),
+        # In series every pump must pass the duty flow; identical pumps must
+        # also lift the head together
+        ("series", max_flow >= flow_lpm, max_head * max_pumps >= head_m,
+         lambda positions: head_at_flow(catalog, positions, flow_lpm, target_hz), head_m),
+    ]
+    for arrangement, reaches, scales, contribution_of, required in stages:
+        if time.monotonic() > deadline:
+            logger.info(f"Combination search stopped at the time budget before {arrangement}")
+            break
+        positions = candidates[reaches]
+        contribution = contribution_of(positions)
+        power = catalog.power_kw(positions)
+        # The N-pump bound only prunes identical arrangements: a weak pump can
+        # still be the cheapest partner of a strong one in a mixed pair
+        identical = scales[reaches]
+        results.extend(_identical(
+            positions[identical], contribution[identical], required, power[identical], arrangement, max_pumps
+        ))
+        if time.monotonic() <= deadline:
+            results.extend(_mixed_pairs(positions, contribution, required, power, arrangement))
+
+    results.sort(key=lambda r: (r["total_power"], len(r["positions"]), r["positions"]))
+    return results[:COMBINATIONS["max_results"]]
+
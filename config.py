@@ -8,6 +8,12 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# Data Source Configuration
+DATA_SOURCE = {
+    "backend": os.getenv("PUMP_DATA_BACKEND", "supabase"),  # supabase, sqlite or csv
+    "sqlite_path": os.getenv("PUMP_SQLITE_PATH", "pump_data.db")
+}
+
 # Default Values
 DEFAULT_VALUES = {
     "floors": 0,
@@ -19,7 +25,8 @@ DEFAULT_VALUES = {
     "underground_depth": 0.0,
     "particle_size": 0.0,
     "flow_value": 0.0,
-    "head_value": 0.0
+    "head_value": 0.0,
+    "friction": 0.0  # m per (m³/min)² - 0 means static head only
 }
 
 # Flow Unit Conversions
@@ -60,6 +67,90 @@ ERROR_MESSAGES = {
 # Chart Colors
 CHART_COLORS = ['blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
 
+# Chart Rendering Configuration
+CHART_RENDERING = {
+    "parallel_threshold": 4,  # build individual curves on the pool from this many pumps
+    "max_workers": 4,  # threads building individual curve figures
+    "webgl_threshold": 12,  # comparison charts with more pumps use WebGL traces
+    "max_points_per_curve": 200,  # denser curves are downsampled (LTTB)
+    "large_colorscale": "Turbo",  # colors sampled when pumps outnumber CHART_COLORS
+    "compact_payload": True,  # shared template, rounded coordinates, deduplicated styling
+    "decimals": 1  # rounding of plotted flow/head values
+}
+
+# Curve Fitting Configuration
+CURVE_FITTING = {
+    "degree": 2,  # polynomial degree of the fitted H(Q) curves
+    "parallel_threshold": 50000,  # fit on a process pool from this many models
+    "chunk_size": 10000,  # models per worker task
+    "max_workers": None,  # worker processes (None = CPU count)
+    "start_method": "spawn"  # workers start fresh rather than forking the server
+}
+
+# System Curve Configuration
+SYSTEM_CURVE = {
+    "iterations": 48  # bisection steps when solving operating points
+}
+
+# Affinity-Law Speed Conversion Configuration
+AFFINITY = {
+    "min_speed_ratio": 0.5,  # lowest VFD speed considered, relative to native
+    "max_speed_ratio": 1.2,  # highest speed considered (e.g. a 50 Hz pump at 60 Hz)
+    "iterations": 40,  # bisection steps of the minimum-speed solver
+    "cache_size": 8  # rescaled curve sets kept (one per target frequency)
+}
+
+# Multi-Pump Combination Search Configuration
+COMBINATIONS = {
+    "max_pumps": 4,  # most identical pumps in one arrangement
+    "max_results": 10,  # arrangements suggested
+    "time_budget": 0.5  # seconds before remaining stages are skipped
+}
+
+# Nearest-Pump Suggestion Configuration
+NEAREST = {
+    "k": 5  # closest pumps suggested when nothing matches
+}
+
+# Pareto Ranking Configuration
+PARETO = {
+    "block_size": 32,  # candidates compared per vectorized skyline step
+    "max_fronts": 10  # fronts peeled; pumps beyond them are ordered by rank sum only
+}
+
+# Energy Cost Configuration
+ENERGY = {
+    "duty_hours": 2000,  # default running hours per year
+    "tariff": 0.15,  # default electricity price per kWh
+    "lifetime_years": 10,  # default service life
+    "discount_rate": 0.05  # yearly rate for the present value of future energy bills
+}
+
+# Model Lookup Configuration
+MODEL_SEARCH = {
+    "max_results": 8,  # matches listed while typing
+    "min_similarity": 0.25  # trigram similarity needed for a fuzzy match
+}
+
+# Bulk Export Configuration
+EXPORT = {
+    "chunk_size": 500,  # result rows gathered per CSV/Excel chunk
+    "max_datasheets": 300,  # models rendered per package
+    "batch_size": 8,  # datasheets per worker task
+    "max_workers": None,  # process pool size, min(4, CPUs) if None
+    "start_method": "spawn",  # workers start fresh rather than forking the server
+    "time_budget": 120,  # seconds before remaining datasheets are skipped
+    "max_archive_mb": 200  # largest package offered for download
+}
+
+# Load Test Configuration (loadtest.py)
+LOAD_TEST = {
+    "sessions": 50,  # simulated sessions per run
+    "concurrency": 4,  # concurrent sessions (one worker process each)
+    "timeout": 60,  # seconds allowed per rerun
+    "tolerance": 0.2  # relative change reported as a regression
+}
+
 # Page Configuration
 PAGE_CONFIG = {
     "page_title": "Pump Selector",
@@ -69,5 +160,16 @@ PAGE_CONFIG = {
 # Data Loading Configuration
 DATA_LOADING = {
     "page_size": 1000,
-    "cache_ttl": 60  # seconds
-} 
\ No newline at end of file
+    "cache_ttl": 60,  # seconds
+    "request_timeout": 5,  # seconds per Supabase request
+    "load_deadline": 15,  # seconds for a whole table load
+    "breaker_failure_threshold": 3,  # consecutive failures before skipping Supabase
+    "breaker_reset_timeout": 30,  # seconds between background recovery probes
+    "pump_csv": "Pump Selection Data.csv",
+    "curve_csv": "pump_curve_data_rows 1.csv"
+}
+
+# Results Paging Configuration
+RESULTS_PAGING = {
+    "page_size": 50  # rows sent to the browser per page
+} 
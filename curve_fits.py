@@ -0,0 +1,177 @@
+"""
+Parametric head-flow fits for every pump curve.
+
+Each model's curve points are fitted once at load time to a low-order
+polynomial H(Q). The coefficients of all models live in one contiguous
+array, so evaluating any set of pumps at any flows is a single vectorized
+polynomial evaluation instead of a walk over the wide curve table.
+"""
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from curves import CurveStore
+from config import CURVE_FITTING
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def horner(coefficients: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Evaluate polynomials with ascending coefficients, one row per polynomial.
+    Args:
+        coefficients (np.ndarray): (..., degree + 1) coefficients c0, c1, ...
+        x (np.ndarray): Points, broadcastable against coefficients[..., 0]
+    Returns:
+        np.ndarray: Polynomial values
+    """
+    result = np.zeros(np.broadcast_shapes(coefficients.shape[:-1], np.shape(x)))
+    for k in range(coefficients.shape[-1] - 1, -1, -1):
+        result = result * x + coefficients[..., k]
+    return result
+
+
+def _fit_block(points: np.ndarray, offsets: np.ndarray, degree: int) -> Tuple[np.ndarray, ...]:
+    """
+    Least-squares fit of every model in a block of the curve store at once.
+    Models with too few points get the highest degree their points allow;
+    models with fewer than two points are left unfitted (NaN).
+    Args:
+        points (np.ndarray): (n, 2) [flow, head] points, sorted by flow per model
+        offsets (np.ndarray): Per-model offsets into points (starting at 0)
+        degree (int): Polynomial degree
+    Returns:
+        Tuple[np.ndarray, ...]: (coefficients, max flow, R², RMSE) per model
+    """
+    n_models = len(offsets) - 1
+    counts = np.diff(offsets)
+    owner = np.repeat(np.arange(n_models), counts)
+    flows = points[:, 0].astype(np.float64)
+    heads = points[:, 1].astype(np.float64)
+
+    # Flows are fitted relative to each model's largest flow to keep the
+    # normal equations well conditioned
+    max_flow = np.full(n_models, np.nan)
+    has_points = counts > 0
+    max_flow[has_points] = flows[offsets[1:][has_points] - 1]
+    x = flows / max_flow[owner]
+
+    coefficients = np.full((n_models, degree + 1), np.nan)
+    model_degree = np.minimum(degree, counts - 1)
+    for d in range(1, degree + 1):
+        models = np.flatnonzero(model_degree == d)
+        if not len(models):
+            continue
+        selected = np.isin(owner, models)
+        local = np.searchsorted(models, owner[selected])
+        powers = x[selected, None] ** np.arange(d + 1)
+        # Per-model normal equations, accumulated with bincount and solved as one stack
+        gram = np.empty((len(models), d + 1, d + 1))
+        rhs = np.empty((len(models), d + 1))
+        for i in range(d + 1):
+            rhs[:, i] = np.bincount(local, powers[:, i] * heads[selected], minlength=len(models))
+            for j in range(i, d + 1):
+                gram[:, i, j] = gram[:, j, i] = np.bincount(local, powers[:, i] * powers[:, j], minlength=len(models))
+        coefficients[models, :d + 1] = (np.linalg.pinv(gram) @ rhs[..., None])[..., 0]
+        coefficients[models, d + 1:] = 0.0
+
+    # Fit quality per model
+    residuals = horner(coefficients[owner], x) - heads
+    safe_counts = np.maximum(counts, 1)
+    ss_res = np.bincount(owner, residuals ** 2, minlength=n_models)
+    mean_head = np.bincount(owner, heads, minlength=n_models) / safe_counts
+    ss_tot = np.bincount(owner, (heads - mean_head[owner]) ** 2, minlength=n_models)
+    fitted = model_degree >= 1
+    rmse = np.where(fitted, np.sqrt(ss_res / safe_counts), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(fitted & (ss_tot > 0), 1.0 - ss_res / ss_tot, np.nan)
+
+    return coefficients, max_flow, r2, rmse
+
+
+class CurveFits:
+    """
+    Polynomial H(Q) fits of all curves in a CurveStore, in store order.
+
+    Attributes:
+        degree (int): Polynomial degree (lower for models with few points)
+        coefficients (np.ndarray): (n_models, degree + 1) C-contiguous ascending
+            coefficients over the relative flow Q / max_flow
+        max_flow (np.ndarray): Largest measured flow per model (LPM)
+        r2 (np.ndarray): Coefficient of determination per model (NaN if unfitted)
+        rmse (np.ndarray): Root-mean-square head error per model in meters
+        model_index (Dict[str, int]): Row of each model number
+    """
+
+    def __init__(self, store: CurveStore, degree: Optional[int] = None):
+        self.degree = degree or CURVE_FITTING["degree"]
+        self.model_index: Dict[str, int] = store.model_index
+
+        n_models = len(store)
+        chunk = CURVE_FITTING["chunk_size"]
+        if n_models >= CURVE_FITTING["parallel_threshold"]:
+            # Fit blocks of models on worker processes. Forking the Streamlit
+            # server (the Linux default) would copy its threads and locks
+            bounds = list(range(0, n_models, chunk)) + [n_models]
+            blocks = [
+                (store.points[store.offsets[a]:store.offsets[b]], store.offsets[a:b + 1] - store.offsets[a], self.degree)
+                for a, b in zip(bounds[:-1], bounds[1:])
+            ]
+            with ProcessPoolExecutor(
+                max_workers=CURVE_FITTING["max_workers"],
+                mp_context=multiprocessing.get_context(CURVE_FITTING["start_method"])
+            ) as pool:
+                results = list(pool.map(_fit_block, *zip(*blocks)))
+            parts = [np.concatenate(arrays) for arrays in zip(*results)]
+        else:
+            parts = _fit_block(store.points, store.offsets, self.degree)
+
+        self.coefficients, self.max_flow, self.r2, self.rmse = (
+            np.ascontiguousarray(part) for part in parts
+        )
+        for values in [self.coefficients, self.max_flow, self.r2, self.rmse]:
+            values.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.max_flow)
+
+    def heads(
+        self,
+        flows,
+        indices: Optional[np.ndarray] = None,
+        extrapolate: bool = False
+    ) -> np.ndarray:
+        """
+        Fitted head at the given flows, for some or all models at once.
+        Args:
+            flows: Flow in LPM - a scalar, one value per model, or any array
+                broadcastable against the selected models
+            indices (Optional[np.ndarray]): Model rows to evaluate, all if None
+            extrapolate (bool): Evaluate beyond [0, max flow] instead of returning NaN
+        Returns:
+            np.ndarray: Head in meters
+        """
+        coefficients = self.coefficients if indices is None else self.coefficients[indices]
+        max_flow = self.max_flow if indices is None else self.max_flow[indices]
+        flows = np.asarray(flows, dtype=np.float64)
+        result = horner(coefficients, flows / max_flow)
+        if not extrapolate:
+            result = np.where((flows >= 0) & (flows <= max_flow), result, np.nan)
+        return result
+
+    def head(self, model_no: str, flow: float) -> Optional[float]:
+        """
+        Fitted head of one model at one flow.
+        Args:
+            model_no (str): Model number
+            flow (float): Flow in LPM
+        Returns:
+            Optional[float]: Head in meters, None if unknown or out of range
+        """
+        i = self.model_index.get(model_no)
+        if i is None:
+            return None
+        value = float(self.heads(flow, np.array([i]))[0])
+        return None if np.isnan(value) else value
+
@@ -0,0 +1,294 @@
+"""
+Pump curve panel for the Pump Selection Tool.
+
+The panel runs as a fragment: picking pumps or clicking "Show Curves"
+reruns only this panel, never the data loading or the search.
+"""
+import streamlit as st
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional
+from catalog import PumpCatalog
+from operating_point import solve_operating_points
+from energy import energy_costs
+from visualization import create_pump_curve_chart, create_pump_curve_charts, create_comparison_chart
+from config import CHART_RENDERING
+from translations import get_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _individual_figures(catalog: PumpCatalog, models: List[str], user_flow: float, user_head: float) -> Dict[str, Any]:
+    """Individual curve figures for the selected pumps, reused while the selection is unchanged."""
+    cache_key = (catalog.version, tuple(models), user_flow, user_head)
+    cached = st.session_state.get('individual_curve_figures')
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    figures = create_pump_curve_charts(catalog.curve_store, models, user_flow, user_head)
+    st.session_state.individual_curve_figures = (cache_key, figures)
+    return figures
+
+def _operating_point_notes(
+    catalog: PumpCatalog,
+    model_positions: Dict[str, int],
+    user_flow: float,
+    user_head: float
+) -> Dict[str, List[str]]:
+    """Where each model runs on the searched system curve and the lowest speed meeting
+    the duty point, solved for all models at once."""
+    search_params = st.session_state.get('search_params', {})
+    target_hz = search_params.get("frequency") if search_params.get("speed_conversion") else None
+    positions = np.array(list(model_positions.values()), dtype=np.int64)
+    coefficients, max_flow = catalog.speeds.curves_at(target_hz)
+    flows, heads = solve_operating_points(
+        coefficients[positions],
+        max_flow[positions],
+        search_params.get("static_head", user_head),
+        search_params.get("friction", 0.0)
+    )
+    minimum_hz = catalog.speeds.minimum_speed(positions, user_flow, user_head)
+    native_hz = catalog.speeds.native_hz[positions]
+
+    notes = {}
+    for i, model in enumerate(model_positions):
+        notes[model] = []
+        if target_hz is not None and native_hz[i] != target_hz:
+            notes[model].append(get_text("Converted Speed", native=f"{native_hz[i]:g}", target=f"{target_hz:g}"))
+        if np.isnan(flows[i]):
+            notes[model].append(get_text("No Operating Point"))
+        else:
+            percent = flows[i] / user_flow * 100 if user_flow > 0 else 0
+            notes[model].append(get_text(
+                "Operating Point Result", flow=f"{flows[i]:.1f}", head=f"{heads[i]:.1f}", percent=f"{percent:.1f}"
+            ))
+        if np.isnan(minimum_hz[i]):
+            notes[model].append(get_text("Speed Out Of Range"))
+        else:
+            notes[model].append(get_text("Minimum Speed", speed=f"{minimum_hz[i]:.1f}"))
+    return notes
+
+@st.fragment
+def render_curve_panel(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    columns: List[str],
+    model_column: str,
+    rank: Optional[Callable[[int], np.ndarray]] = None
+) -> None:
+    """
+    Render the pump selection and performance curve panel.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions of the current search
+        columns (List[str]): Displayed result columns
+        model_column (str): Column holding the model number
+        rank (Optional[Callable[[int], np.ndarray]]): Returns the positions with at
+            least the given number of leading rows in rank order
+    """
+    curve_data = catalog.curve_store
+    if rank is not None and st.session_state.get('selected_curve_models'):
+        # Shown curves use each model's best-ranked row, so rank all results
+        positions = rank(len(positions))
+
+    # Model of every ranked row, so curve selection is not limited to the current page
+    ranked_models = catalog.pumps[model_column].to_numpy()[positions]
+
+    def ranked_rows(model):
+        """Gather the displayed columns of the ranked rows for one model."""
+        return catalog.rows(positions[ranked_models == model], columns)
+
+    def ranked_positions(models):
+        """First ranked catalog position of each model."""
+        return {model: int(positions[ranked_models == model][0]) for model in models}
+
+    # Only show curve section if we have search results and curve data
+    if not curve_data.empty:
+        st.markdown("---")
+        st.markdown("### 📈 Pump Performance Analysis")
+
+        # Create two columns for the interface
+        col_select, col_display = st.columns([1, 2])
+
+        with col_select:
+            # Check which models have curve data available
+            if model_column in columns:
+                available_models = pd.Series(ranked_models).dropna().unique().tolist()
+                models_with_curves = [model for model in available_models if model in catalog.curve_models]
+
+                if models_with_curves:
+                    # Initialize selection state if not exists
+                    if 'previous_selection' not in st.session_state:
+                        st.session_state.previous_selection = []
+                        st.session_state.selected_curve_models = []
+
+                    # Create multiselect for pump selection
+                    selected_models_multi = st.multiselect(
+                        get_text("Select Pumps"),
+                        models_with_curves,
+                        default=st.session_state.selected_curve_models,
+                        help="Select pumps to compare their performance curves",
+                        key="pump_selection"
+                    )
+
+                    # Track selection changes
+                    if selected_models_multi != st.session_state.previous_selection:
+                        st.session_state.previous_selection = selected_models_multi.copy()
+
+                    # Add Show Curve button
+                    if st.button(get_text("Show Curves"), type="primary", use_container_width=True):
+                        # Update the actual selection state only when button is clicked.
+                        # The chart column is drawn later in this same fragment run,
+                        # so no extra rerun is needed.
+                        st.session_state.selected_curve_models = st.session_state.previous_selection
+
+                    # Show selected pumps info
+                    if st.session_state.previous_selection:
+                        st.success(f"Selected {len(st.session_state.previous_selection)} pump(s)")
+
+                        # Display selected pump details
+                        st.markdown("#### Selected Pump Details")
+                        # Running cost of all selected pumps in one vectorized pass
+                        selected_positions = ranked_positions([
+                            model for model in st.session_state.previous_selection if model in available_models
+                        ])
+                        selected_costs = energy_costs(
+                            catalog,
+                            np.array(list(selected_positions.values()), dtype=np.int64),
+                            st.session_state.get('search_params', {})
+                        ) if selected_positions else {}
+                        for i, model in enumerate(selected_positions):
+                            pump_data = ranked_rows(model)
+                            if not pump_data.empty:
+                                st.markdown(f"**{model}**")
+                                # Show key specifications
+                                if "Q Rated/LPM" in pump_data.columns:
+                                    st.write(f"Rated Flow: {pump_data['Q Rated/LPM'].iloc[0]:.1f} LPM")
+                                if "Head Rated/M" in pump_data.columns:
+                                    st.write(f"Rated Head: {pump_data['Head Rated/M'].iloc[0]:.1f} m")
+                                if "Power(KW)" in pump_data.columns:
+                                    st.write(f"Power: {pump_data['Power(KW)'].iloc[0]:.2f} kW")
+                                if np.isfinite(selected_costs["annual_kwh"][i]):
+                                    st.write(get_text(
+                                        "Energy Estimate",
+                                        energy=f"{selected_costs['annual_kwh'][i]:,.0f}",
+                                        cost=f"{selected_costs['annual_cost'][i]:,.0f}"
+                                    ))
+                                st.markdown("---")
+                else:
+                    st.info("ℹ️ No curve data available for the pumps in your search results.")
+
+        with col_display:
+            # Check if we have selected models
+            if 'selected_curve_models' in st.session_state and st.session_state.selected_curve_models:
+                # Get user flow and head values
+                user_flow = st.session_state.get('user_flow', 0)
+                user_head = st.session_state.get('user_head', 0)
+
+                # Check which selected models have curve data
+                available_curve_models = []
+                for model in st.session_state.selected_curve_models:
+                    if model in catalog.curve_models:
+                        available_curve_models.append(model)
+
+                if available_curve_models:
+                    if len(available_curve_models) == 1:
+                        # Show single pump curve
+                        st.subheader(get_text("Performance Curve", model=available_curve_models[0]))
+                        with st.spinner(get_text("Loading Curve")):
+                            try:
+                                fig = create_pump_curve_chart(curve_data, available_curve_models[0], user_flow, user_head)
+                                if fig:
+                                    st.plotly_chart(fig, use_container_width=True)
+
+                                    # Add operating point analysis
+                                    if user_flow > 0 and user_head > 0:
+                                        st.markdown("#### Operating Point Analysis")
+                                        st.write(f"Your operating point: {user_flow:.1f} LPM at {user_head:.1f} m")
+
+                                        # Get pump data for analysis
+                                        pump_data = ranked_rows(available_curve_models[0])
+                                        if not pump_data.empty:
+                                            if "Q Rated/LPM" in pump_data.columns and "Head Rated/M" in pump_data.columns:
+                                                rated_flow = pump_data["Q Rated/LPM"].iloc[0]
+                                                rated_head = pump_data["Head Rated/M"].iloc[0]
+
+                                                # Calculate percentage of rated conditions
+                                                flow_percent = (user_flow / rated_flow * 100) if rated_flow > 0 else 0
+                                                head_percent = (user_head / rated_head * 100) if rated_head > 0 else 0
+
+                                                st.write(f"Operating at {flow_percent:.1f}% of rated flow")
+                                                st.write(f"Operating at {head_percent:.1f}% of rated head")
+
+                                        # True operating point on the system curve
+                                        for note in _operating_point_notes(
+                                            catalog, ranked_positions(available_curve_models), user_flow, user_head
+                                        )[available_curve_models[0]]:
+                                            st.write(note)
+                            except Exception as e:
+                                logger.error(f"Error creating pump curve: {str(e)}")
+                                st.error(f"Error creating pump curve: {str(e)}")
+
+                    elif len(available_curve_models) > 1:
+                        # Show comparison chart
+                        st.subheader(get_text("Multiple Curves"))
+                        st.caption(f"Comparing: {', '.join(available_curve_models)}")
+                        if len(available_curve_models) > CHART_RENDERING["webgl_threshold"]:
+                            st.caption(get_text("Large Comparison Mode", count=len(available_curve_models)))
+                        with st.spinner(get_text("Loading Comparison")):
+                            try:
+                                fig_comp = create_comparison_chart(curve_data, available_curve_models, user_flow, user_head)
+                                if fig_comp:
+                                    st.plotly_chart(fig_comp, use_container_width=True)
+
+                                    # Add comparison analysis
+                                    if user_flow > 0 and user_head > 0:
+                                        st.markdown("#### Comparison Analysis")
+                                        st.write(f"Your operating point: {user_flow:.1f} LPM at {user_head:.1f} m")
+
+                                        # Compare operating points for each pump
+                                        operating_points = _operating_point_notes(
+                                            catalog, ranked_positions(available_curve_models), user_flow, user_head
+                                        )
+                                        for model in available_curve_models:
+                                            pump_data = ranked_rows(model)
+                                            if not pump_data.empty:
+                                                st.markdown(f"**{model}**")
+                                                if "Q Rated/LPM" in pump_data.columns and "Head Rated/M" in pump_data.columns:
+                                                    rated_flow = pump_data["Q Rated/LPM"].iloc[0]
+                                                    rated_head = pump_data["Head Rated/M"].iloc[0]
+
+                                                    flow_percent = (user_flow / rated_flow * 100) if rated_flow > 0 else 0
+                                                    head_percent = (user_head / rated_head * 100) if rated_head > 0 else 0
+
+                                                    st.write(f"Operating at {flow_percent:.1f}% of rated flow")
+                                                    st.write(f"Operating at {head_percent:.1f}% of rated head")
+                                                for note in operating_points[model]:
+                                                    st.write(note)
+                                                st.markdown("---")
+                            except Exception as e:
+                                logger.error(f"Error creating comparison chart: {str(e)}")
+                                st.error(f"Error creating comparison chart: {str(e)}")
+
+                        # Show individual curves in expandable sections; the figures
+                        # are built only while the expander is open
+                        if len(available_curve_models) > 1:
+                            individual_curves = st.expander(
+                                "View Individual Pump Curves",
+                                expanded=False,
+                                key="individual_curves_expander",
+                                on_change="rerun"
+                            )
+                            with individual_curves:
+                                if individual_curves.open:
+                                    figures = _individual_figures(catalog, available_curve_models, user_flow, user_head)
+                                    for model in available_curve_models:
+                                        st.subheader(get_text("Performance Curve", model=model))
+                                        if figures.get(model):
+                                            st.plotly_chart(figures[model], use_container_width=True)
+                                        else:
+                                            st.warning(get_text("No Curve Data"))
+                else:
+                    st.warning("The selected pumps do not have curve data available.")
+            else:
+                # Show message to select pumps
+                st.info("👆 Please select one or more pumps from the left panel and click 'Show Curves' to view their performance curves")
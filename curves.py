@@ -0,0 +1,174 @@
+"""
+Compact ragged storage for pump performance curves.
+
+The wide ``pump_curve_data`` table (one column per head value such as
+"10M", plus "Kg/cm²" pressure columns) is mostly empty cells. Here every
+model's points live in one float32 buffer, addressed by per-model offsets,
+so looking up a curve is a dict lookup plus a slice.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pressure curves drawn per chart, in column order
+MAX_PRESSURE_CURVES = 3
+
+
+def head_columns(columns) -> List[Tuple[str, float]]:
+    """
+    Find head columns (e.g. "10M") and the head value each one stands for.
+    Args:
+        columns: Column names of the curve table
+    Returns:
+        List[Tuple[str, float]]: (column, head in meters) pairs
+    """
+    result = []
+    for col in columns:
+        if col.endswith('M') and col not in ['Max Head(M)']:
+            try:
+                result.append((col, float(col.replace('M', ''))))
+            except ValueError:
+                logger.warning(f"Error processing column {col}: not a head value")
+    return result
+
+
+def pressure_columns(columns) -> List[Tuple[str, float]]:
+    """
+    Find pressure columns (e.g. "2Kg/cm²") and the pressure each one stands for.
+    Args:
+        columns: Column names of the curve table
+    Returns:
+        List[Tuple[str, float]]: (column, pressure in kg/cm²) pairs
+    """
+    result = []
+    for col in columns:
+        if 'Kg/cm²' in col:
+            try:
+                result.append((col, float(col.split('Kg/cm²')[0])))
+            except ValueError:
+                logger.warning(f"Error processing pressure column {col}: not a pressure value")
+    return result
+
+
+def _ragged(values: np.ndarray, keys: np.ndarray, sort: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pack the valid (flow > 0) cells of a (models x columns) flow matrix.
+    Args:
+        values (np.ndarray): Flow per model and column (NaN when empty)
+        keys (np.ndarray): Head or pressure value per column
+        sort (bool): Sort each model's points by flow (then key)
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (points [flow, key] float32,
+            column index per point, offsets per model)
+    """
+    n_models = values.shape[0]
+    rows, cols = np.nonzero(np.nan_to_num(values, nan=0.0) > 0)
+    flows = values[rows, cols]
+    if sort:
+        order = np.lexsort((keys[cols], flows, rows))
+        rows, cols, flows = rows[order], cols[order], flows[order]
+    points = np.column_stack((flows, keys[cols])).astype(np.float32)
+    offsets = np.zeros(n_models + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_models), out=offsets[1:])
+    return points, cols.astype(np.int16), offsets
+
+
+class CurveStore:
+    """
+    All pump curves as ragged float32 arrays.
+
+    Attributes:
+        models (List[str]): Model numbers, in storage order
+        points (np.ndarray): (n, 2) float32 [flow LPM, head M], sorted by flow per model
+        offsets (np.ndarray): Model i's points are points[offsets[i]:offsets[i + 1]]
+        pressure_points (np.ndarray): (m, 2) float32 [flow LPM, pressure kg/cm²]
+        pressure_columns (np.ndarray): Pressure column ordinal of each pressure point
+        pressure_offsets (np.ndarray): Per-model offsets into pressure_points
+    """
+
+    def __init__(self, curves: pd.DataFrame):
+        if "Model No." in curves.columns:
+            # The first row wins when a model appears more than once
+            curves = curves.dropna(subset=["Model No."]).drop_duplicates(subset=["Model No."])
+            self.models: List[str] = curves["Model No."].tolist()
+        else:
+            curves = curves.iloc[0:0]
+            self.models = []
+        self.model_index: Dict[str, int] = {model: i for i, model in enumerate(self.models)}
+
+        heads = head_columns(curves.columns)
+        self.points, _, self.offsets = _ragged(
+            curves[[col for col, _ in heads]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64),
+            np.array([value for _, value in heads], dtype=np.float64),
+            sort=True
+        )
+
+        pressures = pressure_columns(curves.columns)
+        self.pressure_points, self.pressure_columns, self.pressure_offsets = _ragged(
+            curves[[col for col, _ in pressures]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64),
+            np.array([value for _, value in pressures], dtype=np.float64),
+            sort=False
+        )
+
+        for name in ["points", "offsets", "pressure_points", "pressure_columns", "pressure_offsets"]:
+            getattr(self, name).setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __contains__(self, model_no: str) -> bool:
+        return model_no in self.model_index
+
+    @property
+    def empty(self) -> bool:
+        return not self.models
+
+    def curve(self, model_no: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Head-flow points of one model.
+        Args:
+            model_no (str): Model number
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: (flows, heads) sorted by flow,
+                or None if the model has no curve row
+        """
+        i = self.model_index.get(model_no)
+        if i is None:
+            return None
+        block = self.points[self.offsets[i]:self.offsets[i + 1]]
+        return block[:, 0], block[:, 1]
+
+    def pressure_markers(self, model_no: str, limit: int = MAX_PRESSURE_CURVES) -> List[Tuple[float, float]]:
+        """
+        Pressure points of one model from its first ``limit`` pressure columns.
+        Args:
+            model_no (str): Model number
+            limit (int): Number of pressure columns considered
+        Returns:
+            List[Tuple[float, float]]: (flow, pressure kg/cm²) pairs in column order
+        """
+        i = self.model_index.get(model_no)
+        if i is None:
+            return []
+        start, end = self.pressure_offsets[i], self.pressure_offsets[i + 1]
+        keep = self.pressure_columns[start:end] < limit
+        return [(float(flow), float(pressure)) for flow, pressure in self.pressure_points[start:end][keep]]
+
+    def long_frame(self) -> pd.DataFrame:
+        """All head-flow points as a long (Model No., Flow, Head) table."""
+        counts = np.diff(self.offsets)
+        return pd.DataFrame({
+            "Model No.": np.repeat(np.array(self.models, dtype=object), counts),
+            "Flow (LPM)": self.points[:, 0],
+            "Head (M)": self.points[:, 1]
+        })
+
+    def nbytes(self) -> int:
+        """Memory held by the point buffers and offsets, in bytes."""
+        return sum(int(getattr(self, name).nbytes) for name in [
+            "points", "offsets", "pressure_points", "pressure_columns", "pressure_offsets"
+        ])
+
@@ -1,102 +1,288 @@
 import pandas as pd
-from supabase import create_client
+from supabase import create_client, ClientOptions
 import logging
-from typing import Optional, Tuple
-from config import SUPABASE_URL, SUPABASE_KEY, DATA_LOADING, ERROR_MESSAGES
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from config import SUPABASE_URL, SUPABASE_KEY, DATA_LOADING, DATA_SOURCE, ERROR_MESSAGES
+from catalog import PumpCatalog
+from data_sources import DataSource, SupabaseSource, CsvSource, SqliteSource
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` for ``key`` unless a run is already in flight, then share its result.
+        Args:
+            key (str): Deduplication key (e.g. the table name)
+            fn (Callable[[], Any]): Function performing the load
+        Returns:
+            Any: The result of the (possibly shared) run
+        """
+        with self._lock:
+            metrics = self._metrics.setdefault(key, {"loads": 0, "coalesced": 0})
+            call = self._calls.get(key)
+            if call is not None:
+                metrics["coalesced"] += 1
+                leader = False
+            else:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                metrics["loads"] += 1
+                leader = True
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """Return per-key counts of executed loads and coalesced callers."""
+        with self._lock:
+            return {key: dict(value) for key, value in self._metrics.items()}
+
+# One load per table at a time for the whole process
+_single_flight = SingleFlight()
+
+def get_load_metrics() -> Dict[str, Dict[str, int]]:
+    """
+    Report how many table loads ran and how many concurrent callers were coalesced.
+    Returns:
+        Dict[str, Dict[str, int]]: {table: {"loads": n, "coalesced": m}}
+    """
+    return _single_flight.metrics()
+
+class CircuitBreaker:
+    """
+    Stop calling an unhealthy data source and probe for its recovery in the background.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    callers go straight to their fallback. Every ``reset_timeout`` seconds a
+    background thread runs ``probe``; the breaker closes once it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, probe: Callable[[], Any]):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        """
+        Whether a foreground call to the backend may be attempted.
+        When open, this also kicks off a background recovery probe if one is due.
+        Returns:
+            bool: True if the breaker is closed
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self._opened_at >= self._reset_timeout:
+                self._probing = True
+                threading.Thread(target=self._run_probe, name="data-source-probe", daemon=True).start()
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Data source recovered, closing circuit breaker")
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is None and self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+                logger.warning(f"Data source failed {self._failures} times, opening circuit breaker")
+
+    def _run_probe(self) -> None:
+        try:
+            self._probe()
+            self.record_success()
+        except Exception as e:
+            logger.warning(f"Data source recovery probe failed: {str(e)}")
+            with self._lock:
+                self._opened_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._probing = False
+
 def init_supabase_client():
-    """Initialize Supabase client with error handling."""
+    """Initialize Supabase client with error handling and a per-request timeout."""
     try:
-        return create_client(SUPABASE_URL, SUPABASE_KEY)
+        return create_client(
+            SUPABASE_URL,
+            SUPABASE_KEY,
+            options=ClientOptions(postgrest_client_timeout=DATA_LOADING["request_timeout"])
+        )
     except Exception as e:
         logger.error(f"Failed to initialize Supabase client: {str(e)}")
         raise
 
+def build_source(backend: str) -> DataSource:
+    """
+    Create the data source for a backend name.
+    Args:
+        backend (str): "supabase", "sqlite" or "csv"
+    Returns:
+        DataSource: The configured data source
+    """
+    if backend == "supabase":
+        return SupabaseSource(init_supabase_client)
+    if backend == "sqlite":
+        return SqliteSource(DATA_SOURCE["sqlite_path"])
+    if backend == "csv":
+        return CsvSource({
+            "pump_selection_data": DATA_LOADING["pump_csv"],
+            "pump_curve_data": DATA_LOADING["curve_csv"]
+        })
+    raise ValueError(f"Unknown data backend: {backend}")
+
+# Configured backend, with the CSV files as the last resort
+_primary_source = build_source(DATA_SOURCE["backend"])
+_fallback_source = build_source("csv")
+
+def _probe_primary_source() -> None:
+    """Cheapest possible round trip, used to detect recovery."""
+    _primary_source.fetch_page("pump_selection_data", 0, 1, columns=["id"])
+
+_breaker = CircuitBreaker(
+    DATA_LOADING["breaker_failure_threshold"],
+    DATA_LOADING["breaker_reset_timeout"],
+    _probe_primary_source
+)
+
+# Last good copy of each table, served while the primary source is unhealthy
+_snapshots: Dict[str, pd.DataFrame] = {}
+
 def load_pump_data() -> pd.DataFrame:
     """
-    Load pump data from Supabase with pagination and fallback to CSV.
+    Load pump data, sharing the result with any concurrent callers.
+    Returns:
+        pd.DataFrame: Loaded pump data (shared - do not modify in place)
+    """
+    return _single_flight.do("pump_selection_data", _load_pump_data)
+
+def _load_pump_data() -> pd.DataFrame:
+    """
+    Load pump data from the configured source with fallback to snapshot or CSV.
     Returns:
         pd.DataFrame: Loaded pump data
     """
-    try:
-        supabase = init_supabase_client()
-        all_records = []
-        page_size = DATA_LOADING["page_size"]
-        current_page = 0
-        
-        while True:
-            response = supabase.table("pump_selection_data").select("*") \
-                              .range(current_page * page_size, (current_page + 1) * page_size - 1) \
-                              .execute()
-            
-            if not response.data:
-                break
-                
-            all_records.extend(response.data)
-            current_page += 1
-            
-            if len(response.data) < page_size:
-                break
-        
-        df = pd.DataFrame(all_records)
-        logger.info(f"Successfully loaded {len(df)} pump records from Supabase")
-        return df
-        
-    except Exception as e:
-        logger.error(f"Failed to load data from Supabase: {str(e)}")
-        # Fallback to CSV
-        try:
-            df = pd.read_csv("Pump Selection Data.csv")
-            logger.info(f"Successfully loaded {len(df)} pump records from CSV")
-            return df
-        except Exception as csv_error:
-            logger.error(f"Failed to load CSV file: {str(csv_error)}")
-            return pd.DataFrame()
+    return _load_table("pump_selection_data", "pump")
 
 def load_pump_curve_data() -> pd.DataFrame:
     """
-    Load pump curve data from Supabase with pagination and fallback to CSV.
+    Load pump curve data, sharing the result with any concurrent callers.
+    Returns:
+        pd.DataFrame: Loaded pump curve data (shared - do not modify in place)
+    """
+    return _single_flight.do("pump_curve_data", _load_pump_curve_data)
+
+def _load_pump_curve_data() -> pd.DataFrame:
+    """
+    Load pump curve data from the configured source with fallback to snapshot or CSV.
     Returns:
         pd.DataFrame: Loaded pump curve data
     """
+    return _load_table("pump_curve_data", "curve")
+
+def _load_table(table: str, label: str) -> pd.DataFrame:
+    """
+    Load a table from the primary source, or from the last snapshot / CSV when it is unhealthy.
+    Args:
+        table (str): Table name
+        label (str): Name used in log messages
+    Returns:
+        pd.DataFrame: Loaded data, empty if every source failed
+    """
+    source = _primary_source
+    if _breaker.allow_request():
+        try:
+            df = source.fetch_all(
+                table,
+                page_size=DATA_LOADING["page_size"],
+                deadline=DATA_LOADING["load_deadline"]
+            )
+            _breaker.record_success()
+            _snapshots[table] = df
+            logger.info(f"Successfully loaded {len(df)} {label} records from {source.name}")
+            return df
+        except Exception as e:
+            _breaker.record_failure()
+            logger.error(f"Failed to load {label} data from {source.name}: {str(e)}")
+    else:
+        logger.warning(f"Circuit breaker open, skipping {label} data request to {source.name}")
+
+    # Fallback to the last good snapshot, then to CSV
+    if table in _snapshots:
+        df = _snapshots[table]
+        logger.info(f"Serving {len(df)} {label} records from last snapshot")
+        return df
     try:
-        supabase = init_supabase_client()
-        all_records = []
-        page_size = DATA_LOADING["page_size"]
-        current_page = 0
-        
-        while True:
-            response = supabase.table("pump_curve_data").select("*") \
-                              .range(current_page * page_size, (current_page + 1) * page_size - 1) \
-                              .execute()
-            
-            if not response.data:
-                break
-                
-            all_records.extend(response.data)
-            current_page += 1
-            
-            if len(response.data) < page_size:
-                break
-        
-        df = pd.DataFrame(all_records)
-        logger.info(f"Successfully loaded {len(df)} curve records from Supabase")
+        df = _fallback_source.fetch_all(table)
+        logger.info(f"Successfully loaded {len(df)} {label} records from CSV")
         return df
-        
+    except Exception as csv_error:
+        logger.error(f"Failed to load {label} CSV file: {str(csv_error)}")
+        return pd.DataFrame()
+
+def probe_table_version(table: str) -> str:
+    """
+    Cheaply fingerprint the current version of a table without downloading it.
+    Asks the primary source (e.g. row count plus highest id in Supabase). A
+    failed probe is never answered with another backend's version, which
+    would stay constant and hide every later change.
+    Args:
+        table (str): Table name
+    Returns:
+        str: Version string - equal strings mean the table is unchanged;
+            "unavailable" if the primary source could not be probed, which
+            forces a reload
+    """
+    try:
+        if not _breaker.allow_request():
+            raise ConnectionError("circuit breaker open")
+        return _primary_source.version(table)
     except Exception as e:
-        logger.error(f"Failed to load curve data from Supabase: {str(e)}")
-        # Fallback to CSV
-        try:
-            df = pd.read_csv("pump_curve_data_rows 1.csv")
-            logger.info(f"Successfully loaded {len(df)} curve records from CSV")
-            return df
-        except Exception as csv_error:
-            logger.error(f"Failed to load curve CSV file: {str(csv_error)}")
-            return pd.DataFrame()
+        logger.warning(f"Version probe for {table} on {_primary_source.name} failed, forcing a reload: {str(e)}")
+        return "unavailable"
 
 def validate_pump_data(df: pd.DataFrame) -> Tuple[bool, Optional[str]]:
     """
@@ -137,4 +323,53 @@ def validate_curve_data(df: pd.DataFrame) -> Tuple[bool, Optional[str]]:
     if missing_columns:
         return False, f"Missing required columns: {', '.join(missing_columns)}"
     
-    return True, None 
+    return True, None
+
+def load_catalog(previous: Optional[PumpCatalog] = None) -> PumpCatalog:
+    """
+    Load and validate pump and curve data and build the shared catalog.
+    Both tables are probed first; if neither changed since ``previous`` was
+    built, ``previous`` is returned as-is and nothing is downloaded or rebuilt.
+    The same holds while the primary source's circuit breaker is open: the
+    fallback data would only rebuild the snapshot already being served.
+    Args:
+        previous (Optional[PumpCatalog]): Catalog currently being served
+    Returns:
+        PumpCatalog: Freshly built catalog, or ``previous`` if unchanged
+    Raises:
+        ValueError: If either table fails validation
+    """
+    source_versions = (
+        probe_table_version("pump_selection_data"),
+        probe_table_version("pump_curve_data")
+    )
+    if previous is not None and "unavailable" not in source_versions \
+            and previous.source_versions == source_versions:
+        logger.info(f"Catalog unchanged ({previous.version}), skipping reload")
+        previous.checked_at = datetime.now()
+        return previous
+    if previous is not None and _breaker.is_open:
+        logger.info(f"{_primary_source.name} unavailable (circuit open), keeping catalog {previous.version}")
+        return previous
+
+    # Shallow copies: the loaded frames may be shared with coalesced callers
+    pumps = load_pump_data().copy(deep=False)
+    curve_data = load_pump_curve_data().copy(deep=False)
+    logger.info(f"Table load metrics: {get_load_metrics()}")
+
+    # Validate data
+    is_valid, error_msg = validate_pump_data(pumps)
+    if not is_valid:
+        raise ValueError(error_msg)
+
+    is_valid, error_msg = validate_curve_data(curve_data)
+    if not is_valid:
+        raise ValueError(error_msg)
+
+    catalog = PumpCatalog(pumps, curve_data, source_versions=source_versions)
+    if previous is not None and catalog.version == previous.version:
+        # Probe changed but content did not - keep the warm catalog and its caches
+        previous.source_versions = source_versions
+        previous.checked_at = datetime.now()
+        return previous
+    return catalog
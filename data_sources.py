@@ -0,0 +1,283 @@
+"""
+Data sources for the Pump Selection Tool.
+
+Every backend answers the same paged, projected and filtered queries, so
+the loader does not care whether the tables live in Supabase, a CSV file
+or a local SQLite database.
+"""
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A filter is (column, operator, value); operators: eq, gte, lte, in
+Filter = Tuple[str, str, Any]
+
+FILTER_OPERATORS = ["eq", "gte", "lte", "in"]
+
+# Columns stored as REAL in SQLite so range filters compare numbers
+SQLITE_NUMERIC_COLUMNS = [
+    "Q Rated/LPM", "Head Rated/M", "Max Flow (LPM)", "Max Head (M)",
+    "Frequency (Hz)", "Phase", "Pass Solid Dia(mm)", "HP", "Power(KW)"
+]
+
+
+def _check_filters(filters: Optional[Sequence[Filter]]) -> List[Filter]:
+    filters = list(filters or [])
+    for column, op, _ in filters:
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{op}' on column '{column}'")
+    return filters
+
+
+class DataSource(ABC):
+    """
+    A backend holding the pump tables.
+
+    Subclasses implement ``fetch_page`` and ``version``; ``fetch_all``
+    pages through a table within an optional deadline.
+    """
+
+    name = "base"
+    remote = False
+
+    @abstractmethod
+    def fetch_page(
+        self,
+        table: str,
+        offset: int,
+        limit: int,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one page of records.
+        Args:
+            table (str): Table name
+            offset (int): Index of the first record
+            limit (int): Maximum number of records
+            columns (Optional[Sequence[str]]): Columns to return, all if None
+            filters (Optional[Sequence[Filter]]): (column, operator, value) filters
+        Returns:
+            List[Dict[str, Any]]: Records of the page
+        """
+
+    @abstractmethod
+    def version(self, table: str) -> str:
+        """
+        Cheap fingerprint of a table's current version.
+        Args:
+            table (str): Table name
+        Returns:
+            str: Version string - equal strings mean the table is unchanged
+        """
+
+    def fetch_all(
+        self,
+        table: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        page_size: int = 1000,
+        deadline: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Page through a whole (filtered, projected) table.
+        Args:
+            table (str): Table name
+            columns (Optional[Sequence[str]]): Columns to return, all if None
+            filters (Optional[Sequence[Filter]]): (column, operator, value) filters
+            page_size (int): Records per page
+            deadline (Optional[float]): Seconds allowed for the whole load
+        Returns:
+            pd.DataFrame: All matching records
+        Raises:
+            TimeoutError: If the load exceeds ``deadline``
+        """
+        all_records = []
+        current_page = 0
+        expires = time.monotonic() + deadline if deadline else None
+
+        while True:
+            if expires is not None and time.monotonic() > expires:
+                raise TimeoutError(f"Loading {table} from {self.name} exceeded {deadline}s")
+
+            records = self.fetch_page(table, current_page * page_size, page_size, columns, filters)
+            if not records:
+                break
+
+            all_records.extend(records)
+            current_page += 1
+
+            if len(records) < page_size:
+                break
+
+        return pd.DataFrame(all_records)
+
+
+class SupabaseSource(DataSource):
+    """Tables served by Supabase (PostgREST)."""
+
+    name = "supabase"
+    remote = True
+
+    def __init__(self, client_factory: Callable[[], Any]):
+        self._client_factory = client_factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._client_factory()
+            return self._client
+
+    def fetch_page(self, table, offset, limit, columns=None, filters=None):
+        select = ",".join(f'"{col}"' for col in columns) if columns else "*"
+        query = self._get_client().table(table).select(select)
+        for column, op, value in _check_filters(filters):
+            if op == "in":
+                query = query.in_(column, list(value))
+            else:
+                query = getattr(query, op)(column, value)
+        response = query.range(offset, offset + limit - 1).execute()
+        return response.data or []
+
+    def version(self, table):
+        response = self._get_client().table(table).select("id", count="exact") \
+                       .order("id", desc=True).limit(1).execute()
+        max_id = response.data[0].get("id") if response.data else None
+        return f"supabase:{response.count}:{max_id}"
+
+
+class CsvSource(DataSource):
+    """Tables read from CSV files, re-read only when a file changes."""
+
+    name = "csv"
+
+    def __init__(self, paths: Dict[str, str]):
+        self._paths = paths
+        self._frames: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def _frame(self, table: str) -> pd.DataFrame:
+        version = self.version(table)
+        with self._lock:
+            cached = self._frames.get(table)
+            if cached is None or cached[0] != version:
+                cached = (version, pd.read_csv(self._paths[table]))
+                self._frames[table] = cached
+            return cached[1]
+
+    def fetch_page(self, table, offset, limit, columns=None, filters=None):
+        df = self._frame(table)
+        for column, op, value in _check_filters(filters):
+            if op == "eq":
+                df = df[df[column] == value]
+            elif op == "gte":
+                df = df[pd.to_numeric(df[column], errors="coerce") >= value]
+            elif op == "lte":
+                df = df[pd.to_numeric(df[column], errors="coerce") <= value]
+            else:
+                df = df[df[column].isin(list(value))]
+        if columns:
+            df = df[list(columns)]
+        page = df.iloc[offset:offset + limit]
+        # Missing CSV cells become None, as they would from the database
+        return page.astype(object).where(page.notna(), None).to_dict("records")
+
+    def fetch_all(self, table, columns=None, filters=None, page_size=1000, deadline=None):
+        # Local file - no need to page
+        if not filters and not columns:
+            return self._frame(table).copy()
+        return super().fetch_all(table, columns, filters, page_size, deadline)
+
+    def version(self, table):
+        stat = os.stat(self._paths[table])
+        return f"csv:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class SqliteSource(DataSource):
+    """Tables held in a local SQLite database file."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def _connect(self, readonly: bool = True) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this thread-safe;
+        # read-only connections never create a missing database file
+        if readonly:
+            return sqlite3.connect(Path(self._path).absolute().as_uri() + "?mode=ro", uri=True)
+        return sqlite3.connect(self._path)
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def fetch_page(self, table, offset, limit, columns=None, filters=None):
+        select = ", ".join(self._quote(col) for col in columns) if columns else "*"
+        clauses = []
+        params: List[Any] = []
+        for column, op, value in _check_filters(filters):
+            if op == "in":
+                values = list(value)
+                clauses.append(f"{self._quote(column)} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            else:
+                clauses.append(f"{self._quote(column)} {dict(eq='=', gte='>=', lte='<=')[op]} ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {select} FROM {self._quote(table)}{where} ORDER BY rowid LIMIT ? OFFSET ?"
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(sql, params + [limit, offset]).fetchall()
+        return [dict(row) for row in rows]
+
+    def fetch_all(self, table, columns=None, filters=None, page_size=1000, deadline=None):
+        # Local database - one query instead of paging
+        return pd.DataFrame(self.fetch_page(table, 0, -1, columns, filters))
+
+    def version(self, table):
+        with closing(self._connect()) as conn:
+            count, max_rowid = conn.execute(
+                f"SELECT COUNT(*), MAX(rowid) FROM {self._quote(table)}"
+            ).fetchone()
+        return f"sqlite:{count}:{max_rowid}:{os.stat(self._path).st_mtime_ns}"
+
+    def import_frame(self, table: str, df: pd.DataFrame) -> None:
+        """
+        Replace a table with the contents of a DataFrame.
+        Args:
+            table (str): Table name
+            df (pd.DataFrame): Table contents
+        """
+        df = df.copy()
+        for col in SQLITE_NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+        with closing(self._connect(readonly=False)) as conn, conn:
+            df.to_sql(table, conn, if_exists="replace", index=False)
+        logger.info(f"Imported {len(df)} records into SQLite table {table}")
+
+
+if __name__ == "__main__":
+    # Build the local SQLite database from another source:
+    #   python data_sources.py [csv|supabase]
+    import sys
+    from config import DATA_LOADING, DATA_SOURCE
+    from data_loader import build_source
+
+    logging.basicConfig(level=logging.INFO)
+    source = build_source(sys.argv[1] if len(sys.argv) > 1 else "csv")
+    target = SqliteSource(DATA_SOURCE["sqlite_path"])
+    for table in ["pump_selection_data", "pump_curve_data"]:
+        target.import_frame(table, source.fetch_all(table, page_size=DATA_LOADING["page_size"]))
@@ -0,0 +1,326 @@
+"""
+Bulk export of search results for the Pump Selection Tool.
+
+The ranked results are streamed chunk by chunk into CSV (and Excel when
+openpyxl is installed), and one HTML datasheet per model - curve, specs and
+operating-point analysis - is rendered on a process pool. Everything goes
+into a single zip archive as it is produced, with a bounded number of
+datasheet batches in flight, so memory stays flat and a time budget caps
+the wall-clock time for hundreds of models.
+"""
+import html
+import time
+import zipfile
+import multiprocessing
+import streamlit as st
+import numpy as np
+import pandas as pd
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from tempfile import TemporaryFile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from catalog import PumpCatalog
+from curves import CurveStore
+from operating_point import solve_operating_points
+from energy import energy_costs
+from visualization import create_pump_curve_chart
+from config import EXPORT
+from translations import get_text
+import logging
+
+try:
+    import openpyxl
+except ImportError:  # optional dependency
+    openpyxl = None
+
+logger = logging.getLogger(__name__)
+
+def excel_available() -> bool:
+    """Whether the optional openpyxl dependency is installed."""
+    return openpyxl is not None
+
+def iter_csv(catalog: PumpCatalog, positions: np.ndarray, columns: List[str], chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Stream result rows as CSV, gathering one chunk of rows at a time.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions
+        columns (List[str]): Columns to export
+        chunk_size (Optional[int]): Rows per chunk, EXPORT["chunk_size"] if None
+    Returns:
+        Iterator[bytes]: UTF-8 CSV chunks (with a BOM so Excel detects the encoding)
+    """
+    chunk_size = chunk_size or EXPORT["chunk_size"]
+    yield pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8-sig")
+    for start in range(0, len(positions), chunk_size):
+        chunk = catalog.rows(positions[start:start + chunk_size], columns)
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+def write_excel(catalog: PumpCatalog, positions: np.ndarray, columns: List[str], fileobj, chunk_size: Optional[int] = None) -> None:
+    """
+    Write result rows to an .xlsx workbook in openpyxl's streaming (write-only) mode.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions
+        columns (List[str]): Columns to export
+        fileobj: Binary file object to write the workbook to
+        chunk_size (Optional[int]): Rows gathered per chunk, EXPORT["chunk_size"] if None
+    """
+    chunk_size = chunk_size or EXPORT["chunk_size"]
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Results")
+    sheet.append(columns)
+    for start in range(0, len(positions), chunk_size):
+        chunk = catalog.rows(positions[start:start + chunk_size], columns)
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(list(row))
+    workbook.save(fileobj)
+
+def _datasheet_html(model: str, specs: List[Tuple[str, str]], analysis: List[str], figure_html: str) -> str:
+    """One self-contained datasheet page: specs table, analysis notes and the curve."""
+    spec_rows = "".join(
+        f"<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>" for label, value in specs
+    )
+    notes = "".join(f"<li>{html.escape(note)}</li>" for note in analysis)
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{html.escape(model)}</title>"
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+        "th,td{border:1px solid #ccc;padding:4px 8px;text-align:left}</style></head><body>"
+        f"<h1>{html.escape(model)}</h1><table>{spec_rows}</table>"
+        f"<ul>{notes}</ul>{figure_html}</body></html>"
+    )
+
+# Curve store of each worker process, sent once when the pool starts
+_worker_curves: Optional[CurveStore] = None
+
+def _init_worker(curves: CurveStore) -> None:
+    global _worker_curves
+    _worker_curves = curves
+
+def _render_batch(jobs: List[Dict[str, Any]]) -> List[Tuple[str, bytes]]:
+    """
+    Render a batch of datasheets in a worker process.
+    Args:
+        jobs (List[Dict[str, Any]]): model, name, specs, analysis, user_flow and user_head per datasheet
+    Returns:
+        List[Tuple[str, bytes]]: (archive name, HTML) per datasheet
+    """
+    pages = []
+    for job in jobs:
+        fig = create_pump_curve_chart(_worker_curves, job["model"], job["user_flow"], job["user_head"])
+        figure_html = fig.to_html(full_html=False, include_plotlyjs="cdn") if fig else ""
+        page = _datasheet_html(job["model"], job["specs"], job["analysis"], figure_html)
+        pages.append((job["name"], page.encode("utf-8")))
+    return pages
+
+def _datasheet_names(models: List[str]) -> List[str]:
+    """
+    Archive name of each datasheet. Models that map to the same file name once
+    unsafe characters are replaced (compared case-insensitively, as on Windows
+    and macOS) get a numeric suffix, so no zip entry is written twice.
+    """
+    names, taken = [], set()
+    for model in models:
+        base = "".join(c if c.isalnum() or c in "-_." else "_" for c in model) or "model"
+        name, suffix = base, 2
+        while name.lower() in taken:
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        taken.add(name.lower())
+        names.append(f"datasheets/{name}.html")
+    return names
+
+def _datasheet_jobs(catalog: PumpCatalog, positions: np.ndarray, columns: List[str], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Specs and operating-point analysis of every model with a curve, computed vectorized."""
+    key_column = "Model" if "Model" in catalog.pumps.columns else "Model No."
+    positions = positions[catalog.curve_rows[positions] >= 0]
+    # One datasheet per model, in rank order
+    _, first = np.unique(catalog.pumps[key_column].to_numpy()[positions].astype(str), return_index=True)
+    positions = positions[np.sort(first)][:EXPORT["max_datasheets"]]
+    if not len(positions):
+        return []
+
+    user_flow, user_head = params.get("flow_lpm", 0.0), params.get("head_m", 0.0)
+    target_hz = params.get("frequency") if params.get("speed_conversion") else None
+    coefficients, max_flow = catalog.speeds.curves_at(target_hz)
+    flows, heads = solve_operating_points(
+        coefficients[positions],
+        max_flow[positions],
+        params.get("static_head", user_head),
+        params.get("friction", 0.0)
+    )
+    minimum_hz = catalog.speeds.minimum_speed(positions, user_flow, user_head)
+    costs = energy_costs(catalog, positions, params)
+    rows = catalog.rows(positions, columns)
+    models = [catalog.curve_store.models[row] for row in catalog.curve_rows[positions]]
+    names = _datasheet_names(models)
+
+    jobs = []
+    for i, (_, row) in enumerate(rows.iterrows()):
+        analysis = []
+        if user_flow > 0 and user_head > 0:
+            analysis.append(f"Your operating point: {user_flow:.1f} LPM at {user_head:.1f} m")
+        if np.isnan(flows[i]):
+            analysis.append(get_text("No Operating Point"))
+        else:
+            percent = flows[i] / user_flow * 100 if user_flow > 0 else 0
+            analysis.append(get_text(
+                "Operating Point Result", flow=f"{flows[i]:.1f}", head=f"{heads[i]:.1f}", percent=f"{percent:.1f}"
+            ))
+        if not np.isnan(minimum_hz[i]):
+            analysis.append(get_text("Minimum Speed", speed=f"{minimum_hz[i]:.1f}"))
+        if np.isfinite(costs["annual_kwh"][i]):
+            analysis.append(get_text(
+                "Energy Estimate",
+                energy=f"{costs['annual_kwh'][i]:,.0f}",
+                cost=f"{costs['annual_cost'][i]:,.0f}"
+            ))
+        jobs.append({
+            "model": models[i],
+            "name": names[i],
+            "specs": [(col, "" if pd.isna(value) else str(value)) for col, value in row.items()],
+            "analysis": analysis,
+            "user_flow": user_flow or None,
+            "user_head": user_head or None
+        })
+    return jobs
+
+def export_package(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    columns: List[str],
+    params: Dict[str, Any],
+    fileobj,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Write a submittal package - result tables and per-model datasheets - into a zip archive.
+    Datasheets are rendered in batches on a process pool; finished batches are
+    written as they arrive and at most two batches per worker are in flight.
+    Models not rendered within EXPORT["time_budget"] seconds are listed in skipped.txt.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions of the search
+        columns (List[str]): Result columns to export
+        params (Dict[str, Any]): Search parameters (for the operating-point analysis)
+        fileobj: Binary file object the archive is written to
+        progress (Optional[Callable[[int, int], None]]): Called with (done, total) datasheets
+    Returns:
+        Dict[str, Any]: rows, datasheets, skipped and seconds
+    """
+    started = time.monotonic()
+    deadline = started + EXPORT["time_budget"]
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("results.csv", "w") as entry:
+            for chunk in iter_csv(catalog, positions, columns):
+                entry.write(chunk)
+        if excel_available():
+            with archive.open("results.xlsx", "w") as entry:
+                write_excel(catalog, positions, columns, entry)
+
+        jobs = _datasheet_jobs(catalog, positions, columns, params)
+        batch_size = EXPORT["batch_size"]
+        batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+        written, skipped = 0, []
+        if batches:
+            max_workers = EXPORT["max_workers"] or min(4, multiprocessing.cpu_count())
+            # Spawned workers do not inherit the Streamlit server's threads.
+            # No context manager: its exit would wait for batches still running
+            # past the time budget
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context(EXPORT["start_method"]),
+                initializer=_init_worker,
+                initargs=(catalog.curve_store,)
+            )
+            pending, queued, broken = {}, list(reversed(batches)), False
+            try:
+                while queued or pending:
+                    while queued and len(pending) < 2 * max_workers and time.monotonic() < deadline:
+                        batch = queued.pop()
+                        try:
+                            pending[pool.submit(_render_batch, batch)] = batch
+                        except BrokenExecutor as e:
+                            # A worker died; the batch and the rest of the queue are skipped
+                            logger.error(f"Datasheet pool failed: {str(e)}")
+                            queued.append(batch)
+                            broken = True
+                            break
+                    if broken or not pending:
+                        break
+                    done, _ = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+                    if not done:
+                        break
+                    for future in done:
+                        batch = pending.pop(future)
+                        try:
+                            for name, page in future.result():
+                                archive.writestr(name, page)
+                                written += 1
+                        except Exception as e:
+                            logger.error(f"Datasheet batch failed: {str(e)}")
+                            skipped.extend(job["model"] for job in batch)
+                        if progress:
+                            progress(written, len(jobs))
+            finally:
+                # Past the time budget: cancel queued work and return without
+                # waiting for running batches; their results are discarded
+                pool.shutdown(wait=False, cancel_futures=True)
+            for batch in pending.values():
+                skipped.extend(job["model"] for job in batch)
+            for batch in queued:
+                skipped.extend(job["model"] for job in batch)
+        if skipped:
+            archive.writestr("skipped.txt", "\n".join(skipped) + "\n")
+
+    summary = {"rows": len(positions), "datasheets": written, "skipped": len(skipped), "seconds": time.monotonic() - started}
+    logger.info(f"Export package: {summary}")
+    return summary
+
+@st.fragment
+def render_export_panel(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    columns: List[str],
+    params: Dict[str, Any],
+    rank: Optional[Callable[[int], np.ndarray]] = None
+) -> None:
+    """
+    Render the bulk export button and the download of the finished package.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions of the current search
+        columns (List[str]): Displayed result columns
+        params (Dict[str, Any]): Search parameters
+        rank (Optional[Callable[[int], np.ndarray]]): Returns the positions with at
+            least the given number of leading rows in rank order
+    """
+    if not st.button(get_text("Build Export"), key="build_export"):
+        return
+    if rank is not None:
+        # The package lists every result in rank order
+        positions = rank(len(positions))
+    bar = st.progress(0.0, text=get_text("Rendering Datasheets"))
+    # The archive is built on disk; only the finished zip is handed to the browser
+    with TemporaryFile() as archive:
+        summary = export_package(
+            catalog, positions, columns, params, archive,
+            progress=lambda done, total: bar.progress(done / total if total else 1.0, text=get_text("Rendering Datasheets"))
+        )
+        size_mb = archive.tell() / (1024 * 1024)
+        bar.empty()
+        st.caption(get_text("Export Summary", rows=summary["rows"], datasheets=summary["datasheets"], seconds=f"{summary['seconds']:.1f}"))
+        if summary["skipped"]:
+            st.warning(get_text("Export Skipped", count=summary["skipped"]))
+        # The download is held in server memory until the session ends, so cap its size
+        if size_mb > EXPORT["max_archive_mb"]:
+            st.error(get_text("Export Too Large", size=f"{size_mb:.0f}", limit=EXPORT["max_archive_mb"]))
+            return
+        # Read-only handle on the temporary file, read once by the download button
+        with open(archive.fileno(), "rb", closefd=False) as reader:
+            st.download_button(
+                get_text("Download Export"),
+                data=reader,
+                file_name="pump_selection_export.zip",
+                mime="application/zip",
+                on_click="ignore"
+            )
@@ -0,0 +1,255 @@
+"""
+Concurrent-session load test for the Pump Selection Tool.
+
+Simulates engineers using the app at once with Streamlit's app-testing API
+against the CSV data: every session loads the page, picks a category,
+enters a pond size, runs a Search, picks pumps and shows their curves.
+Concurrent sessions run in separate worker processes, each with its own
+catalog and caches like a server replica (the app-testing API is not
+thread-safe, so one process runs one session at a time). The report gives rerun latency
+percentiles per step, throughput and peak memory per process, and can be
+compared against a previous run to catch regressions.
+
+Usage:
+    python loadtest.py --sessions 50 --concurrency 4 --output baseline.json
+    python loadtest.py --sessions 50 --concurrency 4 --compare baseline.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from typing import Any, Dict, List, Optional
+from config import LOAD_TEST
+import logging
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pump.py")
+
+# Rerun steps of a simulated session, in order
+STEPS = ["load", "category", "search", "select", "curves"]
+
+
+def _label(key: str) -> str:
+    """English UI label of a translation key (sessions start in English)."""
+    from translations import TRANSLATIONS
+    return TRANSLATIONS["English"].get(key, key)
+
+
+def run_session(seed: int, timeout: float) -> Dict[str, Any]:
+    """
+    Run one scripted session and time each rerun.
+    Args:
+        seed (int): Seed for the session's category and pond size
+        timeout (float): Seconds allowed per rerun
+    Returns:
+        Dict[str, Any]: step -> seconds, plus "error" if the session failed
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(seed)
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    timings: Dict[str, Any] = {}
+
+    def timed(step, action):
+        start = time.perf_counter()
+        action()
+        timings[step] = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(f"{step}: {app.exception[0].message}")
+
+    def submit(form_id):
+        return next(b for b in app.button if b.proto.form_id == form_id).click().run
+
+    try:
+        timed("load", app.run)
+
+        # Pick a category (step 1 filters rerun on change)
+        category = next(s for s in app.selectbox if s.label == _label("Category"))
+        if len(category.options) > 1:
+            category.select_index(int(rng.integers(1, len(category.options))))
+        timed("category", category.run)
+
+        # Enter a pond size and submit the search form
+        app.number_input(key="length").set_value(float(rng.uniform(1, 10)))
+        app.number_input(key="width").set_value(float(rng.uniform(1, 10)))
+        app.number_input(key="height").set_value(float(rng.uniform(0.5, 3)))
+        app.number_input(key="drain_time_hr").set_value(float(rng.uniform(0.5, 6)))
+        timed("search", submit("search_form"))
+
+        # Pick up to two pumps with curves and show them
+        picker = [m for m in app.multiselect if m.key == "pump_selection"]
+        if picker and picker[0].options:
+            timed("select", picker[0].set_value(picker[0].options[:2]).run)
+            show = next(b for b in app.button if b.label == _label("Show Curves"))
+            timed("curves", show.click().run)
+    except Exception as e:
+        timings["error"] = str(e)
+    return timings
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_worker(seeds: List[int], timeout: float, data_dir: str) -> Dict[str, Any]:
+    """Run a share of the sessions one after another in one worker process."""
+    os.chdir(data_dir)
+    sessions = [run_session(seed, timeout) for seed in seeds]
+    return {"pid": os.getpid(), "sessions": sessions, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    if not values:
+        return {"count": 0}
+    ms = np.asarray(values) * 1000
+    return {
+        "count": len(ms),
+        "mean": float(ms.mean()),
+        "p50": float(np.percentile(ms, 50)),
+        "p90": float(np.percentile(ms, 90)),
+        "p95": float(np.percentile(ms, 95)),
+        "p99": float(np.percentile(ms, 99)),
+        "max": float(ms.max())
+    }
+
+
+def summarize(workers: List[Dict[str, Any]], wall_seconds: float, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Aggregate worker results into a report.
+    Args:
+        workers (List[Dict[str, Any]]): Per-process session timings and memory
+        wall_seconds (float): Wall-clock duration of the whole run
+        settings (Dict[str, Any]): Run settings, stored with the report
+    Returns:
+        Dict[str, Any]: steps, overall, throughput, memory and errors
+    """
+    sessions = [s for w in workers for s in w["sessions"]]
+    errors = [s["error"] for s in sessions if "error" in s]
+    steps = {step: _percentiles([s[step] for s in sessions if step in s]) for step in STEPS}
+    all_reruns = [s[step] for s in sessions for step in STEPS if step in s]
+    completed = len(sessions) - len(errors)
+    return {
+        "settings": settings,
+        "wall_seconds": wall_seconds,
+        "sessions": len(sessions),
+        "errors": errors,
+        "steps": steps,
+        "overall": _percentiles(all_reruns),
+        "throughput": {
+            "reruns_per_second": len(all_reruns) / wall_seconds if wall_seconds > 0 else 0.0,
+            "sessions_per_second": completed / wall_seconds if wall_seconds > 0 else 0.0
+        },
+        "memory": {"per_process_peak_mb": [w["peak_rss_mb"] for w in workers]}
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions of a run against a baseline report.
+    Args:
+        report (Dict[str, Any]): Current run
+        baseline (Dict[str, Any]): Previous run
+        tolerance (float): Allowed relative change (0.2 = 20%)
+    Returns:
+        List[str]: One line per regressed metric (empty if none)
+    """
+    regressions = []
+
+    def check(name, current, previous, higher_is_worse=True):
+        if not current or not previous:
+            return
+        change = current / previous - 1
+        if (change > tolerance) if higher_is_worse else (change < -tolerance):
+            regressions.append(f"{name}: {previous:.1f} -> {current:.1f} ({change:+.0%})")
+
+    for step in ["overall"] + STEPS:
+        current = report["overall"] if step == "overall" else report["steps"].get(step, {})
+        previous = baseline["overall"] if step == "overall" else baseline["steps"].get(step, {})
+        for metric in ["p50", "p95"]:
+            check(f"{step} {metric} ms", current.get(metric), previous.get(metric))
+    check("reruns/s", report["throughput"]["reruns_per_second"],
+          baseline["throughput"]["reruns_per_second"], higher_is_worse=False)
+    peaks = [m for m in report["memory"]["per_process_peak_mb"] if m]
+    previous_peaks = [m for m in baseline["memory"]["per_process_peak_mb"] if m]
+    if peaks and previous_peaks:
+        check("peak memory MB", max(peaks), max(previous_peaks))
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the latency table, throughput and memory of a run."""
+    print(f"{report['sessions']} sessions in {report['wall_seconds']:.1f} s, {len(report['errors'])} failed")
+    print(f"{'step':<10}{'count':>7}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for step, stats in list(report["steps"].items()) + [("overall", report["overall"])]:
+        if stats.get("count"):
+            print(f"{step:<10}{stats['count']:>7}" + "".join(
+                f"{stats[m]:>10.1f}" for m in ["p50", "p90", "p95", "p99", "max"]
+            ))
+    throughput = report["throughput"]
+    print(f"throughput: {throughput['reruns_per_second']:.2f} reruns/s, {throughput['sessions_per_second']:.2f} sessions/s")
+    print("peak memory per process (MB): " + ", ".join(
+        f"{m:.0f}" if m else "n/a" for m in report["memory"]["per_process_peak_mb"]
+    ))
+    for error in report["errors"][:5]:
+        print(f"error: {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Pump Selection Tool")
+    parser.add_argument("--sessions", type=int, default=LOAD_TEST["sessions"], help="Total simulated sessions")
+    parser.add_argument("--concurrency", type=int, default=LOAD_TEST["concurrency"], help="Concurrent sessions (worker processes)")
+    parser.add_argument("--timeout", type=float, default=LOAD_TEST["timeout"], help="Seconds allowed per rerun")
+    parser.add_argument("--data-dir", default=".", help="Directory holding the CSV data files")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the session scripts")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=LOAD_TEST["tolerance"], help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    # Always run against the local CSV data, never a live database
+    os.environ["PUMP_DATA_BACKEND"] = "csv"
+    os.environ["SUPABASE_URL"] = ""
+    os.environ["SUPABASE_KEY"] = ""
+    data_dir = os.path.abspath(args.data_dir)
+
+    seeds = [args.seed + i for i in range(args.sessions)]
+    shares = [seeds[p::args.concurrency] for p in range(args.concurrency)]
+    settings = {k: getattr(args, k) for k in ["sessions", "concurrency", "timeout", "seed"]}
+
+    start = time.perf_counter()
+    # Fresh interpreters per worker, like separate server processes
+    with multiprocessing.get_context("spawn").Pool(args.concurrency) as pool:
+        workers = pool.starmap(_run_worker, [(share, args.timeout, data_dir) for share in shares if share])
+    report = summarize(workers, time.perf_counter() - start, settings)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
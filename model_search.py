@@ -0,0 +1,192 @@
+"""
+Model-number lookup for the Pump Selection Tool.
+
+"Model No." and "Model" strings are normalized (upper case, letters and
+digits only) and indexed twice, once per catalog version: a sorted key array
+for prefix ranges by binary search, and trigram posting lists for substring
+and fuzzy matches. A query only touches the postings of its own trigrams,
+so lookups stay well under a millisecond as the catalog grows.
+
+The lookup panel runs as a fragment, so typing and opening a hit rerun only
+the panel, and a hit opens its curve through the curve store's model index.
+"""
+import re
+import streamlit as st
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from catalog import PumpCatalog
+from ranking import top_k
+from visualization import create_pump_curve_chart
+from config import MODEL_SEARCH
+from translations import get_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ["Model No.", "Model"]
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9A-Z]")
+
+
+def normalize(text: str) -> str:
+    """Upper-case a model number and drop separators, so "hp 0636" finds "HP-0636"."""
+    return _NON_ALPHANUMERIC.sub("", str(text).upper())
+
+
+def _trigrams(key: str) -> List[str]:
+    """Distinct trigrams of a key, with a start marker so leading characters weigh more."""
+    padded = "^" + key
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+class ModelSearchIndex:
+    """
+    Prefix and trigram index over the model numbers of one catalog version.
+
+    Attributes:
+        keys (np.ndarray): Sorted distinct normalized model strings
+        labels (List[str]): Original spelling of each key
+        positions (np.ndarray): First catalog position of each key
+    """
+
+    def __init__(self, catalog: PumpCatalog):
+        self.version = catalog.version
+        first: Dict[str, Tuple[int, str]] = {}
+        for col in SEARCH_COLUMNS:
+            if col not in catalog.pumps.columns:
+                continue
+            for position, value in enumerate(catalog.pumps[col].to_numpy()):
+                if value is None or value != value:  # skip None and NaN
+                    continue
+                key = normalize(value)
+                if key and (key not in first or position < first[key][0]):
+                    first[key] = (position, str(value).strip())
+
+        keys = sorted(first)
+        self.keys = np.array(keys, dtype=str)
+        self.labels = [first[key][1] for key in keys]
+        self.positions = np.array([first[key][0] for key in keys], dtype=np.int64)
+        self._lengths = np.array([len(key) for key in keys], dtype=np.int32)
+        self._gram_counts = np.array([len(_trigrams(key)) for key in keys], dtype=np.int32)
+
+        postings = defaultdict(list)
+        for entry, key in enumerate(keys):
+            for gram in _trigrams(key):
+                postings[gram].append(entry)
+        self._postings = {gram: np.array(entries, dtype=np.int32) for gram, entries in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _contains(self, gram: str, entries: np.ndarray) -> np.ndarray:
+        """Which entries have a trigram, by binary search in its sorted posting list."""
+        posting = self._postings[gram]
+        found = np.searchsorted(posting, entries)
+        return posting[np.minimum(found, len(posting) - 1)] == entries
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, int, float]]:
+        """
+        Ranked matches for a partial model number: exact and prefix matches
+        (shortest first), then substring matches, then fuzzy matches by
+        trigram similarity.
+        Args:
+            query (str): Partial model number as typed
+            limit (Optional[int]): Most matches to return, MODEL_SEARCH["max_results"] if None
+        Returns:
+            List[Tuple[str, int, float]]: (model label, catalog position, similarity 0-1)
+        """
+        limit = limit or MODEL_SEARCH["max_results"]
+        q = normalize(query)
+        if not q or not len(self.keys):
+            return []
+
+        # Prefix matches are one contiguous range of the sorted keys
+        start = int(np.searchsorted(self.keys, q, side="left"))
+        end = int(np.searchsorted(self.keys, q + "\uffff", side="left"))
+        entries = list(top_k(np.arange(start, end), self._lengths[start:end], limit))
+        scores = [len(q) / self._lengths[e] for e in entries]
+
+        grams = _trigrams(q)
+        outside = lambda candidates: candidates[(candidates < start) | (candidates >= end)]
+
+        # Substrings contain every trigram of the query but the start marker:
+        # start from the rarest one and keep the entries found in all others
+        inner = grams[1:]
+        if len(entries) < limit and inner and all(gram in self._postings for gram in inner):
+            inner.sort(key=lambda gram: len(self._postings[gram]))
+            candidates = outside(self._postings[inner[0]])
+            for gram in inner[1:]:
+                candidates = candidates[self._contains(gram, candidates)]
+            candidates = np.array([e for e in candidates if q in self.keys[e]], dtype=np.int64)
+            for e in top_k(candidates, self._lengths[candidates], limit - len(entries)):
+                entries.append(e)
+                scores.append(len(q) / self._lengths[e])
+
+        # Fuzzy matches by Jaccard similarity of the trigram sets. A key sharing
+        # at least `needed` trigrams has one among all but the `needed` - 1 most
+        # common ones, so the longest posting lists are never scanned whole
+        present = sorted((gram for gram in grams if gram in self._postings), key=lambda gram: len(self._postings[gram]))
+        needed = max(1, int(np.ceil(MODEL_SEARCH["min_similarity"] * len(grams))))
+        if len(entries) < limit and len(present) >= needed:
+            rare, common = present[:len(present) - needed + 1], present[len(present) - needed + 1:]
+            # Merge the rare posting lists: sorted runs give each candidate's count
+            merged = np.sort(np.concatenate([self._postings[gram] for gram in rare]))
+            run_starts = np.flatnonzero(np.concatenate(([True], merged[1:] != merged[:-1])))
+            candidates = merged[run_starts].astype(np.int64)
+            shared = np.diff(np.append(run_starts, len(merged))).astype(np.float64)
+            keep = ((candidates < start) | (candidates >= end)) & ~np.isin(candidates, entries)
+            candidates, shared = candidates[keep], shared[keep]
+            for gram in common:
+                shared += self._contains(gram, candidates)
+            similarity = shared / (len(grams) + self._gram_counts[candidates] - shared)
+            close = similarity >= MODEL_SEARCH["min_similarity"]
+            candidates, similarity = candidates[close], similarity[close]
+            order = np.lexsort((candidates, self._lengths[candidates], -similarity))[:limit - len(entries)]
+            entries.extend(candidates[order])
+            scores.extend(similarity[order])
+
+        return [(self.labels[e], int(self.positions[e]), float(score)) for e, score in zip(entries, scores)]
+
+
+@st.fragment
+def render_model_search(catalog: PumpCatalog, index: ModelSearchIndex) -> None:
+    """
+    Render the model-number lookup and the curve of the opened hit.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        index (ModelSearchIndex): Model index for this catalog version
+    """
+    query = st.text_input(get_text("Find Model"), key="model_search_query", placeholder=get_text("Find Model Hint"))
+    if not query:
+        return
+    hits = index.search(query)
+    if not hits:
+        st.info(get_text("No Model Found"))
+        return
+
+    labels = [label for label, _, _ in hits]
+    picked = st.radio(get_text("Model Matches"), labels, horizontal=True, key="model_search_pick")
+    position = hits[labels.index(picked)][1] if picked in labels else hits[0][1]
+
+    spec_columns = [
+        col for col in ["Model", "Model No.", "Category", "Frequency (Hz)", "Phase", "Q Rated/LPM", "Head Rated/M", "Power(KW)"]
+        if col in catalog.pumps.columns
+    ]
+    st.dataframe(catalog.rows(np.array([position]), spec_columns), hide_index=True, use_container_width=True)
+
+    # Straight to the curve through the curve store's model index
+    curve_row = int(catalog.curve_rows[position])
+    if curve_row < 0:
+        st.info(get_text("No Curve For Model"))
+        return
+    model = catalog.curve_store.models[curve_row]
+    fig = create_pump_curve_chart(
+        catalog.curve_store,
+        model,
+        st.session_state.get('user_flow', 0) or None,
+        st.session_state.get('user_head', 0) or None
+    )
+    if fig:
+        st.plotly_chart(fig, use_container_width=True, key="model_search_curve")
+
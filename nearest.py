@@ -0,0 +1,100 @@
+"""
+Nearest-pump suggestions for searches without matches.
+
+Pumps are indexed by rated flow, rated head and passable solid size,
+log-scaled (so 20 vs 40 LPM weighs like 1000 vs 2000 LPM) and standardized,
+and partitioned by category, frequency and phase. A query scans only its
+partition's contiguous feature block, which keeps it well under a
+millisecond for catalogs of thousands of pumps.
+"""
+import threading
+import numpy as np
+from typing import Dict, Optional, Tuple
+from catalog import PumpCatalog
+from ranking import top_k
+from config import NEAREST
+import logging
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = ["Q Rated/LPM", "Head Rated/M", "Pass Solid Dia(mm)"]
+
+
+class NearestIndex:
+    """
+    k-nearest-neighbour index over the catalog, built once per catalog version.
+    Partitions for a (category, frequency, phase) filter - where None means
+    "all" - are assembled on first use and kept.
+    """
+
+    def __init__(self, catalog: PumpCatalog):
+        self.version = catalog.version
+        n = len(catalog)
+        self._raw = np.column_stack([
+            catalog.columns[col] if col in catalog.columns else np.zeros(n)
+            for col in FEATURE_COLUMNS
+        ])
+        logged = np.log1p(np.maximum(np.nan_to_num(self._raw), 0.0))
+        scale = logged.std(axis=0)
+        self._scale = np.where(scale > 0, scale, 1.0)
+        self._features = logged / self._scale
+
+        self._catalog = catalog
+        self._partitions: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _partition(self, category: Optional[str], frequency: Optional[float],
+                   phase: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and contiguous features of the pumps passing a filter (cached)."""
+        key = (category, frequency, phase)
+        with self._lock:
+            cached = self._partitions.get(key)
+        if cached is not None:
+            return cached
+        positions = self._catalog.select(category=category, frequency=frequency, phase=phase)
+        partition = (positions, np.ascontiguousarray(self._features[positions]))
+        with self._lock:
+            self._partitions[key] = partition
+        return partition
+
+    def query(
+        self,
+        flow_lpm: float,
+        head_m: float,
+        particle_size: float,
+        category: Optional[str] = None,
+        frequency: Optional[float] = None,
+        phase: Optional[float] = None,
+        k: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The k pumps closest to a requirement within a category/frequency/phase partition.
+        Args:
+            flow_lpm (float): Required flow in LPM
+            head_m (float): Required head in meters
+            particle_size (float): Required passable solid size in mm
+            category (Optional[str]): Category filter, all if None
+            frequency (Optional[float]): Frequency filter, all if None
+            phase (Optional[float]): Phase filter, all if None
+            k (Optional[int]): Number of pumps, NEAREST["k"] if None
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (positions nearest first,
+                normalized distances over the set requirements, shortfall per pump as [flow LPM, head m, solid mm])
+        """
+        k = k or NEAREST["k"]
+        positions, features = self._partition(category, frequency, phase)
+        if not len(positions):
+            return positions, np.empty(0), np.empty((0, len(FEATURE_COLUMNS)))
+
+        requirement = np.array([flow_lpm, head_m, particle_size], dtype=np.float64)
+        target = np.log1p(np.maximum(requirement, 0.0)) / self._scale
+        # Requirements left unset (<= 0) do not count, or they would pull towards tiny pumps
+        weights = (requirement > 0).astype(np.float64)
+        distances = np.sqrt((((features - target) ** 2) * weights).sum(axis=1))
+        # Partial selection; pumps with identical rated points tie-break in ID order
+        nearest = top_k(np.arange(len(distances)), distances, k)
+
+        found = positions[nearest]
+        shortfall = np.maximum(np.array([flow_lpm, head_m, particle_size]) - np.nan_to_num(self._raw[found]), 0.0)
+        return found, distances[nearest], shortfall
+
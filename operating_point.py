@@ -0,0 +1,89 @@
+"""
+System-curve operating points for the Pump Selection Tool.
+
+A pump runs where its H(Q) curve crosses the system curve
+H_sys(Q) = static head + friction * (Q / 1000)². The crossing of every
+candidate pump is found at once with a vectorized bisection over the
+fitted curve polynomials.
+"""
+import numpy as np
+from typing import Tuple
+from curve_fits import horner
+from config import SYSTEM_CURVE
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def system_head(flows, static_head: float, friction: float) -> np.ndarray:
+    """
+    Head the system demands at the given flows.
+    Args:
+        flows: Flow in LPM
+        static_head (float): Static head in meters (lift from pond depth / floors)
+        friction (float): Friction coefficient in m per (m³/min)²
+    Returns:
+        np.ndarray: System head in meters
+    """
+    return static_head + friction * (np.asarray(flows, dtype=np.float64) / 1000) ** 2
+
+
+def solve_operating_points(
+    coefficients: np.ndarray,
+    max_flow: np.ndarray,
+    static_head: float,
+    friction: float,
+    iterations: int = SYSTEM_CURVE["iterations"]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find where each pump curve crosses the system curve, for all pumps at once.
+    Args:
+        coefficients (np.ndarray): (n, degree + 1) fitted curve coefficients per pump
+            over Q / max_flow (NaN for pumps without a curve)
+        max_flow (np.ndarray): Largest fitted flow per pump in LPM
+        static_head (float): Static head in meters
+        friction (float): Friction coefficient in m per (m³/min)²
+        iterations (int): Bisection steps (each halves the flow bracket)
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (flow in LPM, head in meters) per pump;
+            NaN where the curves do not cross within the pump's measured flow range
+    """
+    def excess_head(flows):
+        # Pump head minus system head; the shutoff head is extrapolated from the fit
+        return horner(coefficients, flows / max_flow) - system_head(flows, static_head, friction)
+
+    low = np.zeros(len(max_flow))
+    high = np.array(max_flow, dtype=np.float64)
+    # Bracketed when the pump beats the system at shutoff but not at its largest flow
+    bracketed = np.isfinite(high) & (excess_head(low) >= 0) & (excess_head(high) <= 0)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        above = excess_head(middle) > 0
+        low = np.where(above, middle, low)
+        high = np.where(above, high, middle)
+
+    flows = np.where(bracketed, (low + high) / 2, np.nan)
+    return flows, system_head(flows, static_head, friction)
+
+
+def operating_point_scores(
+    flows: np.ndarray,
+    heads: np.ndarray,
+    flow_lpm: float,
+    head_m: float
+) -> np.ndarray:
+    """
+    Distance of each operating point from the requirement, relative to the requirement.
+    Args:
+        flows (np.ndarray): Operating flow per pump in LPM (NaN if none)
+        heads (np.ndarray): Operating head per pump in meters
+        flow_lpm (float): Required flow in LPM
+        head_m (float): Required head in meters
+    Returns:
+        np.ndarray: Score per pump (lower is better, inf without an operating point)
+    """
+    flow_error = (flows - flow_lpm) / flow_lpm if flow_lpm > 0 else np.zeros_like(flows)
+    head_error = (heads - head_m) / head_m if head_m > 0 else np.zeros_like(heads)
+    scores = np.hypot(flow_error, head_error)
+    return np.where(np.isnan(scores), np.inf, scores)
+
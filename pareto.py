@@ -0,0 +1,114 @@
+"""
+Multi-objective (Pareto) ranking for the Pump Selection Tool.
+
+A pump dominates another when it is no worse on every objective and better
+on at least one. The non-dominated set (skyline) is found with a blocked
+Sort-Filter-Skyline pass: candidates are visited in an order no dominated
+pump can precede its dominator in, and each block is compared against the
+skyline so far and itself in one vectorized step, instead of comparing all
+pairs. Peeling successive skylines gives the Pareto fronts.
+"""
+import numpy as np
+from typing import Optional, Tuple
+from config import PARETO
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _rank_sums(objectives: np.ndarray) -> np.ndarray:
+    """
+    Sum of each row's per-objective ranks (ties share a rank).
+    A dominating row always has a strictly lower sum, which makes it a
+    valid presorting key for the skyline pass and a unit-free tiebreak.
+    """
+    ranks = np.zeros(len(objectives), dtype=np.int64)
+    for column in objectives.T:
+        ranks += np.searchsorted(np.sort(column), column, side="left")
+    return ranks
+
+
+def _dominates(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise dominance of rows in a (m, d) over rows in b (k, d), as an (m, k) mask."""
+    # One 2-D comparison per objective keeps every operation contiguous
+    no_worse = np.ones((len(a), len(b)), dtype=bool)
+    better = np.zeros((len(a), len(b)), dtype=bool)
+    for k in range(a.shape[1]):
+        column_a, column_b = a[:, k, None], b[None, :, k]
+        no_worse &= column_a <= column_b
+        better |= column_a < column_b
+    return no_worse & better
+
+
+def _skyline_in_order(values: np.ndarray, order: np.ndarray, block_size: int) -> np.ndarray:
+    """Skyline rows among ``order``, which must be presorted by rank sum."""
+    on_front = np.zeros(len(values), dtype=bool)
+    remaining = order
+    while len(remaining):
+        rows, remaining = remaining[:block_size], remaining[block_size:]
+        block = values[rows]
+        # Dominators can only come earlier in this order; rows before the block
+        # were either kept or dropped by a kept row, so the block only needs
+        # checking against itself (a dominated dominator is itself dominated
+        # by an earlier front row, which keeps the check exact)
+        kept = ~_dominates(block, block).any(axis=0)
+        on_front[rows[kept]] = True
+        # Drop everything later that the new front rows dominate in one step
+        if len(remaining):
+            remaining = remaining[~_dominates(block[kept], values[remaining]).any(axis=0)]
+    return on_front
+
+
+def skyline(objectives: np.ndarray, block_size: Optional[int] = None) -> np.ndarray:
+    """
+    Non-dominated rows of an objective matrix (all objectives minimized).
+    Args:
+        objectives (np.ndarray): (n, d) objective values; NaN is treated as worst
+        block_size (Optional[int]): Rows compared per vectorized step,
+            PARETO["block_size"] if None
+    Returns:
+        np.ndarray: Boolean mask of the Pareto-optimal rows
+    """
+    values = np.where(np.isnan(objectives), np.inf, objectives)
+    order = np.argsort(_rank_sums(values), kind="stable")
+    return _skyline_in_order(values, order, block_size or PARETO["block_size"])
+
+
+def pareto_fronts(objectives: np.ndarray, max_fronts: Optional[int] = None) -> np.ndarray:
+    """
+    Pareto front number of every row by peeling successive skylines.
+    Args:
+        objectives (np.ndarray): (n, d) objective values, all minimized
+        max_fronts (Optional[int]): Fronts to peel, PARETO["max_fronts"] if None;
+            rows beyond them share the last front number
+    Returns:
+        np.ndarray: Front per row (0 = Pareto-optimal)
+    """
+    max_fronts = max_fronts or PARETO["max_fronts"]
+    values = np.where(np.isnan(objectives), np.inf, objectives)
+    fronts = np.full(len(values), max_fronts, dtype=np.int64)
+    # One presort serves every peel: removing rows keeps the rest in order
+    remaining = np.argsort(_rank_sums(values), kind="stable")
+    for front in range(max_fronts):
+        if not len(remaining):
+            break
+        on_front = _skyline_in_order(values, remaining, PARETO["block_size"])
+        fronts[on_front] = front
+        remaining = remaining[~on_front[remaining]]
+    return fronts
+
+
+def pareto_order(objectives: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ranking order by Pareto front, then by rank sum within a front.
+    Ties keep their incoming order.
+    Args:
+        objectives (np.ndarray): (n, d) objective values, all minimized
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (row order, front per row)
+    """
+    values = np.where(np.isnan(objectives), np.inf, objectives)
+    fronts = pareto_fronts(values)
+    order = np.lexsort((np.arange(len(values)), _rank_sums(values), fronts))
+    return order, fronts
+
@@ -1,19 +1,26 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+import numpy as np
 import logging
 
 # Import from our modules
 from config import (
     DEFAULT_VALUES, PAGE_CONFIG, FLOW_UNIT_CONVERSIONS,
     HEAD_UNIT_CONVERSIONS, ESSENTIAL_COLUMNS, PERFORMANCE_COLUMNS,
-    ELECTRICAL_COLUMNS, PHYSICAL_COLUMNS, ERROR_MESSAGES
+    ELECTRICAL_COLUMNS, PHYSICAL_COLUMNS, ERROR_MESSAGES, DATA_LOADING,
+    ENERGY, RESULTS_PAGING
 )
-from data_loader import (
-    load_pump_data, load_pump_curve_data,
-    validate_pump_data, validate_curve_data
-)
-from visualization import create_pump_curve_chart, create_comparison_chart
+from data_loader import load_catalog
+from catalog import CatalogRefresher, memory_report, format_age
+from ranking import run_search
+from combinations import find_combinations
+from nearest import NearestIndex
+from energy import energy_costs
+from model_search import ModelSearchIndex, render_model_search
+from export import render_export_panel
+from sql_engine import SqlEngine, is_available as sql_engine_available
+from results_table import render_results_table
+from curve_panel import render_curve_panel
 from translations import get_text, TRANSLATIONS
 
 # Configure logging
@@ -31,6 +38,10 @@ if 'language' not in st.session_state:
 if 'selected_curve_models' not in st.session_state:
     st.session_state.selected_curve_models = []
 
+# Initialize the friction allowance; Reset Inputs restores it from DEFAULT_VALUES
+if 'friction' not in st.session_state:
+    st.session_state.friction = DEFAULT_VALUES["friction"]
+
 # --- Header ---
 col_logo, col_title, col_lang = st.columns([1, 5, 3])
 with col_logo:
@@ -53,28 +64,84 @@ with col_lang:
 # --- Title and Reset Button ---
 st.title(get_text("Pump Selection Tool"))
 
-# Load the data
+@st.cache_resource(show_spinner=False)
+def get_catalog_refresher() -> CatalogRefresher:
+    """One background refresher per process, serving the catalog to every session."""
+    return CatalogRefresher(load_catalog, DATA_LOADING["cache_ttl"])
+
+# Load the data - only the very first load of the process waits on the network
 try:
     with st.spinner(get_text("Loading Curve")):
-        pumps = load_pump_data()
-        curve_data = load_pump_curve_data()
-        
-        # Validate data
-        is_valid, error_msg = validate_pump_data(pumps)
-        if not is_valid:
-            st.error(error_msg)
-            st.stop()
-            
-        is_valid, error_msg = validate_curve_data(curve_data)
-        if not is_valid:
-            st.error(error_msg)
-            st.stop()
-            
+        catalog_refresher = get_catalog_refresher()
+        catalog = catalog_refresher.current()
 except Exception as e:
     logger.error(f"Error loading data: {str(e)}")
     st.error(ERROR_MESSAGES["failed_data"].format(error=str(e)))
     st.stop()
 
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_sql_engine(_catalog, version: str) -> SqlEngine:
+    """Embedded SQL engine for one catalog version, shared by all sessions."""
+    return SqlEngine(_catalog)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_nearest_index(_catalog, version: str) -> NearestIndex:
+    """Nearest-pump index for one catalog version, shared by all sessions."""
+    return NearestIndex(_catalog)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_model_search_index(_catalog, version: str) -> ModelSearchIndex:
+    """Model-number lookup index for one catalog version, shared by all sessions."""
+    return ModelSearchIndex(_catalog)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def get_catalog_analytics(_catalog, version: str):
+    """Coverage and frequency/phase counts for one catalog version."""
+    engine = get_sql_engine(_catalog, version)
+    return engine.coverage_by_category(), engine.counts_by_frequency_phase()
+
+def suggest_combinations(params):
+    """Parallel/series arrangements for a search without matches, kept for the current search."""
+    cache_key = (catalog.version, st.session_state.get('search_id'))
+    cached = st.session_state.get('combination_cache')
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    combinations = find_combinations(catalog, params)
+    st.session_state.combination_cache = (cache_key, combinations)
+    return combinations
+
+def rank_search_positions(rows):
+    """Stored search positions with at least the first rows in rank order, sorting more of the tail when needed."""
+    params = st.session_state.search_params
+    positions = st.session_state.search_positions
+    if params["sorted_rows"] < min(rows, len(positions)):
+        # Rankings are deterministic, so the rows already shown keep their place
+        positions, _ = run_search(catalog, params, sorted_rows=rows)
+        params["sorted_rows"] = rows
+        st.session_state.search_positions = positions
+    return positions
+
+def search_costs(params, positions):
+    """Energy and lifecycle cost columns of the ranked results, kept for the current search."""
+    # Column headers are translated, so a language switch rebuilds the frame
+    cache_key = (catalog.version, st.session_state.get('search_id'), st.session_state.get('language', 'English'))
+    cached = st.session_state.get('cost_cache')
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    costs = energy_costs(catalog, positions, params)
+    cost_columns = pd.DataFrame({
+        get_text("Operating Power (kW)"): costs["power_kw"].round(2),
+        get_text("Annual Energy (kWh)"): costs["annual_kwh"].round(0),
+        get_text("Annual Cost"): costs["annual_cost"].round(0),
+        get_text("Lifecycle Cost"): costs["lifecycle_cost"].round(0)
+    }, index=positions)
+    st.session_state.cost_cache = (cache_key, cost_columns)
+    return cost_columns
+
+# Shared, read-only frames - never modify these in place
+pumps = catalog.pumps
+curve_data = catalog.curve_store
+
 if pumps.empty:
     st.error(get_text("No Data"))
     st.stop()
@@ -82,20 +149,38 @@ if pumps.empty:
 # Show data freshness information
 col_data1, col_data2 = st.columns(2)
 with col_data1:
-    st.caption(get_text("Data loaded", n_records=len(pumps), timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    st.caption(get_text(
+        "Data loaded",
+        n_records=len(pumps),
+        timestamp=catalog.loaded_at.strftime('%Y-%m-%d %H:%M:%S'),
+        age=format_age(catalog.checked_at)
+    ) + (f" | {get_text('Refreshing')}" if catalog_refresher.refreshing else ""))
 with col_data2:
     if not curve_data.empty:
         st.caption(get_text("Curve Data Loaded", count=len(curve_data)))
 
+# Catalog analytics run as SQL queries when the optional engine is installed
+if sql_engine_available():
+    with st.expander(get_text("Catalog Analytics"), expanded=False):
+        coverage, frequency_phase_counts = get_catalog_analytics(catalog, catalog.version)
+        st.caption(get_text("Coverage By Category"))
+        st.dataframe(coverage, hide_index=True, use_container_width=True)
+        st.caption(get_text("Counts By Frequency Phase"))
+        st.dataframe(frequency_phase_counts, hide_index=True, use_container_width=True)
+
+# Jump to any model's curve by (part of) its model number, outside the search flow
+with st.expander(get_text("Model Lookup"), expanded=False):
+    render_model_search(catalog, get_model_search_index(catalog, catalog.version))
+
 # Create columns with buttons close together on the left side
 col1, col2, col_space = st.columns([1, 1.2, 5.8])
 
 with col1:
     refresh_clicked = st.button(get_text("Refresh Data"), help="Refresh data from database", type="secondary", use_container_width=True)
     if refresh_clicked:
-        # Clear cache to force data reload
-        st.cache_data.clear()
-        st.rerun()
+        # Reload in the background - keep serving the current data until it is ready
+        catalog_refresher.request_refresh()
+        st.toast(get_text("Refreshing"))
     
 with col2:
     # Reset All Inputs Button
@@ -120,14 +205,9 @@ button[data-testid="baseButton-secondary"] {
 # --- Step 1: Initial Selection ---
 st.markdown(get_text("Step 1"))
 
-# Clean up Category values to ensure consistent filtering
+# Category values are cleaned once when the catalog is built
 if "Category" in pumps.columns:
-    # Convert all category values to strings and strip whitespace
-    pumps["Category"] = pumps["Category"].astype(str).str.strip()
-    # Replace NaN, None, etc. with empty string for consistent handling
-    pumps["Category"] = pumps["Category"].replace(["nan", "None", "NaN"], "")
-    # Get unique categories excluding blank/empty values
-    unique_categories = [c for c in pumps["Category"].unique() if c and c.strip() and c.lower() not in ["nan", "none"]]
+    unique_categories = catalog.categories
     
     # Create a mapping between translated categories and original categories
     translated_categories = []
@@ -140,7 +220,7 @@ if "Category" in pumps.columns:
     translated_to_original[all_categories_translated] = get_text("All Categories")
     
     # Then process each category from the database
-    for cat in sorted(unique_categories):
+    for cat in unique_categories:
         # Get translated category if available, otherwise use the original
         translated_cat = get_text(cat)
         translated_categories.append(translated_cat)
@@ -154,6 +234,7 @@ else:
     category_options = [get_text("All Categories")]
     translated_to_original = {get_text("All Categories"): get_text("All Categories")}
 
+# Step 1 filters rerun on change, so the inputs below always match the category
 # Display the translated category dropdown
 category_translated = st.selectbox(get_text("Category"), category_options)
 
@@ -165,20 +246,25 @@ else:
 
 # Use "Show All Frequency" instead of "Select..." for frequency
 if "Frequency (Hz)" in pumps.columns:
-    pumps["Frequency (Hz)"] = pd.to_numeric(pumps["Frequency (Hz)"], errors='coerce')
-    freq_options = sorted(pumps["Frequency (Hz)"].dropna().unique())
+    freq_options = catalog.frequencies
     frequency = st.selectbox(get_text("Frequency"), [get_text("Show All Frequency")] + freq_options)
 else:
     frequency = st.selectbox(get_text("Frequency"), [get_text("Show All Frequency")])
 
 # Use "Show All Phase" instead of "Select..." for phase
 if "Phase" in pumps.columns:
-    pumps["Phase"] = pd.to_numeric(pumps["Phase"], errors='coerce')
-    phase_options = [p for p in sorted(pumps["Phase"].dropna().unique()) if p in [1, 3]]
+    phase_options = catalog.phases
     phase = st.selectbox(get_text("Phase"), [get_text("Show All Phase")] + phase_options)
 else:
     phase = st.selectbox(get_text("Phase"), [get_text("Show All Phase"), 1, 3])
 
+# Pumps of other frequencies can be rescaled to the selected one (affinity laws)
+speed_conversion = st.checkbox(
+    get_text("Speed Conversion"),
+    key="speed_conversion",
+    help=get_text("Speed Conversion Help")
+)
+
 # Get all available columns from the dataset for later use in column selection
 if not pumps.empty:
     # Define essential columns that are always shown
@@ -192,13 +278,103 @@ else:
     essential_columns = []
     optional_columns = []
 
+# --- Result Display Limit ---
+# Live widgets, read when Search is submitted
+st.markdown(get_text("Result Display"))
+
+@st.fragment
+def render_column_selection(optional_columns, essential_columns, available_columns):
+    """Column picker - ticking a checkbox reruns only this fragment."""
+    with st.expander(get_text("Column Selection"), expanded=False):
+        # Create two columns for the selection interface
+        col_selection_left, col_selection_right = st.columns([1, 1])
+        
+        with col_selection_left:
+            st.caption(get_text("Essential Columns"))
+            st.write(", ".join([col for col in essential_columns if col in available_columns]))
+            
+            # Select/Deselect All buttons
+            col_btn1, col_btn2 = st.columns(2)
+            with col_btn1:
+                select_all = st.button(get_text("Select All"), key="select_all_cols", use_container_width=True)
+            with col_btn2:
+                deselect_all = st.button(get_text("Deselect All"), key="deselect_all_cols", use_container_width=True)
+        
+        with col_selection_right:
+            st.caption(get_text("Select Columns"))
+            
+            # Initialize selected columns in session state if not exists
+            if 'selected_columns' not in st.session_state:
+                # Default selection - Model will be first as essential, then these optional columns
+                default_selected = [
+                    "Category", "Frequency (Hz)", "Phase", "Q Rated/LPM", "Head Rated/M", "Max Flow (LPM)", "Max Head (M)",
+                    "Product Link"
+                ]
+                st.session_state.selected_columns = [col for col in default_selected if col in optional_columns]
+            
+            # Handle Select All / Deselect All button clicks
+            if select_all:
+                st.session_state.selected_columns = optional_columns.copy()
+            if deselect_all:
+                st.session_state.selected_columns = []
+            
+            # Create checkboxes for each optional column - store current state without immediate update
+            current_selection = []
+            for col in optional_columns:
+                is_selected = col in st.session_state.selected_columns
+                if st.checkbox(col, value=is_selected, key=f"col_check_{col}"):
+                    current_selection.append(col)
+            
+            # Store the current selection in a temporary state (don't update main state yet)
+            st.session_state.temp_selected_columns = current_selection
+
+# Column Selection in Result Display Control section
+if not pumps.empty and optional_columns:
+    render_column_selection(optional_columns, essential_columns, available_columns)
+else:
+    # Use the last confirmed selection from search, or default if none
+    selected_optional_columns = st.session_state.get('selected_columns', [])
+
+result_percent = st.slider(get_text("Show Percentage"), min_value=5, max_value=100, value=100, step=1)
+
+ranking_options = ["Best Match", "System Operating Point", "Pareto Optimal", "Lifecycle Cost", "ID Order"]
+ranking_translated = [get_text(option) for option in ranking_options]
+ranking_map = dict(zip(ranking_translated, ranking_options))
+ranking_mode = ranking_map.get(st.radio(get_text("Sort Results"), ranking_translated, horizontal=True), "Best Match")
+if ranking_mode == "Pareto Optimal":
+    st.caption(get_text("Pareto Optimal Help"))
+
+# Running-cost inputs for the "Lifecycle Cost" ranking
+duty_hours, tariff, lifetime_years = ENERGY["duty_hours"], ENERGY["tariff"], ENERGY["lifetime_years"]
+if ranking_mode == "Lifecycle Cost":
+    col_hours, col_tariff, col_years = st.columns(3)
+    with col_hours:
+        duty_hours = st.number_input(
+            get_text("Duty Hours"), min_value=0.0, max_value=8760.0, step=100.0,
+            value=float(ENERGY["duty_hours"]), key="duty_hours"
+        )
+    with col_tariff:
+        tariff = st.number_input(
+            get_text("Tariff"), min_value=0.0, step=0.01,
+            value=float(ENERGY["tariff"]), key="tariff"
+        )
+    with col_years:
+        lifetime_years = st.number_input(
+            get_text("Lifetime Years"), min_value=1, max_value=50, step=1,
+            value=int(ENERGY["lifetime_years"]), key="lifetime_years"
+        )
+
+# Application, pond, site and duty-point inputs are batched in one form whose
+# submit button is Search, so a search always uses the values on screen
+search_form = st.form("search_form", border=False)
+
 # --- 🏢 Application Section - Only show when Booster is selected ---
 if category == "Booster":
-    st.markdown(get_text("Application Input"))
-    st.caption(get_text("Floor Faucet Info"))
+    search_form.markdown(get_text("Application Input"))
+    search_form.caption(get_text("Floor Faucet Info"))
 
-    num_floors = st.number_input(get_text("Number of Floors"), min_value=0, step=1, key="floors")
-    num_faucets = st.number_input(get_text("Number of Faucets"), min_value=0, step=1, key="faucets")
+    num_floors = search_form.number_input(get_text("Number of Floors"), min_value=0, step=1, key="floors")
+    num_faucets = search_form.number_input(get_text("Number of Faucets"), min_value=0, step=1, key="faucets")
     
     # Calculate auto values for Booster application
     auto_flow = num_faucets * 15
@@ -211,25 +387,33 @@ else:
     num_faucets = 0
 
 # --- 🌊 Pond Drainage ---
-st.markdown(get_text("Pond Drainage"))
+search_form.markdown(get_text("Pond Drainage"))
 
-length = st.number_input(get_text("Pond Length"), min_value=0.0, step=0.1, key="length")
-width = st.number_input(get_text("Pond Width"), min_value=0.0, step=0.1, key="width")
-height = st.number_input(get_text("Pond Height"), min_value=0.0, step=0.1, key="height")
-drain_time_hr = st.number_input(get_text("Drain Time"), min_value=0.01, step=0.1, key="drain_time_hr")
+length = search_form.number_input(get_text("Pond Length"), min_value=0.0, step=0.1, key="length")
+width = search_form.number_input(get_text("Pond Width"), min_value=0.0, step=0.1, key="width")
+height = search_form.number_input(get_text("Pond Height"), min_value=0.0, step=0.1, key="height")
+drain_time_hr = search_form.number_input(get_text("Drain Time"), min_value=0.01, step=0.1, key="drain_time_hr")
 
+# --- Underground and particle size ---
+underground_depth = search_form.number_input(get_text("Pump Depth"), min_value=0.0, step=0.1, key="underground_depth")
+particle_size = search_form.number_input(get_text("Particle Size"), min_value=0.0, step=1.0, key="particle_size")
+friction = search_form.number_input(
+    get_text("Friction Coefficient"),
+    min_value=0.0,
+    step=0.1,
+    key="friction",
+    help=get_text("Friction Coefficient Help")
+)
+
+# Derived values reflect the last submitted inputs
 pond_volume = length * width * height * 1000
 drain_time_min = drain_time_hr * 60
 pond_lpm = pond_volume / drain_time_min if drain_time_min > 0 else 0
 
 if pond_volume > 0:
-    st.caption(get_text("Pond Volume", volume=round(pond_volume)))
+    search_form.caption(get_text("Pond Volume", volume=round(pond_volume)))
 if pond_lpm > 0:
-    st.success(get_text("Required Flow", flow=round(pond_lpm)))
-
-# --- Underground and particle size ---
-underground_depth = st.number_input(get_text("Pump Depth"), min_value=0.0, step=0.1, key="underground_depth")
-particle_size = st.number_input(get_text("Particle Size"), min_value=0.0, step=1.0, key="particle_size")
+    search_form.success(get_text("Required Flow", flow=round(pond_lpm)))
 
 # --- Auto calculations ---
 if category == "Booster":
@@ -240,89 +424,36 @@ else:
     auto_tdh = underground_depth if underground_depth > 0 else height
 
 # --- 🎛️ Manual Input Section ---
-st.markdown(get_text("Manual Input"))
+search_form.markdown(get_text("Manual Input"))
 
 flow_unit_options = ["L/min", "L/sec", "m³/hr", "m³/min", "US gpm"]
 flow_unit_translated = [get_text(unit) for unit in flow_unit_options]
 flow_unit_map = dict(zip(flow_unit_translated, flow_unit_options))
 
-flow_unit = st.radio(get_text("Flow Unit"), flow_unit_translated, horizontal=True)
+flow_unit = search_form.radio(get_text("Flow Unit"), flow_unit_translated, horizontal=True)
 flow_unit_original = flow_unit_map.get(flow_unit, "L/min")
-flow_value = st.number_input(get_text("Flow Value"), min_value=0.0, step=10.0, value=float(auto_flow), key="flow_value")
+flow_value = search_form.number_input(get_text("Flow Value"), min_value=0.0, step=10.0, value=float(auto_flow), key="flow_value")
 
 head_unit_options = ["m", "ft"]
 head_unit_translated = [get_text(unit) for unit in head_unit_options]
 head_unit_map = dict(zip(head_unit_translated, head_unit_options))
 
-head_unit = st.radio(get_text("Head Unit"), head_unit_translated, horizontal=True)
+head_unit = search_form.radio(get_text("Head Unit"), head_unit_translated, horizontal=True)
 head_unit_original = head_unit_map.get(head_unit, "m")
-head_value = st.number_input(get_text("TDH"), min_value=0.0, step=1.0, value=float(auto_tdh), key="head_value")
+head_value = search_form.number_input(get_text("TDH"), min_value=0.0, step=1.0, value=float(auto_tdh), key="head_value")
 
 # --- Estimated application from manual ---
 if category == "Booster":
     estimated_floors = round(head_value / 3.5) if head_value > 0 else 0
     estimated_faucets = round(flow_value / 15) if flow_value > 0 else 0
 
-    st.markdown(get_text("Estimated Application"))
-    col1, col2 = st.columns(2)
+    search_form.markdown(get_text("Estimated Application"))
+    col1, col2 = search_form.columns(2)
     col1.metric(get_text("Estimated Floors"), estimated_floors)
     col2.metric(get_text("Estimated Faucets"), estimated_faucets)
 
-# --- Result Display Limit ---
-st.markdown(get_text("Result Display"))
-
-# Column Selection in Result Display Control section
-if not pumps.empty and optional_columns:
-    with st.expander(get_text("Column Selection"), expanded=False):
-        # Create two columns for the selection interface
-        col_selection_left, col_selection_right = st.columns([1, 1])
-        
-        with col_selection_left:
-            st.caption(get_text("Essential Columns"))
-            st.write(", ".join([col for col in essential_columns if col in available_columns]))
-            
-            # Select/Deselect All buttons
-            col_btn1, col_btn2 = st.columns(2)
-            with col_btn1:
-                select_all = st.button(get_text("Select All"), key="select_all_cols", use_container_width=True)
-            with col_btn2:
-                deselect_all = st.button(get_text("Deselect All"), key="deselect_all_cols", use_container_width=True)
-        
-        with col_selection_right:
-            st.caption(get_text("Select Columns"))
-            
-            # Initialize selected columns in session state if not exists
-            if 'selected_columns' not in st.session_state:
-                # Default selection - Model will be first as essential, then these optional columns
-                default_selected = [
-                    "Category", "Frequency (Hz)", "Phase", "Q Rated/LPM", "Head Rated/M", "Max Flow (LPM)", "Max Head (M)",
-                    "Product Link"
-                ]
-                st.session_state.selected_columns = [col for col in default_selected if col in optional_columns]
-            
-            # Handle Select All / Deselect All button clicks
-            if select_all:
-                st.session_state.selected_columns = optional_columns.copy()
-            if deselect_all:
-                st.session_state.selected_columns = []
-            
-            # Create checkboxes for each optional column - store current state without immediate update
-            current_selection = []
-            for col in optional_columns:
-                is_selected = col in st.session_state.selected_columns
-                if st.checkbox(col, value=is_selected, key=f"col_check_{col}"):
-                    current_selection.append(col)
-            
-            # Store the current selection in a temporary state (don't update main state yet)
-            st.session_state.temp_selected_columns = current_selection
-else:
-    # Use the last confirmed selection from search, or default if none
-    selected_optional_columns = st.session_state.get('selected_columns', [])
-
-result_percent = st.slider(get_text("Show Percentage"), min_value=5, max_value=100, value=100, step=1)
-
 # --- Search Logic ---
-if st.button(get_text("Search")):
+if search_form.form_submit_button(get_text("Search")):
     # Update the column selection when search is pressed
     if 'temp_selected_columns' in st.session_state:
         st.session_state.selected_columns = st.session_state.temp_selected_columns
@@ -330,43 +461,21 @@ if st.button(get_text("Search")):
     else:
         selected_optional_columns = st.session_state.get('selected_columns', [])
     
-    filtered_pumps = pumps.copy()
-    
-    # Handle frequency and phase filtering with "Show All" options
+    # Resolve the "Show All" options into filter values (None = no filter)
+    freq_value = None
+    phase_value = None
     try:
-        # Convert types appropriately with error handling before filtering
-        filtered_pumps["Frequency (Hz)"] = pd.to_numeric(filtered_pumps["Frequency (Hz)"], errors='coerce')
-        filtered_pumps["Phase"] = pd.to_numeric(filtered_pumps["Phase"], errors='coerce')
-        
         # Apply frequency filter - skip filtering if "Show All Frequency" is selected
         if frequency != get_text("Show All Frequency"):
-            if isinstance(frequency, str):
-                try:
-                    freq_value = float(frequency)
-                    filtered_pumps = filtered_pumps[filtered_pumps["Frequency (Hz)"] == freq_value]
-                except ValueError:
-                    filtered_pumps = filtered_pumps[filtered_pumps["Frequency (Hz)"] == frequency]
-            else:
-                filtered_pumps = filtered_pumps[filtered_pumps["Frequency (Hz)"] == frequency]
+            freq_value = float(frequency)
         
         # Apply phase filter - skip filtering if "Show All Phase" is selected
         if phase != get_text("Show All Phase"):
-            if isinstance(phase, str):
-                try:
-                    phase_value = int(phase)
-                    filtered_pumps = filtered_pumps[filtered_pumps["Phase"] == phase_value]
-                except ValueError:
-                    filtered_pumps = filtered_pumps[filtered_pumps["Phase"] == phase]
-            else:
-                filtered_pumps = filtered_pumps[filtered_pumps["Phase"] == int(phase)]
+            phase_value = int(phase)
     except Exception as e:
         logger.error(f"Error filtering by frequency/phase: {str(e)}")
         st.error(f"Error filtering by frequency/phase: {str(e)}")
 
-    # Apply category filter - use the original English category name for filtering
-    if category != get_text("All Categories"):
-        filtered_pumps = filtered_pumps[filtered_pumps["Category"] == category]
-
     # Convert flow to LPM
     flow_lpm = flow_value
     if flow_unit_original in FLOW_UNIT_CONVERSIONS:
@@ -376,353 +485,167 @@ if st.button(get_text("Search")):
     head_m = head_value if head_unit_original == "m" else head_value * HEAD_UNIT_CONVERSIONS["ft"]
 
     # Use Q Rated/LPM and Head Rated/M instead of Max Flow and Max Head
-    # Ensure numeric conversion for flow and head with improved handling
-    # Replace NaN with 0 to avoid comparison issues
-    filtered_pumps["Q Rated/LPM"] = pd.to_numeric(filtered_pumps["Q Rated/LPM"], errors="coerce").fillna(0)
-    filtered_pumps["Head Rated/M"] = pd.to_numeric(filtered_pumps["Head Rated/M"], errors="coerce").fillna(0)
-
-    # Apply filters with safe handling of missing values
-    if flow_lpm > 0:
-        filtered_pumps = filtered_pumps[filtered_pumps["Q Rated/LPM"] >= flow_lpm]
-    if head_m > 0:
-        filtered_pumps = filtered_pumps[filtered_pumps["Head Rated/M"] >= head_m]
-    if particle_size > 0 and "Pass Solid Dia(mm)" in filtered_pumps.columns:
-        # Convert to numeric first to handle potential string values
-        filtered_pumps["Pass Solid Dia(mm)"] = pd.to_numeric(filtered_pumps["Pass Solid Dia(mm)"], errors="coerce").fillna(0)
-        filtered_pumps = filtered_pumps[filtered_pumps["Pass Solid Dia(mm)"] >= particle_size]
-
-    # Store filtered pumps in session state for curve visualization
-    st.session_state.filtered_pumps = filtered_pumps
+    search_params = {
+        "category": None if category == get_text("All Categories") else category,
+        "frequency": freq_value,
+        "phase": phase_value,
+        "flow_lpm": flow_lpm,
+        "head_m": head_m,
+        "particle_size": particle_size,
+        "result_percent": result_percent,
+        "ranking": ranking_mode,
+        "speed_conversion": speed_conversion,
+        # System curve: static lift from the pond/floor inputs (or the entered TDH) plus friction
+        "static_head": auto_tdh if auto_tdh > 0 else head_m,
+        "friction": friction,
+        # Running cost for the "Lifecycle Cost" ranking
+        "duty_hours": duty_hours,
+        "tariff": tariff,
+        "lifetime_years": lifetime_years,
+        "columns": list(selected_optional_columns)
+    }
+    # Only the first page is put in rank order; later pages are ranked as they are served
+    search_params["sorted_rows"] = RESULTS_PAGING["page_size"]
+    search_positions, search_params["match_count"] = run_search(catalog, search_params, search_params["sorted_rows"])
+    search_params["catalog_version"] = catalog.version
+    
+    # Sessions keep only row positions and query parameters, never frames
+    st.session_state.search_positions = search_positions
+    st.session_state.search_params = search_params
+    st.session_state.results_page = 1
+    st.session_state.search_id = st.session_state.get('search_id', 0) + 1
     st.session_state.user_flow = flow_lpm
     st.session_state.user_head = head_m
     
     # Reset pump curve selection when new search is performed
     st.session_state.selected_curve_models = []
+    
+    logger.info(f"Search memory: {memory_report(catalog, st.session_state)}")
+
+# --- Search Results ---
+# Rendered from the stored positions so results survive reruns
+if 'search_positions' in st.session_state:
+    search_positions = st.session_state.search_positions
+    search_params = st.session_state.search_params
+    
+    # Positions refer to one catalog version - replay the stored query after a swap
+    if search_params.get("catalog_version") != catalog.version:
+        search_positions, search_params["match_count"] = run_search(catalog, search_params, search_params["sorted_rows"])
+        search_params["catalog_version"] = catalog.version
+        st.session_state.search_positions = search_positions
+        st.session_state.search_id = st.session_state.get('search_id', 0) + 1
+    selected_optional_columns = search_params["columns"]
 
     st.subheader(get_text("Matching Pumps"))
-    st.write(get_text("Found Pumps", count=len(filtered_pumps)))
+    st.write(get_text("Found Pumps", count=search_params["match_count"]))
 
-    if not filtered_pumps.empty:
-        results = filtered_pumps.copy()
-        
-        # Sort by Q Rated/LPM and Head Rated/M for better user experience
-        if "Q Rated/LPM" in results.columns and "Head Rated/M" in results.columns:
-            # Properly handle data types before calculations
-            results["Q Rated/LPM"] = pd.to_numeric(results["Q Rated/LPM"], errors="coerce").fillna(0)
-            results["Head Rated/M"] = pd.to_numeric(results["Head Rated/M"], errors="coerce").fillna(0)
-            
-            # Sort by closest match to requested flow and head
-            results["Flow Difference"] = abs(results["Q Rated/LPM"] - flow_lpm)
-            results["Head Difference"] = abs(results["Head Rated/M"] - head_m)
-            
-            # Weight differences properly and handle NaN values
-            results["Match Score"] = results["Flow Difference"] + results["Head Difference"]
-            results = results.sort_values("Match Score")
-            
-            # Remove temporary columns used for sorting
-            results = results.drop(columns=["Flow Difference", "Head Difference", "Match Score"])
-        
-        # Sort by ID first (excluding DB ID), then apply percentage filter
-        if "id" in results.columns:
-            results = results.sort_values("id")
-        elif "ID" in results.columns:
-            results = results.sort_values("ID")
-        elif "Model" in results.columns:
-            results = results.sort_values("Model")
-        elif "Model No." in results.columns:
-            results = results.sort_values("Model No.")
-        
-        # Apply percentage limit after sorting by ID
-        max_to_show = max(1, int(len(results) * (result_percent / 100)))
-        displayed_results = results.head(max_to_show).copy()
-        
+    if len(search_positions) > 0:
         # Apply column selection - build columns in logical order
         columns_to_show = []
         
         # 1. Essential identification columns first
-        if "Model" in displayed_results.columns:
+        if "Model" in pumps.columns:
             columns_to_show.append("Model")
-        elif "Model No." in displayed_results.columns:
+        elif "Model No." in pumps.columns:
             columns_to_show.append("Model No.")
         
         # Add other essential columns (id, ID) - excluding DB ID
         for col in essential_columns:
-            if col in displayed_results.columns and col not in columns_to_show and col not in ["DB ID"]:
+            if col in pumps.columns and col not in columns_to_show and col not in ["DB ID"]:
                 columns_to_show.append(col)
         
         # 2. Category (if selected)
-        if "Category" in selected_optional_columns and "Category" in displayed_results.columns:
+        if "Category" in selected_optional_columns and "Category" in pumps.columns:
             columns_to_show.append("Category")
         
         # 3. Performance specifications (if selected)
         for col in PERFORMANCE_COLUMNS:
-            if col in selected_optional_columns and col in displayed_results.columns and col not in columns_to_show:
+            if col in selected_optional_columns and col in pumps.columns and col not in columns_to_show:
                 columns_to_show.append(col)
         
         # 4. Electrical specifications (if selected)
         for col in ELECTRICAL_COLUMNS:
-            if col in selected_optional_columns and col in displayed_results.columns and col not in columns_to_show:
+            if col in selected_optional_columns and col in pumps.columns and col not in columns_to_show:
                 columns_to_show.append(col)
         
         # 5. Physical specifications (if selected)
         for col in PHYSICAL_COLUMNS:
-            if col in selected_optional_columns and col in displayed_results.columns and col not in columns_to_show:
+            if col in selected_optional_columns and col in pumps.columns and col not in columns_to_show:
                 columns_to_show.append(col)
         
         # 6. Other selected columns (excluding Product Link for now)
         for col in selected_optional_columns:
-            if col in displayed_results.columns and col not in columns_to_show and col != "Product Link":
+            if col in pumps.columns and col not in columns_to_show and col != "Product Link":
                 columns_to_show.append(col)
         
         # 7. Product Link always last (if selected)
-        if "Product Link" in selected_optional_columns and "Product Link" in displayed_results.columns:
+        if "Product Link" in selected_optional_columns and "Product Link" in pumps.columns:
             columns_to_show.append("Product Link")
         
         # If no columns selected, show a message
         if not columns_to_show:
             st.warning("⚠️ No columns selected for display. Please select at least one column from the Column Selection section above.")
         else:
-            # Filter the dataframe to only show selected columns (ensuring DB ID is excluded)
-            displayed_results = displayed_results[columns_to_show]
-            
             # Display the results
             st.write(get_text("Matching Results"))
             
-            # Show information about displayed results and columns
-            if len(displayed_results) > 0:
-                st.write(get_text("Showing Results", count=len(displayed_results)))
-                st.caption(f"📋 Displaying {len(displayed_results.columns)} columns: {', '.join(displayed_results.columns[:5])}{'...' if len(displayed_results.columns) > 5 else ''}")
-                st.info(get_text("Select Pumps"))
-            
-            # Create column configuration for product links and proper formatting
-            column_config = {}
-            
-            # Configure the ID column for default sorting if it exists (excluding DB ID)
-            if "id" in displayed_results.columns:
-                column_config["id"] = st.column_config.NumberColumn(
-                    "ID",
-                    help="ID",
-                    format="%d"
-                )
-            elif "ID" in displayed_results.columns:
-                column_config["ID"] = st.column_config.NumberColumn(
-                    "ID",
-                    help="ID",
-                    format="%d"
-                )
-            
-            # Configure the Product Link column if it exists
-            if "Product Link" in displayed_results.columns:
-                column_config["Product Link"] = st.column_config.LinkColumn(
-                    "Product Link",
-                    help="Click to view product details",
-                    display_text=get_text("View Product")
-                )
-            
-            # Better formatting for Q Rated/LPM and Head Rated/M columns
-            if "Q Rated/LPM" in displayed_results.columns:
-                flow_label = get_text("Q Rated/LPM")
-                flow_help = get_text("Rated flow rate in liters per minute")
-                column_config["Q Rated/LPM"] = st.column_config.NumberColumn(
-                    flow_label,
-                    help=flow_help,
-                    format="%.1f LPM"
-                )
+            # Show information about displayed columns
+            st.caption(f"📋 Displaying {len(columns_to_show)} columns: {', '.join(columns_to_show[:5])}{'...' if len(columns_to_show) > 5 else ''}")
+            st.info(get_text("Select Pumps"))
             
-            if "Head Rated/M" in displayed_results.columns:
-                head_label = get_text("Head Rated/M")
-                head_help = get_text("Rated head in meters")
-                column_config["Head Rated/M"] = st.column_config.NumberColumn(
-                    head_label,
-                    help=head_help,
-                    format="%.1f m"
-                )
-            
-            # Configure other numeric columns with proper formatting
-            if "Max Flow (LPM)" in displayed_results.columns:
-                column_config["Max Flow (LPM)"] = st.column_config.NumberColumn(
-                    "Max Flow (LPM)",
-                    help="Maximum flow rate in liters per minute",
-                    format="%.1f LPM"
-                )
-            
-            if "Max Head (M)" in displayed_results.columns:
-                column_config["Max Head (M)"] = st.column_config.NumberColumn(
-                    "Max Head (M)",
-                    help="Maximum head in meters",
-                    format="%.1f m"
-                )
+            # Paged table - only the visible page is sent to the browser,
+            # and paging or sorting reruns just the table
+            # Running-cost columns come with the cost ranking and sort like catalog columns
+            cost_columns = search_costs(search_params, search_positions) \
+                if search_params["ranking"] == "Lifecycle Cost" else None
+            render_results_table(catalog, search_positions, columns_to_show, cost_columns, rank=rank_search_positions)
             
             # Define model column name
-            model_column = "Model" if "Model" in displayed_results.columns else "Model No."
+            model_column = "Model" if "Model" in columns_to_show else "Model No."
             
-            # Display the dataframe without selection column
+            # Curve panel reruns on its own when pumps are picked or curves shown
+            render_curve_panel(catalog, search_positions, columns_to_show, model_column, rank=rank_search_positions)
+
+            # Submittal package: result tables plus one datasheet per model
+            with st.expander(get_text("Export Results"), expanded=False):
+                render_export_panel(catalog, search_positions, columns_to_show, search_params, rank=rank_search_positions)
+    else:
+        st.warning(get_text("No Matches"))
+
+        # Closest pumps in the same category/frequency/phase and how far each falls short
+        nearest_positions, _, shortfall = get_nearest_index(catalog, catalog.version).query(
+            search_params["flow_lpm"],
+            search_params["head_m"],
+            search_params["particle_size"],
+            category=search_params["category"],
+            frequency=search_params["frequency"],
+            phase=search_params["phase"]
+        )
+        if len(nearest_positions):
+            st.markdown(get_text("Nearest Pumps"))
+            nearest_columns = [
+                col for col in ["Model", "Model No.", "Q Rated/LPM", "Head Rated/M", "Pass Solid Dia(mm)"]
+                if col in pumps.columns
+            ]
+            nearest_pumps = catalog.rows(nearest_positions, nearest_columns).reset_index(drop=True)
+            nearest_pumps[get_text("Flow Short (LPM)")] = shortfall[:, 0].round(1)
+            nearest_pumps[get_text("Head Short (m)")] = shortfall[:, 1].round(1)
+            if search_params["particle_size"] > 0:
+                nearest_pumps[get_text("Solid Short (mm)")] = shortfall[:, 2].round(1)
+            st.dataframe(nearest_pumps, hide_index=True, use_container_width=True)
+
+        # No single pump is enough - suggest several pumps in parallel or series
+        combinations = suggest_combinations(search_params)
+        if combinations:
+            st.markdown(get_text("Combination Suggestions"))
+            model_names = pumps["Model" if "Model" in pumps.columns else "Model No."].to_numpy()
             st.dataframe(
-                displayed_results,
-                column_config=column_config,
+                pd.DataFrame({
+                    get_text("Arrangement"): [get_text(c["arrangement"].title()) for c in combinations],
+                    get_text("Pumps"): [" + ".join(str(model_names[p]) for p in c["positions"]) for c in combinations],
+                    get_text("Pump Count"): [len(c["positions"]) for c in combinations],
+                    get_text("Total Power (kW)"): [round(c["total_power"], 2) for c in combinations]
+                }),
                 hide_index=True,
                 use_container_width=True
             )
-            
-            # --- PUMP CURVE VISUALIZATION SECTION ---
-            # Only show curve section if we have search results and curve data
-            if not curve_data.empty:
-                st.markdown("---")
-                st.markdown("### 📈 Pump Performance Analysis")
-                
-                # Create two columns for the interface
-                col_select, col_display = st.columns([1, 2])
-                
-                with col_select:
-                    # Check which models have curve data available
-                    if model_column in displayed_results.columns:
-                        available_models = displayed_results[model_column].dropna().unique().tolist()
-                        curve_models = curve_data["Model No."].dropna().unique()
-                        models_with_curves = [model for model in available_models if model in curve_models]
-                        
-                        if models_with_curves:
-                            # Initialize selection state if not exists
-                            if 'previous_selection' not in st.session_state:
-                                st.session_state.previous_selection = []
-                                st.session_state.selected_curve_models = []
-                            
-                            # Create multiselect for pump selection
-                            selected_models_multi = st.multiselect(
-                                get_text("Select Pumps"),
-                                models_with_curves,
-                                default=st.session_state.selected_curve_models,
-                                help="Select pumps to compare their performance curves",
-                                key="pump_selection"
-                            )
-                            
-                            # Track selection changes
-                            if selected_models_multi != st.session_state.previous_selection:
-                                st.session_state.previous_selection = selected_models_multi.copy()
-                            
-                            # Add Show Curve button
-                            if st.button(get_text("Show Curves"), type="primary", use_container_width=True):
-                                # Update the actual selection state only when button is clicked
-                                st.session_state.selected_curve_models = st.session_state.previous_selection
-                                st.rerun()
-                            
-                            # Show selected pumps info
-                            if st.session_state.previous_selection:
-                                st.success(f"Selected {len(st.session_state.previous_selection)} pump(s)")
-                                
-                                # Display selected pump details
-                                st.markdown("#### Selected Pump Details")
-                                for model in st.session_state.previous_selection:
-                                    pump_data = displayed_results[displayed_results[model_column] == model]
-                                    if not pump_data.empty:
-                                        st.markdown(f"**{model}**")
-                                        # Show key specifications
-                                        if "Q Rated/LPM" in pump_data.columns:
-                                            st.write(f"Rated Flow: {pump_data['Q Rated/LPM'].iloc[0]:.1f} LPM")
-                                        if "Head Rated/M" in pump_data.columns:
-                                            st.write(f"Rated Head: {pump_data['Head Rated/M'].iloc[0]:.1f} m")
-                                        if "Power(KW)" in pump_data.columns:
-                                            st.write(f"Power: {pump_data['Power(KW)'].iloc[0]:.2f} kW")
-                                        st.markdown("---")
-                        else:
-                            st.info("ℹ️ No curve data available for the pumps in your search results.")
-                
-                with col_display:
-                    # Check if we have selected models
-                    if 'selected_curve_models' in st.session_state and st.session_state.selected_curve_models:
-                        # Get user flow and head values
-                        user_flow = st.session_state.get('user_flow', 0)
-                        user_head = st.session_state.get('user_head', 0)
-                        
-                        # Check which selected models have curve data
-                        available_curve_models = []
-                        for model in st.session_state.selected_curve_models:
-                            if model in curve_data["Model No."].values:
-                                available_curve_models.append(model)
-                        
-                        if available_curve_models:
-                            if len(available_curve_models) == 1:
-                                # Show single pump curve
-                                st.subheader(get_text("Performance Curve", model=available_curve_models[0]))
-                                with st.spinner(get_text("Loading Curve")):
-                                    try:
-                                        fig = create_pump_curve_chart(curve_data, available_curve_models[0], user_flow, user_head)
-                                        if fig:
-                                            st.plotly_chart(fig, use_container_width=True)
-                                            
-                                            # Add operating point analysis
-                                            if user_flow > 0 and user_head > 0:
-                                                st.markdown("#### Operating Point Analysis")
-                                                st.write(f"Your operating point: {user_flow:.1f} LPM at {user_head:.1f} m")
-                                                
-                                                # Get pump data for analysis
-                                                pump_data = displayed_results[displayed_results[model_column] == available_curve_models[0]]
-                                                if not pump_data.empty:
-                                                    if "Q Rated/LPM" in pump_data.columns and "Head Rated/M" in pump_data.columns:
-                                                        rated_flow = pump_data["Q Rated/LPM"].iloc[0]
-                                                        rated_head = pump_data["Head Rated/M"].iloc[0]
-                                                        
-                                                        # Calculate percentage of rated conditions
-                                                        flow_percent = (user_flow / rated_flow * 100) if rated_flow > 0 else 0
-                                                        head_percent = (user_head / rated_head * 100) if rated_head > 0 else 0
-                                                        
-                                                        st.write(f"Operating at {flow_percent:.1f}% of rated flow")
-                                                        st.write(f"Operating at {head_percent:.1f}% of rated head")
-                                    except Exception as e:
-                                        logger.error(f"Error creating pump curve: {str(e)}")
-                                        st.error(f"Error creating pump curve: {str(e)}")
-                                    
-                            elif len(available_curve_models) > 1:
-                                # Show comparison chart
-                                st.subheader(get_text("Multiple Curves"))
-                                st.caption(f"Comparing: {', '.join(available_curve_models)}")
-                                with st.spinner(get_text("Loading Comparison")):
-                                    try:
-                                        fig_comp = create_comparison_chart(curve_data, available_curve_models, user_flow, user_head)
-                                        if fig_comp:
-                                            st.plotly_chart(fig_comp, use_container_width=True)
-                                            
-                                            # Add comparison analysis
-                                            if user_flow > 0 and user_head > 0:
-                                                st.markdown("#### Comparison Analysis")
-                                                st.write(f"Your operating point: {user_flow:.1f} LPM at {user_head:.1f} m")
-                                                
-                                                # Compare operating points for each pump
-                                                for model in available_curve_models:
-                                                    pump_data = displayed_results[displayed_results[model_column] == model]
-                                                    if not pump_data.empty:
-                                                        st.markdown(f"**{model}**")
-                                                        if "Q Rated/LPM" in pump_data.columns and "Head Rated/M" in pump_data.columns:
-                                                            rated_flow = pump_data["Q Rated/LPM"].iloc[0]
-                                                            rated_head = pump_data["Head Rated/M"].iloc[0]
-                                                            
-                                                            flow_percent = (user_flow / rated_flow * 100) if rated_flow > 0 else 0
-                                                            head_percent = (user_head / rated_head * 100) if rated_head > 0 else 0
-                                                            
-                                                            st.write(f"Operating at {flow_percent:.1f}% of rated flow")
-                                                            st.write(f"Operating at {head_percent:.1f}% of rated head")
-                                                        st.markdown("---")
-                                    except Exception as e:
-                                        logger.error(f"Error creating comparison chart: {str(e)}")
-                                        st.error(f"Error creating comparison chart: {str(e)}")
-                                
-                                # Show individual curves in expandable sections
-                                if len(available_curve_models) > 1:
-                                    with st.expander("View Individual Pump Curves", expanded=False):
-                                        for model in available_curve_models:
-                                            st.subheader(get_text("Performance Curve", model=model))
-                                            try:
-                                                fig = create_pump_curve_chart(curve_data, model, user_flow, user_head)
-                                                if fig:
-                                                    st.plotly_chart(fig, use_container_width=True)
-                                                else:
-                                                    st.warning(get_text("No Curve Data"))
-                                            except Exception as e:
-                                                logger.error(f"Error creating curve for {model}: {str(e)}")
-                                                st.error(f"Error creating curve for {model}: {str(e)}")
-                        else:
-                            st.warning("The selected pumps do not have curve data available.")
-                    else:
-                        # Show message to select pumps
-                        st.info("👆 Please select one or more pumps from the left panel and click 'Show Curves' to view their performance curves")
-    else:
-        st.warning(get_text("No Matches"))
@@ -0,0 +1,203 @@
+"""
+Ranking helpers for the Pump Selection Tool search results.
+"""
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+from catalog import PumpCatalog
+from operating_point import solve_operating_points, operating_point_scores
+from pareto import pareto_order
+from energy import energy_costs
+import logging
+
+logger = logging.getLogger(__name__)
+
+def match_scores(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    flow_lpm: float,
+    head_m: float,
+    speed_ratios: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Compute the Match Score (flow difference + head difference) for some rows.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Row positions to score
+        flow_lpm (float): Requested flow in LPM
+        head_m (float): Requested head in meters
+        speed_ratios (Optional[np.ndarray]): Speed ratio per position; rated points
+            are rescaled with the affinity laws when given
+    Returns:
+        np.ndarray: Match Score per position (lower is better)
+    """
+    flows = catalog.columns["Q Rated/LPM"][positions]
+    heads = catalog.columns["Head Rated/M"][positions]
+    if speed_ratios is not None:
+        flows = flows * speed_ratios
+        heads = heads * speed_ratios ** 2
+    return np.abs(flows - flow_lpm) + np.abs(heads - head_m)
+
+def pareto_objectives(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    flow_lpm: float,
+    head_m: float,
+    speed_ratios: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Objectives for the "Pareto Optimal" ranking, all minimized: relative flow
+    and head oversizing (for each requirement given) and motor power.
+    Relative margins keep flow and head comparable without mixing units.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Row positions to score
+        flow_lpm (float): Requested flow in LPM
+        head_m (float): Requested head in meters
+        speed_ratios (Optional[np.ndarray]): Speed ratio per position; rated points
+            and power are rescaled with the affinity laws when given
+    Returns:
+        np.ndarray: (n, d) objective matrix
+    """
+    ratios = np.ones(len(positions)) if speed_ratios is None else speed_ratios
+    objectives = []
+    if flow_lpm > 0:
+        objectives.append(catalog.columns["Q Rated/LPM"][positions] * ratios / flow_lpm - 1.0)
+    if head_m > 0:
+        objectives.append(catalog.columns["Head Rated/M"][positions] * ratios ** 2 / head_m - 1.0)
+    objectives.append(catalog.power_kw(positions) * ratios ** 3)
+    return np.column_stack(objectives)
+
+def _best_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k smallest scores (earliest ties first), in incoming order."""
+    if k >= len(scores):
+        return np.arange(len(scores))
+    # k-th smallest score via partial selection, then keep everything
+    # better than it plus the earliest ties to fill k slots
+    kth = np.partition(scores, k - 1)[k - 1]
+    keep = scores < kth
+    keep[np.flatnonzero(scores == kth)[:k - np.count_nonzero(keep)]] = True
+    return np.flatnonzero(keep)
+
+def top_k(positions: np.ndarray, scores: np.ndarray, k: int, sorted_rows: Optional[int] = None) -> np.ndarray:
+    """
+    Select the k best-scoring positions without sorting the whole set.
+    Uses a partial selection (np.partition, O(n)) and only sorts the winners
+    that will be shown; the rest of the k follow in their incoming order.
+    Ties are broken by the incoming order of ``positions``; NaN scores rank last.
+    Args:
+        positions (np.ndarray): Candidate row positions
+        scores (np.ndarray): Score per candidate (lower is better)
+        k (int): Number of candidates to keep
+        sorted_rows (Optional[int]): Leading winners to put in rank order (all if None)
+    Returns:
+        np.ndarray: Up to k positions, best first
+    """
+    n = len(positions)
+    if k <= 0 or n == 0:
+        return positions[:0]
+    # NaN compares false with everything, so a NaN k-th score would select nothing
+    scores = np.where(np.isnan(scores), np.inf, scores)
+    best = _best_indices(scores, k)
+    tail = best[:0]
+    if sorted_rows is not None and sorted_rows < len(best):
+        # Same selection again within the winners; the tail stays unsorted
+        # and a larger sorted_rows later yields the same leading rows
+        lead = np.zeros(len(best), dtype=bool)
+        lead[_best_indices(scores[best], max(sorted_rows, 0))] = True
+        best, tail = best[lead], best[~lead]
+    # Sort only the leading winners: by score, then by incoming order
+    order = np.lexsort((best, scores[best]))
+    return positions[np.concatenate((best[order], tail))]
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int, int]:
+    """
+    Clamp a 1-based page number and return its slice bounds.
+    Args:
+        total (int): Number of ranked rows
+        page (int): Requested 1-based page number
+        page_size (int): Rows per page
+    Returns:
+        Tuple[int, int, int]: (page, start, end)
+    """
+    n_pages = max(1, -(-total // page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return page, start, min(start + page_size, total)
+
+def run_search(catalog: PumpCatalog, params: Dict[str, Any], sorted_rows: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """
+    Run a stored search against a catalog: filter, rank and apply the display limit.
+    Sessions keep only ``params``, so a search can be replayed against a newer
+    catalog version, or with a larger ``sorted_rows`` when the user pages past
+    the rows already in rank order.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        params (Dict[str, Any]): Search parameters (category, frequency, phase,
+            flow_lpm, head_m, particle_size, result_percent, ranking, and optionally
+            speed_conversion, plus static_head and friction for the
+            "System Operating Point" ranking and duty_hours, tariff and
+            lifetime_years for the "Lifecycle Cost" ranking)
+        sorted_rows (Optional[int]): Leading rows to put in rank order; the
+            remaining displayed rows follow unsorted (all rows sorted if None)
+    Returns:
+        Tuple[np.ndarray, int]: (ranked positions to display, total match count)
+    """
+    # With speed conversion, pumps of any frequency are candidates once their
+    # rated point is rescaled to the target frequency (affinity laws)
+    target_hz = params["frequency"]
+    convert = bool(params.get("speed_conversion")) and target_hz is not None
+
+    # All predicates run as one fused pass over the catalog's typed columns,
+    # returning positions already in ID order
+    match_positions = catalog.select(
+        category=params["category"],
+        frequency=None if convert else target_hz,
+        phase=params["phase"],
+        min_flow=0.0 if convert else params["flow_lpm"],
+        min_head=0.0 if convert else params["head_m"],
+        min_solid=params["particle_size"]
+    )
+
+    speed_ratios = None
+    if convert:
+        speed_ratios = catalog.speeds.ratios(target_hz)[match_positions]
+        flows = catalog.columns["Q Rated/LPM"][match_positions] * speed_ratios
+        heads = catalog.columns["Head Rated/M"][match_positions] * speed_ratios ** 2
+        keep = ~np.isnan(speed_ratios)
+        if params["flow_lpm"] > 0:
+            keep &= flows >= params["flow_lpm"]
+        if params["head_m"] > 0:
+            keep &= heads >= params["head_m"]
+        match_positions = match_positions[keep]
+        speed_ratios = speed_ratios[keep]
+
+    # Apply percentage limit to the ranked results
+    max_to_show = max(1, int(len(match_positions) * (params["result_percent"] / 100)))
+    if params["ranking"] == "Best Match":
+        # Partial selection of the best Match Scores - no full sort
+        scores = match_scores(catalog, match_positions, params["flow_lpm"], params["head_m"], speed_ratios)
+        ranked_positions = top_k(match_positions, scores, max_to_show, sorted_rows)
+    elif params["ranking"] == "System Operating Point":
+        # Where each pump actually runs on the system curve, solved for all matches at once
+        coefficients, max_flow = catalog.speeds.curves_at(target_hz if convert else None)
+        flows, heads = solve_operating_points(
+            coefficients[match_positions],
+            max_flow[match_positions],
+            params.get("static_head", params["head_m"]),
+            params.get("friction", 0.0)
+        )
+        scores = operating_point_scores(flows, heads, params["flow_lpm"], params["head_m"])
+        ranked_positions = top_k(match_positions, scores, max_to_show, sorted_rows)
+    elif params["ranking"] == "Pareto Optimal":
+        # Pareto fronts over oversizing and power - the non-dominated pumps come first
+        objectives = pareto_objectives(catalog, match_positions, params["flow_lpm"], params["head_m"], speed_ratios)
+        order, _ = pareto_order(objectives)
+        ranked_positions = match_positions[order[:max_to_show]]
+    elif params["ranking"] == "Lifecycle Cost":
+        # Energy cost at each pump's operating point, for all matches in one pass
+        costs = energy_costs(catalog, match_positions, params)
+        ranked_positions = top_k(match_positions, costs["lifecycle_cost"], max_to_show, sorted_rows)
+    else:
+        ranked_positions = match_positions[:max_to_show]
+
+    return ranked_positions.astype(np.int32), len(match_positions)
@@ -0,0 +1,202 @@
+"""
+Paged search results table for the Pump Selection Tool.
+
+Only the visible page is gathered from the catalog and serialized to the
+browser. The table runs as a fragment, so paging or re-sorting reruns just
+the table and never the search.
+"""
+import streamlit as st
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from catalog import PumpCatalog
+from ranking import page_bounds
+from config import RESULTS_PAGING
+from translations import get_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=64)
+def build_column_config(columns: Tuple[str, ...], language: str) -> Dict[str, Any]:
+    """
+    Build the st.dataframe column configuration for a set of columns.
+    Cached per column set and language instead of being rebuilt every rerun.
+    Args:
+        columns (Tuple[str, ...]): Displayed columns
+        language (str): Current UI language (part of the cache key)
+    Returns:
+        Dict[str, Any]: Column configuration for st.dataframe
+    """
+    column_config = {}
+
+    # Configure the ID column for default sorting if it exists (excluding DB ID)
+    if "id" in columns:
+        column_config["id"] = st.column_config.NumberColumn(
+            "ID",
+            help="ID",
+            format="%d"
+        )
+    elif "ID" in columns:
+        column_config["ID"] = st.column_config.NumberColumn(
+            "ID",
+            help="ID",
+            format="%d"
+        )
+
+    # Configure the Product Link column if it exists
+    if "Product Link" in columns:
+        column_config["Product Link"] = st.column_config.LinkColumn(
+            "Product Link",
+            help="Click to view product details",
+            display_text=get_text("View Product")
+        )
+
+    # Better formatting for Q Rated/LPM and Head Rated/M columns
+    if "Q Rated/LPM" in columns:
+        column_config["Q Rated/LPM"] = st.column_config.NumberColumn(
+            get_text("Q Rated/LPM"),
+            help=get_text("Rated flow rate in liters per minute"),
+            format="%.1f LPM"
+        )
+
+    if "Head Rated/M" in columns:
+        column_config["Head Rated/M"] = st.column_config.NumberColumn(
+            get_text("Head Rated/M"),
+            help=get_text("Rated head in meters"),
+            format="%.1f m"
+        )
+
+    # Configure other numeric columns with proper formatting
+    if "Max Flow (LPM)" in columns:
+        column_config["Max Flow (LPM)"] = st.column_config.NumberColumn(
+            "Max Flow (LPM)",
+            help="Maximum flow rate in liters per minute",
+            format="%.1f LPM"
+        )
+
+    if "Max Head (M)" in columns:
+        column_config["Max Head (M)"] = st.column_config.NumberColumn(
+            "Max Head (M)",
+            help="Maximum head in meters",
+            format="%.1f m"
+        )
+
+    return column_config
+
+def sort_positions(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    sort_column: str,
+    descending: bool = False,
+    extra: Optional[pd.DataFrame] = None
+) -> np.ndarray:
+    """
+    Reorder ranked positions by a catalog column, server-side.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions
+        sort_column (str): Column to sort by
+        descending (bool): Sort descending instead of ascending
+        extra (Optional[pd.DataFrame]): Computed columns indexed by catalog position
+    Returns:
+        np.ndarray: Positions sorted by the column (stable, missing values last)
+    """
+    if extra is not None and sort_column in extra.columns:
+        values = pd.Series(extra[sort_column].reindex(positions).to_numpy())
+    elif sort_column in catalog.columns and catalog.columns[sort_column].dtype != object:
+        values = pd.Series(catalog.columns[sort_column][positions])
+    else:
+        values = pd.Series(catalog.pumps[sort_column].to_numpy()[positions])
+    order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+    return positions[order]
+
+def _sorted_positions(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    sort_column: str,
+    descending: bool,
+    extra: Optional[pd.DataFrame]
+) -> np.ndarray:
+    """Return positions in the requested order, reusing the last sort of this search."""
+    if sort_column == get_text("Rank Order"):
+        return positions
+    cache_key = (catalog.version, st.session_state.get('search_id'), sort_column, descending)
+    cached = st.session_state.get('results_sort_cache')
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    sorted_positions = sort_positions(catalog, positions, sort_column, descending, extra)
+    st.session_state.results_sort_cache = (cache_key, sorted_positions)
+    return sorted_positions
+
+@st.fragment
+def render_results_table(
+    catalog: PumpCatalog,
+    positions: np.ndarray,
+    columns: List[str],
+    extra: Optional[pd.DataFrame] = None,
+    rank: Optional[Callable[[int], np.ndarray]] = None
+) -> None:
+    """
+    Render one page of the ranked search results.
+    Args:
+        catalog (PumpCatalog): The shared catalog
+        positions (np.ndarray): Ranked row positions of the current search
+        columns (List[str]): Columns to display
+        extra (Optional[pd.DataFrame]): Computed columns indexed by catalog position,
+            shown after ``columns`` and sortable like them
+        rank (Optional[Callable[[int], np.ndarray]]): Returns the positions with at
+            least the given number of leading rows in rank order, when ``positions``
+            is only partly sorted
+    """
+    extra_columns = [] if extra is None else list(extra.columns)
+    page_size = RESULTS_PAGING["page_size"]
+    total_results = len(positions)
+    n_pages = max(1, -(-total_results // page_size))
+
+    # Optional server-side sort over all ranked rows, not just the visible page
+    col_sort, col_dir, col_page = st.columns([2, 1, 1])
+    with col_sort:
+        sort_column = st.selectbox(
+            get_text("Sort Column"),
+            [get_text("Rank Order")] + list(columns) + extra_columns,
+            key="results_sort_column"
+        )
+    with col_dir:
+        descending = st.toggle(get_text("Descending"), key="results_sort_desc")
+    with col_page:
+        page = st.number_input(
+            get_text("Page"),
+            min_value=1,
+            max_value=n_pages,
+            step=1,
+            key="results_page",
+            disabled=n_pages == 1
+        )
+
+    page, page_start, page_end = page_bounds(total_results, page, page_size)
+    if rank is not None:
+        # Rank only the rows served so far; a column sort needs them all
+        positions = rank(page_end if sort_column == get_text("Rank Order") else total_results)
+    ordered = _sorted_positions(catalog, positions, sort_column, descending, extra)
+
+    # Gather only the current page's rows and displayed columns
+    page_positions = ordered[page_start:page_end]
+    page_results = catalog.rows(page_positions, columns)
+    if extra_columns:
+        page_results = page_results.assign(**{
+            col: extra[col].reindex(page_positions).to_numpy() for col in extra_columns
+        })
+
+    if n_pages > 1:
+        st.write(get_text("Page Info", start=page_start + 1, end=page_end, total=total_results))
+    else:
+        st.write(get_text("Showing Results", count=len(page_results)))
+
+    st.dataframe(
+        page_results,
+        column_config=build_column_config(tuple(columns), st.session_state.get('language', 'English')),
+        hide_index=True,
+        use_container_width=True
+    )
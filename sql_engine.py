@@ -0,0 +1,95 @@
+"""
+Optional embedded SQL engine (DuckDB) for catalog analytics.
+
+When DuckDB is installed, the catalog's typed columns are registered as
+in-memory tables and the coverage and frequency/phase aggregates run as
+SQL queries. Search itself stays on the NumPy path, which is faster at
+every catalog size.
+"""
+import numpy as np
+import pandas as pd
+from catalog import PumpCatalog
+import logging
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+COVERAGE_SQL = """
+SELECT
+    CASE WHEN category = '' THEN NULL ELSE category END AS "Category",
+    count(*) AS "Pumps",
+    min(q_rated) AS "Min Flow (LPM)",
+    max(q_rated) AS "Max Flow (LPM)",
+    min(head_rated) AS "Min Head (M)",
+    max(head_rated) AS "Max Head (M)",
+    count(*) FILTER (WHERE has_curve) AS "With Curves"
+FROM pumps
+GROUP BY 1
+ORDER BY "Pumps" DESC
+"""
+
+FREQUENCY_PHASE_SQL = """
+SELECT frequency AS "Frequency (Hz)", phase AS "Phase", count(*) AS "Pumps"
+FROM pumps
+GROUP BY ALL
+ORDER BY 1, 2
+"""
+
+def is_available() -> bool:
+    """Whether the optional DuckDB dependency is installed."""
+    return duckdb is not None
+
+class SqlEngine:
+    """
+    Catalog registered in an embedded DuckDB database.
+    One engine is built per catalog version; queries use a cursor per call,
+    so the engine can be shared across sessions.
+    """
+
+    def __init__(self, catalog: PumpCatalog):
+        if duckdb is None:
+            raise ImportError("duckdb is not installed")
+        self.version = catalog.version
+        cols = catalog.columns
+        n = len(catalog)
+
+        def column(name: str) -> np.ndarray:
+            return cols[name] if name in cols else np.full(n, np.nan)
+
+        # Same model-to-curve matching as the NumPy path
+        has_curve = catalog.curve_rows >= 0
+
+        pumps_frame = pd.DataFrame({
+            "pos": np.arange(n, dtype=np.int64),
+            "category": cols["Category"] if "Category" in cols else np.full(n, "", dtype=object),
+            "frequency": column("Frequency (Hz)"),
+            "phase": column("Phase"),
+            "q_rated": column("Q Rated/LPM"),
+            "head_rated": column("Head Rated/M"),
+            "solid": column("Pass Solid Dia(mm)") if "Pass Solid Dia(mm)" in cols else np.zeros(n),
+            "has_curve": has_curve
+        })
+        # Materialize as tables - registered views are not visible to cursors
+        self._conn = duckdb.connect()
+        self._conn.register("pumps_frame", pumps_frame)
+        self._conn.execute("CREATE TABLE pumps AS SELECT * FROM pumps_frame")
+        self._conn.unregister("pumps_frame")
+        self._conn.register("curves_frame", catalog.curve_store.long_frame())
+        self._conn.execute("CREATE TABLE curves AS SELECT * FROM curves_frame")
+        self._conn.unregister("curves_frame")
+
+    def query(self, sql: str) -> pd.DataFrame:
+        """Run an analytics query against the registered pumps and curves tables."""
+        return self._conn.cursor().execute(sql).df()
+
+    def coverage_by_category(self) -> pd.DataFrame:
+        """Pump count, rated flow/head range and curve coverage per category."""
+        return self.query(COVERAGE_SQL)
+
+    def counts_by_frequency_phase(self) -> pd.DataFrame:
+        """Pump count per frequency and phase."""
+        return self.query(FREQUENCY_PHASE_SQL)
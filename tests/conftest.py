@@ -0,0 +1,16 @@
+"""
+Shared fixtures for the Pump Selection Tool tests.
+The app is a set of flat modules, so the repository root goes on sys.path.
+"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import synthetic_catalog
+
+@pytest.fixture(scope="session")
+def catalog():
+    """Synthetic catalog shared by all tests (read-only)."""
+    return synthetic_catalog(400)
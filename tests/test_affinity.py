@@ -0,0 +1,63 @@
+"""
+Affinity-law rescaling and the minimum-speed solver.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from affinity import SpeedEngine, affinity_scale
+from config import AFFINITY
+from curve_fits import horner
+
+def quadratic_engine():
+    # H(Q) = shutoff - drop * (Q / max_flow)²; the last pump has no curve (row -1)
+    shutoff = np.array([30.0, 20.0, 12.0])
+    drop = np.array([25.0, 10.0, 6.0])
+    max_flow = np.array([500.0, 1200.0, 300.0])
+    fits = SimpleNamespace(
+        coefficients=np.column_stack((shutoff, np.zeros(3), -drop)),
+        max_flow=max_flow,
+        degree=2
+    )
+    engine = SpeedEngine(fits, np.array([0, 1, 2, -1]), np.array([50.0, 60.0, 0.0, 50.0]))
+    return engine, shutoff, drop, max_flow
+
+def test_affinity_scale_laws():
+    coefficients = np.array([[30.0, 1.0, -25.0], [20.0, -3.0, -10.0]])
+    max_flow = np.array([500.0, 1200.0])
+    ratios = np.array([1.2, 0.8])
+    scaled, scaled_max = affinity_scale(coefficients, max_flow, ratios)
+    np.testing.assert_allclose(scaled_max, max_flow * ratios)
+    flows = np.array([200.0, 700.0])
+    # Q2 = r Q1 runs at H2 = r² H1
+    np.testing.assert_allclose(
+        horner(scaled, ratios * flows / scaled_max),
+        ratios ** 2 * horner(coefficients, flows / max_flow)
+    )
+
+def test_curves_at_ratios_and_cache():
+    engine, _, _, _ = quadratic_engine()
+    ratios = engine.ratios(60.0)
+    np.testing.assert_allclose(ratios[[0, 1, 3]], [1.2, 1.0, 1.2])
+    assert np.isnan(ratios[2])
+    coefficients, max_flow = engine.curves_at(60.0)
+    np.testing.assert_allclose(max_flow[:2], [600.0, 1200.0])
+    # Unknown frequency and missing curve give NaN
+    assert np.isnan(max_flow[2]) and np.isnan(max_flow[3]) and np.isnan(coefficients[3]).all()
+    assert engine.curves_at(60.0)[0] is coefficients
+    assert not coefficients.flags.writeable
+
+def test_minimum_speed_matches_analytic():
+    engine, shutoff, drop, max_flow = quadratic_engine()
+    flow, head = 300.0, 15.0
+    speeds = engine.minimum_speed(np.array([0, 1, 2, 3]), flow, head)
+    # At ratio r the head at Q is r² shutoff - drop (Q / max_flow)², and Q <= r max_flow
+    ratios = np.sqrt((head + drop * (flow / max_flow) ** 2) / shutoff)
+    ratios = np.maximum(ratios, flow / max_flow)
+    ratios = np.maximum(ratios, AFFINITY["min_speed_ratio"])
+    reachable = ratios <= AFFINITY["max_speed_ratio"]
+    expected = np.where(reachable, ratios * np.array([50.0, 60.0, 0.0]), np.nan)
+    assert np.isfinite(speeds[:2]).all()
+    np.testing.assert_allclose(speeds[:2], expected[:2], rtol=1e-6)
+    # Unknown native frequency and no curve are unreachable
+    assert np.isnan(speeds[2]) and np.isnan(speeds[3])
@@ -0,0 +1,44 @@
+"""
+Compact chart serialization must draw the same data with a smaller payload.
+"""
+import numpy as np
+import plotly.io as pio
+import pytest
+
+import config
+from visualization import COMPACT_TEMPLATE, TRACE_DEFAULTS, create_comparison_chart, create_pump_curve_chart
+
+@pytest.fixture
+def models(catalog):
+    store = catalog.curve_store
+    return [m for m in store.models if len(store.curve(m)[0])][:10]
+
+def build(catalog, models, compact, monkeypatch):
+    monkeypatch.setitem(config.CHART_RENDERING, "compact_payload", compact)
+    return create_comparison_chart(catalog.curve_store, models, 100, 10)
+
+def test_compact_payload_is_smaller(catalog, models, monkeypatch):
+    full = build(catalog, models, False, monkeypatch)
+    compact = build(catalog, models, True, monkeypatch)
+    assert len(pio.to_json(compact, validate=False)) < len(pio.to_json(full, validate=False)) / 2
+    assert compact.layout.template.layout.height == 500
+
+def test_compact_payload_same_data(catalog, models, monkeypatch):
+    full = build(catalog, models, False, monkeypatch)
+    compact = build(catalog, models, True, monkeypatch)
+    decimals = config.CHART_RENDERING["decimals"]
+    assert [t.name for t in full.data] == [t.name for t in compact.data]
+    for a, b in zip(full.data, compact.data):
+        np.testing.assert_allclose(np.round(np.asarray(a.x, dtype=float), decimals), b.x)
+        np.testing.assert_allclose(np.round(np.asarray(a.y, dtype=float), decimals), b.y)
+        assert a.line.color == b.line.color
+
+def test_compact_styling_left_to_template(catalog, models, monkeypatch):
+    monkeypatch.setitem(config.CHART_RENDERING, "compact_payload", True)
+    fig = create_pump_curve_chart(catalog.curve_store, models[0], 100, 10)
+    template = pio.templates[COMPACT_TEMPLATE]
+    assert template.data.scatter[0].mode == TRACE_DEFAULTS["mode"]
+    curve = fig.data[0]
+    # Styling equal to the template defaults is not repeated on the trace
+    assert curve.mode is None or curve.mode != TRACE_DEFAULTS["mode"]
+    assert curve.line.width is None or curve.line.width != TRACE_DEFAULTS["line"]["width"]
@@ -0,0 +1,72 @@
+"""
+The pruned combination search must find the cheapest arrangement a brute
+force over every pair and pump count finds.
+"""
+import numpy as np
+import pytest
+
+from combinations import find_combinations, flow_at_head, head_at_flow
+from config import COMBINATIONS
+
+def brute_force(catalog, params):
+    """Lowest total power over every arrangement, by enumerating all pairs and counts."""
+    flow_lpm, head_m = params["flow_lpm"], params["head_m"]
+    candidates = catalog.select(
+        category=params["category"], frequency=params["frequency"],
+        phase=params["phase"], min_solid=params["particle_size"]
+    )
+    best = np.inf
+    for contribution, required in [
+        (flow_at_head(catalog, candidates, head_m), flow_lpm),
+        (head_at_flow(catalog, candidates, flow_lpm), head_m)
+    ]:
+        power = catalog.power_kw(candidates)
+        for n in range(2, COMBINATIONS["max_pumps"] + 1):
+            ok = (contribution > 0) & (contribution * n >= required)
+            best = min(best, float(np.min(power[ok] * n, initial=np.inf)))
+        useful = contribution > 0
+        pair_ok = (contribution[:, None] + contribution[None, :] >= required) & useful[:, None] & useful[None, :]
+        np.fill_diagonal(pair_ok, False)
+        best = min(best, float(np.min((power[:, None] + power[None, :])[pair_ok], initial=np.inf)))
+    return best
+
+def duty_points(catalog):
+    # Around the largest pumps, where a weak partner can complete a strong pump
+    flows = np.nanmax(catalog.columns["Q Rated/LPM"]) * np.linspace(0.4, 1.6, 7)
+    heads = np.nanmax(catalog.columns["Head Rated/M"]) * np.linspace(0.1, 0.7, 7)
+    return [(float(flow), float(head)) for flow in flows for head in heads]
+
+@pytest.fixture(autouse=True)
+def no_time_budget(monkeypatch):
+    # The check is about pruning, not about the time budget on a slow machine
+    monkeypatch.setitem(COMBINATIONS, "time_budget", 60.0)
+
+def test_matches_brute_force(catalog):
+    for flow, head in duty_points(catalog):
+        params = {
+            "category": None, "frequency": None, "phase": None,
+            "flow_lpm": flow, "head_m": head, "particle_size": 0.0
+        }
+        found = find_combinations(catalog, params)
+        best = found[0]["total_power"] if found else np.inf
+        assert best == pytest.approx(brute_force(catalog, params)), (flow, head)
+
+def test_arrangements_meet_the_duty(catalog):
+    checked = 0
+    for flow, head in duty_points(catalog):
+        params = {
+            "category": None, "frequency": None, "phase": None,
+            "flow_lpm": flow, "head_m": head, "particle_size": 0.0
+        }
+        found = find_combinations(catalog, params)
+        powers = [r["total_power"] for r in found]
+        assert powers == sorted(powers) and len(found) <= COMBINATIONS["max_results"]
+        for arrangement in found:
+            positions = np.array(arrangement["positions"])
+            assert len(positions) >= 2
+            if arrangement["arrangement"] == "parallel":
+                assert flow_at_head(catalog, positions, head).sum() >= flow * (1 - 1e-9)
+            else:
+                assert head_at_flow(catalog, positions, flow).sum() >= head * (1 - 1e-9)
+            checked += 1
+    assert checked > 0
@@ -0,0 +1,61 @@
+"""
+Batched least-squares fits must match a per-model polynomial fit.
+"""
+import numpy as np
+import pytest
+
+import config
+from curve_fits import CurveFits, _fit_block, horner
+
+def test_horner_matches_polyval():
+    coefficients = np.array([[1.0, -2.0, 0.5], [3.0, 0.0, -1.0]])
+    x = np.linspace(0, 2, 7)
+    for row in coefficients:
+        np.testing.assert_allclose(horner(row, x), np.polyval(row[::-1], x))
+
+def test_fits_match_polyfit(catalog):
+    store = catalog.curve_store
+    fits = CurveFits(store, degree=2)
+    checked = 0
+    for model, i in store.model_index.items():
+        flows, heads = store.curve(model)
+        if len(flows) < 3:
+            continue
+        x = flows / fits.max_flow[i]
+        expected = np.polyfit(x, heads, 2)[::-1]
+        np.testing.assert_allclose(fits.coefficients[i], expected, rtol=1e-6, atol=1e-6)
+        checked += 1
+    assert checked > 0
+
+def test_few_points_lower_degree():
+    # Three models: one point (unfitted), two points (a line), four points
+    points = np.array([
+        [10.0, 5.0],
+        [10.0, 8.0], [20.0, 4.0],
+        [0.0, 9.0], [10.0, 8.0], [20.0, 5.0], [30.0, 0.0]
+    ])
+    offsets = np.array([0, 1, 3, 7])
+    coefficients, max_flow, r2, rmse = _fit_block(points, offsets, 2)
+    assert np.isnan(coefficients[0]).all() and np.isnan(rmse[0])
+    np.testing.assert_allclose(coefficients[1], [12.0, -8.0, 0.0], atol=1e-9)
+    np.testing.assert_allclose(max_flow, [10.0, 20.0, 30.0])
+    np.testing.assert_allclose(rmse[1], 0.0, atol=1e-9)
+    assert 0.9 < r2[2] <= 1.0
+
+def test_heads_out_of_range(catalog):
+    fits = catalog.curve_fits
+    i = int(np.flatnonzero(~np.isnan(fits.max_flow))[0])
+    rows = np.array([i])
+    assert np.isnan(fits.heads(fits.max_flow[i] * 1.5, rows)[0])
+    assert not np.isnan(fits.heads(fits.max_flow[i] * 1.5, rows, extrapolate=True)[0])
+    assert fits.head("no such model", 10.0) is None
+
+def test_pool_matches_in_process(catalog, monkeypatch):
+    store = catalog.curve_store
+    monkeypatch.setitem(config.CURVE_FITTING, "parallel_threshold", 1)
+    monkeypatch.setitem(config.CURVE_FITTING, "chunk_size", max(1, len(store) // 3))
+    monkeypatch.setitem(config.CURVE_FITTING, "max_workers", 2)
+    pooled = CurveFits(store, degree=2)
+    serial = _fit_block(store.points, store.offsets, 2)
+    np.testing.assert_allclose(pooled.coefficients, serial[0], equal_nan=True)
+    np.testing.assert_allclose(pooled.rmse, serial[3], equal_nan=True)
@@ -0,0 +1,56 @@
+"""
+The ragged curve store must hold exactly the filled cells of the wide table.
+"""
+import numpy as np
+import pandas as pd
+
+from curves import CurveStore, head_columns, pressure_columns
+
+def wide_table():
+    return pd.DataFrame({
+        "Model No.": ["A", "B", "A", "C", None],
+        "10M": [100.0, None, 1.0, None, 5.0],
+        "5M": [150.0, 80.0, 1.0, None, 5.0],
+        "20M": [40.0, "", 1.0, None, 5.0],
+        "Max Head(M)": [25.0, 12.0, 1.0, None, 5.0],
+        "2Kg/cm²": [60.0, None, 1.0, None, 5.0],
+        "1Kg/cm²": [120.0, 90.0, 1.0, None, 5.0]
+    })
+
+def test_column_parsing():
+    columns = wide_table().columns
+    assert head_columns(columns) == [("10M", 10.0), ("5M", 5.0), ("20M", 20.0)]
+    assert pressure_columns(columns) == [("2Kg/cm²", 2.0), ("1Kg/cm²", 1.0)]
+
+def test_store_matches_wide_table():
+    store = CurveStore(wide_table())
+    # First row of a duplicated model wins; rows without a model are dropped
+    assert store.models == ["A", "B", "C"]
+    flows, heads = store.curve("A")
+    np.testing.assert_array_equal(flows, [40.0, 100.0, 150.0])
+    np.testing.assert_array_equal(heads, [20.0, 10.0, 5.0])
+    flows, heads = store.curve("B")
+    np.testing.assert_array_equal(flows, [80.0])
+    assert len(store.curve("C")[0]) == 0
+    assert store.curve("D") is None
+    assert "A" in store and "D" not in store
+
+def test_pressure_markers_keep_column_order():
+    store = CurveStore(wide_table())
+    assert store.pressure_markers("A") == [(60.0, 2.0), (120.0, 1.0)]
+    assert store.pressure_markers("A", limit=1) == [(60.0, 2.0)]
+    assert store.pressure_markers("D") == []
+
+def test_long_frame_round_trip(catalog):
+    store = catalog.curve_store
+    long = store.long_frame()
+    assert len(long) == len(store.points)
+    model = store.models[0]
+    flows, heads = store.curve(model)
+    rows = long[long["Model No."] == model]
+    np.testing.assert_array_equal(rows["Flow (LPM)"], flows)
+    np.testing.assert_array_equal(rows["Head (M)"], heads)
+
+def test_empty_table():
+    store = CurveStore(pd.DataFrame({"10M": [1.0]}))
+    assert store.empty and len(store) == 0
@@ -0,0 +1,57 @@
+"""
+Lifecycle energy cost: present worth, the cost pass and the rated-power fallback.
+"""
+import numpy as np
+import pytest
+
+from config import ENERGY
+from energy import present_worth_factor, operating_power, energy_costs
+from operating_point import solve_operating_points
+
+PARAMS = {"frequency": None, "flow_lpm": 100.0, "head_m": 10.0, "friction": 2.0}
+
+def test_present_worth_is_discounted_sum():
+    years, rate = 12, 0.07
+    expected = sum((1 + rate) ** -t for t in range(1, years + 1))
+    assert present_worth_factor(years, rate) == pytest.approx(expected)
+    assert present_worth_factor(years, 0.0) == years
+
+def test_power_follows_flow_times_head(catalog):
+    positions = np.arange(len(catalog))
+    power = operating_power(catalog, positions, PARAMS)
+    coefficients, max_flow = catalog.speeds.curves_at(None)
+    flows, heads = solve_operating_points(coefficients, max_flow, PARAMS["head_m"], PARAMS["friction"])
+    rated_power = catalog.power_kw(positions)
+    rated_hydraulic = catalog.columns["Q Rated/LPM"] * catalog.columns["Head Rated/M"]
+    solved = np.isfinite(flows) & np.isfinite(rated_power) & (rated_hydraulic > 0)
+    assert solved.any()
+    np.testing.assert_allclose(power[solved], rated_power[solved] * flows[solved] * heads[solved] / rated_hydraulic[solved])
+    # No operating point: the rated power stands in
+    np.testing.assert_array_equal(power[np.isnan(flows)], rated_power[np.isnan(flows)])
+
+def test_speed_conversion_scales_rated_power(catalog):
+    positions = np.arange(len(catalog))
+    # No operating point anywhere, so every pump falls back to its (rescaled) rated power
+    params = dict(PARAMS, frequency=60, speed_conversion=True, head_m=1e6)
+    power = operating_power(catalog, positions, params)
+    expected = catalog.power_kw(positions) * catalog.speeds.ratios(60) ** 3
+    known = np.isfinite(expected)
+    assert known.any()
+    np.testing.assert_allclose(power[known], expected[known])
+
+def test_costs(catalog):
+    positions = np.arange(0, len(catalog), 3)
+    params = dict(PARAMS, duty_hours=3000, tariff=0.2, lifetime_years=8)
+    costs = energy_costs(catalog, positions, params)
+    power = operating_power(catalog, positions, params)
+    np.testing.assert_array_equal(costs["power_kw"], power)
+    np.testing.assert_allclose(costs["annual_kwh"], power * 3000)
+    np.testing.assert_allclose(costs["annual_cost"], power * 3000 * 0.2)
+    np.testing.assert_allclose(costs["lifecycle_cost"],
+                               power * 600 * present_worth_factor(8, ENERGY["discount_rate"]))
+
+def test_cost_defaults(catalog):
+    positions = np.arange(10)
+    costs = energy_costs(catalog, positions, PARAMS)
+    np.testing.assert_allclose(costs["annual_cost"],
+                               operating_power(catalog, positions, PARAMS) * ENERGY["duty_hours"] * ENERGY["tariff"])
@@ -0,0 +1,70 @@
+"""
+Bulk export: streamed tables, datasheet names and the zip package.
+"""
+import io
+import zipfile
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import EXPORT
+from export import iter_csv, write_excel, export_package, _datasheet_names
+
+COLUMNS = ["Model No.", "Q Rated/LPM", "Head Rated/M", "Frequency (Hz)"]
+PARAMS = {"flow_lpm": 100.0, "head_m": 10.0, "frequency": None, "friction": 2.0}
+
+def test_datasheet_names_unique():
+    names = _datasheet_names(["HP-1/2", "HP-1:2", "hp-1_2", "HP-1_2_2", "", "SP 100"])
+    assert names[:3] == ["datasheets/HP-1_2.html", "datasheets/HP-1_2_2.html", "datasheets/hp-1_2_3.html"]
+    # A model already named like a suffixed duplicate still gets its own file
+    assert names[3] == "datasheets/HP-1_2_2_2.html"
+    assert names[4:] == ["datasheets/model.html", "datasheets/SP_100.html"]
+    assert len({name.lower() for name in names}) == len(names)
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_csv_chunks(catalog, chunk_size):
+    positions = np.arange(len(catalog))[::-2]
+    data = b"".join(iter_csv(catalog, positions, COLUMNS, chunk_size))
+    assert data.startswith(b"\xef\xbb\xbf")
+    expected = catalog.rows(positions, COLUMNS).to_csv(index=False).encode("utf-8")
+    assert data[3:] == expected
+
+def test_excel(catalog):
+    openpyxl = pytest.importorskip("openpyxl")
+    positions = np.arange(30)
+    buffer = io.BytesIO()
+    write_excel(catalog, positions, COLUMNS, buffer, chunk_size=7)
+    sheet = openpyxl.load_workbook(buffer, read_only=True)["Results"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == COLUMNS
+    expected = catalog.rows(positions, COLUMNS)
+    assert len(rows) == len(expected) + 1
+    for row, (_, want) in zip(rows[1:], expected.iterrows()):
+        assert [None if pd.isna(value) else value for value in want] == list(row)
+
+def test_package(catalog, monkeypatch):
+    monkeypatch.setitem(EXPORT, "max_datasheets", 6)
+    monkeypatch.setitem(EXPORT, "batch_size", 4)
+    monkeypatch.setitem(EXPORT, "max_workers", 1)
+    positions = np.arange(80)
+    buffer = io.BytesIO()
+    summary = export_package(catalog, positions, COLUMNS, PARAMS, buffer)
+    assert summary["rows"] == 80 and summary["skipped"] == 0
+    assert summary["datasheets"] == 6
+    with zipfile.ZipFile(buffer) as archive:
+        names = archive.namelist()
+        sheets = [name for name in names if name.startswith("datasheets/")]
+        assert len(sheets) == 6 and "skipped.txt" not in names
+        assert archive.read("results.csv") == b"".join(iter_csv(catalog, positions, COLUMNS))
+        assert b"<table>" in archive.read(sheets[0])
+
+def test_package_past_budget(catalog, monkeypatch):
+    monkeypatch.setitem(EXPORT, "max_datasheets", 5)
+    monkeypatch.setitem(EXPORT, "max_workers", 1)
+    monkeypatch.setitem(EXPORT, "time_budget", 0)
+    buffer = io.BytesIO()
+    summary = export_package(catalog, np.arange(80), COLUMNS, PARAMS, buffer)
+    # Nothing rendered in time: every model is listed as skipped
+    assert summary["datasheets"] == 0 and summary["skipped"] == 5
+    with zipfile.ZipFile(buffer) as archive:
+        assert len(archive.read("skipped.txt").decode().splitlines()) == 5
@@ -0,0 +1,44 @@
+"""
+Load-test report: aggregation of worker timings and the baseline comparison.
+"""
+import pytest
+
+from loadtest import STEPS, summarize, compare
+
+def worker(step_seconds, peak_rss_mb=100.0, errors=0):
+    sessions = [{step: seconds for step in STEPS} for seconds in step_seconds]
+    sessions += [{"load": 0.5, "error": "timeout"} for _ in range(errors)]
+    return {"pid": 1, "sessions": sessions, "peak_rss_mb": peak_rss_mb}
+
+def test_summarize():
+    report = summarize([worker([0.1, 0.3]), worker([0.2], peak_rss_mb=None, errors=1)], 2.0, {"sessions": 4})
+    assert report["sessions"] == 4 and report["errors"] == ["timeout"]
+    assert report["steps"]["load"]["count"] == 4
+    assert report["steps"]["curves"]["count"] == 3
+    assert report["steps"]["curves"]["p50"] == pytest.approx(200.0)
+    assert report["steps"]["curves"]["max"] == pytest.approx(300.0)
+    assert report["overall"]["count"] == 3 * len(STEPS) + 1
+    assert report["throughput"]["reruns_per_second"] == pytest.approx((3 * len(STEPS) + 1) / 2.0)
+    assert report["throughput"]["sessions_per_second"] == pytest.approx(1.5)
+    assert report["memory"]["per_process_peak_mb"] == [100.0, None]
+
+def test_summarize_without_sessions():
+    report = summarize([], 0.0, {})
+    assert report["overall"] == {"count": 0}
+    assert report["throughput"]["reruns_per_second"] == 0.0
+
+def test_compare():
+    baseline = summarize([worker([0.1] * 10)], 10.0, {})
+    assert compare(baseline, baseline, 0.2) == []
+    # Within the tolerance
+    assert compare(summarize([worker([0.11] * 10)], 10.0, {}), baseline, 0.2) == []
+
+    slower = summarize([worker([0.2] * 10, peak_rss_mb=150.0)], 20.0, {})
+    regressions = compare(slower, baseline, 0.2)
+    assert any(line.startswith("overall p95 ms") for line in regressions)
+    assert any(line.startswith("search p50 ms") for line in regressions)
+    assert any(line.startswith("reruns/s") for line in regressions)
+    assert any(line.startswith("peak memory MB") for line in regressions)
+
+    # Faster runs and lower memory are not regressions
+    assert compare(baseline, slower, 0.2) == []
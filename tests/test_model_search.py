@@ -0,0 +1,69 @@
+"""
+The prefix/trigram index must return what a scan over every key would.
+"""
+import numpy as np
+import pytest
+
+from config import MODEL_SEARCH
+from model_search import ModelSearchIndex, normalize, _trigrams
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    return ModelSearchIndex(catalog)
+
+def scan(index, query, limit):
+    """Reference lookup: prefix, then substring, then fuzzy matches, each found by a full scan."""
+    q = normalize(query)
+    if not q:
+        return []
+    keys = [str(key) for key in index.keys]
+    by_length = lambda entries: sorted(entries, key=lambda e: (len(keys[e]), e))
+    prefix = by_length(e for e, key in enumerate(keys) if key.startswith(q))[:limit]
+    entries = [(e, len(q) / len(keys[e])) for e in prefix]
+    if len(q) >= 3:
+        inner = by_length(e for e, key in enumerate(keys) if q in key and not key.startswith(q))
+        entries += [(e, len(q) / len(keys[e])) for e in inner[:limit - len(entries)]]
+    grams = set(_trigrams(q))
+    taken = {e for e, _ in entries}
+    fuzzy = []
+    for e, key in enumerate(keys):
+        if e in taken or key.startswith(q):
+            continue
+        key_grams = set(_trigrams(key))
+        shared = len(grams & key_grams)
+        if shared:
+            similarity = shared / (len(grams) + len(key_grams) - shared)
+            if similarity >= MODEL_SEARCH["min_similarity"]:
+                fuzzy.append((-similarity, len(key), e))
+    entries += [(e, -s) for s, _, e in sorted(fuzzy)[:limit - len(entries)]]
+    return [(index.labels[e], int(index.positions[e]), score) for e, score in entries]
+
+def queries(index):
+    rng = np.random.default_rng(1)
+    picked = [str(index.labels[i]) for i in rng.choice(len(index), 40, replace=False)]
+    typed = [label[:n] for label in picked[:20] for n in (1, 2, 4, 6)]
+    # Typos: one character replaced, dropped or swapped
+    for label in picked[20:]:
+        i = int(rng.integers(0, len(label)))
+        typed += [label[:i] + "X" + label[i + 1:], label[:i] + label[i + 1:], label[::-1][:5]]
+    return typed + ["", "-", "zzzz", "HP O636"]
+
+def test_matches_scan(index):
+    for query in queries(index):
+        for limit in (3, MODEL_SEARCH["max_results"], 50):
+            found = index.search(query, limit)
+            expected = scan(index, query, limit)
+            assert [(label, position) for label, position, _ in found] == \
+                [(label, position) for label, position, _ in expected], query
+            np.testing.assert_allclose([score for _, _, score in found], [score for _, _, score in expected])
+
+def test_normalize():
+    assert normalize(" hp-0636 b ") == "HP0636B"
+    assert normalize(42) == "42"
+
+def test_first_position_per_key(catalog, index):
+    # Each key points at the first pump carrying it, in either column
+    for key, position in zip(index.keys[:50], index.positions[:50]):
+        for col in ("Model No.", "Model"):
+            values = catalog.pumps[col].head(int(position)).dropna().map(normalize)
+            assert key not in set(values)
@@ -0,0 +1,47 @@
+"""
+Nearest-pump queries must match an exhaustive scan of the partition.
+"""
+import numpy as np
+import pytest
+
+from nearest import FEATURE_COLUMNS, NearestIndex
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    return NearestIndex(catalog)
+
+def exhaustive(catalog, flow, head, solid, category=None, k=5):
+    """Log-scaled, standardized distance over the set requirements, computed per pump."""
+    raw = np.column_stack([catalog.columns[col] for col in FEATURE_COLUMNS])
+    logged = np.log1p(np.maximum(np.nan_to_num(raw), 0.0))
+    scale = logged.std(axis=0)
+    requirement = np.array([flow, head, solid])
+    target = np.log1p(np.maximum(requirement, 0.0)) / scale
+    used = requirement > 0
+    positions = catalog.select(category=category)
+    distances = np.sqrt((((logged[positions] / scale - target) ** 2)[:, used]).sum(axis=1))
+    order = np.lexsort((np.arange(len(positions)), distances))[:k]
+    return positions[order], distances[order]
+
+@pytest.mark.parametrize("flow, head, solid, category", [
+    (100.0, 10.0, 0.0, None),
+    (2500.0, 3.0, 10.0, None),
+    (50.0, 0.0, 0.0, "Booster"),
+    (400.0, 25.0, 0.0, "Sewage")
+])
+def test_matches_exhaustive_scan(catalog, index, flow, head, solid, category):
+    found, distances, shortfall = index.query(flow, head, solid, category=category, k=5)
+    expected, expected_distances = exhaustive(catalog, flow, head, solid, category)
+    np.testing.assert_array_equal(found, expected)
+    np.testing.assert_allclose(distances, expected_distances)
+    rated = np.column_stack([catalog.columns[col][found] for col in FEATURE_COLUMNS])
+    np.testing.assert_allclose(shortfall, np.maximum(np.array([flow, head, solid]) - rated, 0.0))
+
+def test_unset_requirements_ignored(index):
+    # Without a head requirement the head of the pumps does not matter
+    _, distances, _ = index.query(100.0, 0.0, 0.0, k=3)
+    assert distances[0] < 0.05
+
+def test_empty_partition(index):
+    found, distances, shortfall = index.query(100.0, 10.0, 0.0, category="No Such Category")
+    assert len(found) == 0 and len(distances) == 0 and shortfall.shape == (0, len(FEATURE_COLUMNS))
@@ -0,0 +1,46 @@
+"""
+Bisection operating points must match the analytic crossing of quadratic curves.
+"""
+import numpy as np
+
+from operating_point import solve_operating_points, operating_point_scores, system_head
+
+def quadratic_pumps():
+    # H(Q) = shutoff - drop * (Q / max_flow)², as ascending coefficients over Q / max_flow
+    shutoff = np.array([30.0, 20.0, 12.0, 50.0, 8.0])
+    drop = np.array([25.0, 20.0, 6.0, 40.0, 2.0])
+    max_flow = np.array([500.0, 1200.0, 300.0, 2000.0, 100.0])
+    coefficients = np.column_stack((shutoff, np.zeros(5), -drop))
+    return shutoff, drop, max_flow, coefficients
+
+def test_matches_analytic_crossing():
+    shutoff, drop, max_flow, coefficients = quadratic_pumps()
+    static_head, friction = 5.0, 3.0
+    flows, heads = solve_operating_points(coefficients, max_flow, static_head, friction)
+    # shutoff - drop (Q/M)² = static + friction (Q/1000)²
+    expected = np.sqrt((shutoff - static_head) / (drop / max_flow ** 2 + friction / 1e6))
+    inside = expected <= max_flow
+    np.testing.assert_allclose(flows[inside], expected[inside], rtol=1e-6)
+    np.testing.assert_allclose(heads[inside], system_head(expected[inside], static_head, friction), rtol=1e-6)
+    # Crossings beyond the measured range have no operating point
+    assert np.isnan(flows[~inside]).all() and (~inside).any()
+
+def test_no_crossing():
+    _, _, max_flow, coefficients = quadratic_pumps()
+    # Static head above every shutoff head
+    flows, heads = solve_operating_points(coefficients, max_flow, 100.0, 0.0)
+    assert np.isnan(flows).all() and np.isnan(heads).all()
+
+def test_pumps_without_curve():
+    coefficients = np.full((2, 3), np.nan)
+    flows, _ = solve_operating_points(coefficients, np.array([np.nan, 100.0]), 1.0, 1.0)
+    assert np.isnan(flows).all()
+
+def test_scores():
+    flows = np.array([100.0, 110.0, np.nan])
+    heads = np.array([10.0, 10.0, np.nan])
+    scores = operating_point_scores(flows, heads, 100.0, 10.0)
+    np.testing.assert_allclose(scores[:2], [0.0, 0.1])
+    assert scores[2] == np.inf
+    # A missing requirement does not count
+    np.testing.assert_allclose(operating_point_scores(flows, heads, 0.0, 10.0)[:2], [0.0, 0.0])
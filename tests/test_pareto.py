@@ -0,0 +1,59 @@
+"""
+The blocked skyline and front peeling must match a pairwise dominance scan.
+"""
+import numpy as np
+import pytest
+
+from pareto import skyline, pareto_fronts, pareto_order
+
+def dominated_by_any(values, rows):
+    """Pairwise scan: which of ``rows`` some other row in ``rows`` dominates."""
+    a = values[rows][:, None, :]
+    b = values[rows][None, :, :]
+    dominates = (a <= b).all(axis=2) & (a < b).any(axis=2)
+    return dominates.any(axis=0)
+
+def pairwise_fronts(objectives, max_fronts):
+    values = np.where(np.isnan(objectives), np.inf, objectives)
+    fronts = np.full(len(values), max_fronts)
+    remaining = np.arange(len(values))
+    for front in range(max_fronts):
+        if not len(remaining):
+            break
+        on_front = ~dominated_by_any(values, remaining)
+        fronts[remaining[on_front]] = front
+        remaining = remaining[~on_front]
+    return fronts
+
+def objective_sets():
+    rng = np.random.default_rng(0)
+    size = rng.lognormal(0, 1, 300)[:, None]
+    correlated = size * rng.uniform(0.5, 1.5, (300, 3))
+    # Few distinct values: many ties and duplicate rows
+    ties = rng.integers(0, 4, (200, 3)).astype(float)
+    with_nan = rng.uniform(0, 1, (150, 2))
+    with_nan[rng.random((150, 2)) < 0.1] = np.nan
+    anticorrelated = np.column_stack((np.linspace(0, 1, 100), np.linspace(1, 0, 100)))
+    return [correlated, ties, with_nan, anticorrelated, np.zeros((0, 2))]
+
+@pytest.mark.parametrize("objectives", objective_sets())
+@pytest.mark.parametrize("block_size", [1, 7, 32, 1000])
+def test_skyline_matches_pairwise(objectives, block_size):
+    values = np.where(np.isnan(objectives), np.inf, objectives)
+    expected = ~dominated_by_any(values, np.arange(len(values)))
+    np.testing.assert_array_equal(skyline(objectives, block_size), expected)
+
+@pytest.mark.parametrize("objectives", objective_sets())
+def test_fronts_match_pairwise_peeling(objectives):
+    np.testing.assert_array_equal(pareto_fronts(objectives, 6), pairwise_fronts(objectives, 6))
+
+def test_order_by_front_then_rank():
+    objectives = objective_sets()[0]
+    order, fronts = pareto_order(objectives)
+    assert sorted(order) == list(range(len(objectives)))
+    assert np.all(np.diff(fronts[order]) >= 0)
+    # Within a front no row dominates a row ranked before it
+    values = objectives[order]
+    for i in range(len(values)):
+        earlier = values[:i][fronts[order][:i] == fronts[order][i]]
+        assert not ((values[i] <= earlier).all(axis=1) & (values[i] < earlier).any(axis=1)).any()
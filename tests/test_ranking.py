@@ -0,0 +1,61 @@
+"""
+Partial-selection ranking must match a full stable sort.
+"""
+import numpy as np
+import pytest
+
+from ranking import top_k, page_bounds, run_search
+
+def full_sort(positions, scores, k):
+    """Reference ranking: stable sort by score, NaN last."""
+    order = np.lexsort((np.arange(len(scores)), np.where(np.isnan(scores), np.inf, scores)))
+    return positions[order][:max(k, 0)]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_k_matches_full_sort(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 200))
+    # Few distinct values so ties are common, plus some NaN
+    scores = rng.integers(0, 10, n).astype(float)
+    scores[rng.random(n) < 0.1] = np.nan
+    positions = rng.permutation(10 * n)[:n]
+    for k in [0, 1, n // 3, n, n + 5]:
+        np.testing.assert_array_equal(top_k(positions, scores, k), full_sort(positions, scores, k))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_k_sorted_rows_prefix(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 200))
+    scores = rng.integers(0, 10, n).astype(float)
+    scores[rng.random(n) < 0.1] = np.nan
+    positions = rng.permutation(10 * n)[:n]
+    k = int(rng.integers(1, n + 1))
+    expected = full_sort(positions, scores, k)
+    for sorted_rows in [0, 1, k // 2, k, k + 3]:
+        ranked = top_k(positions, scores, k, sorted_rows)
+        lead = min(sorted_rows, k)
+        np.testing.assert_array_equal(ranked[:lead], expected[:lead])
+        assert sorted(ranked) == sorted(expected)
+
+def test_top_k_all_nan():
+    positions = np.arange(5)
+    np.testing.assert_array_equal(top_k(positions, np.full(5, np.nan), 3), [0, 1, 2])
+
+def test_page_bounds_clamps():
+    assert page_bounds(120, 1, 50) == (1, 0, 50)
+    assert page_bounds(120, 3, 50) == (3, 100, 120)
+    assert page_bounds(120, 9, 50) == (3, 100, 120)
+    assert page_bounds(0, 2, 50) == (1, 0, 0)
+
+@pytest.mark.parametrize("ranking", ["Best Match", "System Operating Point", "Pareto Optimal", "Lifecycle Cost", "ID Order"])
+def test_run_search_sorted_rows(catalog, ranking):
+    params = {
+        "category": None, "frequency": None, "phase": None,
+        "flow_lpm": 50.0, "head_m": 5.0, "particle_size": 0.0,
+        "result_percent": 100, "ranking": ranking, "friction": 1.0
+    }
+    full, count = run_search(catalog, params)
+    partial, partial_count = run_search(catalog, params, sorted_rows=20)
+    assert count == partial_count == len(full)
+    np.testing.assert_array_equal(partial[:20], full[:20])
+    assert sorted(partial) == sorted(full)
@@ -0,0 +1,49 @@
+"""
+The DuckDB analytics must agree with the catalog's own columns.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from sql_engine import SqlEngine
+
+@pytest.fixture(scope="module")
+def engine(catalog):
+    return SqlEngine(catalog)
+
+def test_coverage_by_category(catalog, engine):
+    coverage = engine.coverage_by_category()
+    coverage["Category"] = coverage["Category"].fillna("")
+    frame = pd.DataFrame({
+        "Category": catalog.columns["Category"],
+        "Pumps": 1,
+        "With Curves": catalog.curve_rows >= 0,
+        "Flow": catalog.columns["Q Rated/LPM"],
+        "Head": catalog.columns["Head Rated/M"]
+    })
+    expected = frame.groupby("Category").agg(
+        Pumps=("Pumps", "sum"), WithCurves=("With Curves", "sum"),
+        MinFlow=("Flow", "min"), MaxFlow=("Flow", "max"),
+        MinHead=("Head", "min"), MaxHead=("Head", "max")
+    )
+    actual = coverage.set_index("Category").loc[expected.index]
+    np.testing.assert_array_equal(actual["Pumps"], expected["Pumps"])
+    np.testing.assert_array_equal(actual["With Curves"], expected["WithCurves"])
+    np.testing.assert_allclose(actual["Min Flow (LPM)"], expected["MinFlow"])
+    np.testing.assert_allclose(actual["Max Flow (LPM)"], expected["MaxFlow"])
+    np.testing.assert_allclose(actual["Min Head (M)"], expected["MinHead"])
+    np.testing.assert_allclose(actual["Max Head (M)"], expected["MaxHead"])
+    assert len(coverage) == len(expected)
+
+def test_counts_by_frequency_phase(catalog, engine):
+    counts = engine.counts_by_frequency_phase()
+    expected = pd.DataFrame({
+        "Frequency (Hz)": catalog.columns["Frequency (Hz)"],
+        "Phase": catalog.columns["Phase"]
+    }).value_counts().sort_index()
+    assert counts["Pumps"].sum() == len(catalog)
+    np.testing.assert_array_equal(counts["Pumps"], expected.to_numpy())
+    np.testing.assert_array_equal(counts["Frequency (Hz)"], expected.index.get_level_values(0))
+    np.testing.assert_array_equal(counts["Phase"], expected.index.get_level_values(1))
@@ -0,0 +1,47 @@
+"""
+Chart downsampling and large-comparison rendering.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+import config
+from visualization import lttb, comparison_colors, create_comparison_chart
+
+def test_lttb_keeps_endpoints_and_order():
+    x = np.linspace(0, 100, 1000)
+    y = np.sin(x / 7)
+    dx, dy = lttb(x, y, 50)
+    assert len(dx) == 50
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert np.all(np.diff(dx) > 0)
+    # Every kept point is an original point
+    np.testing.assert_array_equal(np.sin(dx / 7), dy)
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[237] = 10.0
+    dx, dy = lttb(x, y, 20)
+    assert 237.0 in dx and dy.max() == 10.0
+
+def test_lttb_short_curves_unchanged():
+    x, y = np.arange(10.0), np.arange(10.0) ** 2
+    for n_out in [2, 10, 50]:
+        dx, dy = lttb(x, y, n_out)
+        np.testing.assert_array_equal(dx, x)
+        np.testing.assert_array_equal(dy, y)
+
+def test_comparison_colors_distinct():
+    assert comparison_colors(3) == config.CHART_COLORS[:3]
+    colors = comparison_colors(len(config.CHART_COLORS) + 20)
+    assert len(set(colors)) == len(colors)
+
+def test_large_comparison_uses_webgl(catalog, monkeypatch):
+    store = catalog.curve_store
+    models = [m for m in store.models if len(store.curve(m)[0])]
+    monkeypatch.setitem(config.CHART_RENDERING, "webgl_threshold", 4)
+    small = create_comparison_chart(store, models[:4], 100, 10)
+    large = create_comparison_chart(store, models[:5], 100, 10)
+    assert all(isinstance(trace, go.Scatter) for trace in small.data)
+    # Pump curves switch to WebGL; the operating-point marker stays SVG
+    assert [type(trace) for trace in large.data] == [go.Scattergl] * 5 + [go.Scatter]
@@ -7,7 +7,8 @@ TRANSLATIONS = {
         # App title and headers
         "Hung Pump": "Hung Pump",
         "Pump Selection Tool": "Pump Selection Tool",
-        "Data loaded": "Data loaded: {n_records} records | Last update: {timestamp}",
+        "Data loaded": "Data loaded: {n_records} records | Last update: {timestamp} | Checked {age} ago",
+        "Refreshing": "Refreshing data in the background...",
         
         # Buttons
         "Refresh Data": "🔄 Refresh Data",
@@ -82,6 +83,45 @@ TRANSLATIONS = {
         "Found Pumps": "Found {count} matching pumps",
         "Matching Results": "### Matching Pumps Results",
         "Showing Results": "Showing all {count} results",
+        "Page Info": "Showing results {start}–{end} of {total}",
+        "Page": "Page",
+        "Sort Results": "Sort Results By",
+        "Best Match": "Best Match",
+        "ID Order": "ID Order",
+        "System Operating Point": "System Operating Point",
+        "Pareto Optimal": "Pareto Optimal",
+        "Pareto Optimal Help": "Pumps that no other pump beats on flow margin, head margin and power at once are listed first",
+        "Lifecycle Cost": "Lifecycle Cost",
+        "Duty Hours": "Duty Hours per Year",
+        "Tariff": "Electricity Tariff (per kWh)",
+        "Lifetime Years": "Service Life (years)",
+        "Operating Power (kW)": "Operating Power (kW)",
+        "Annual Energy (kWh)": "Annual Energy (kWh)",
+        "Annual Cost": "Annual Energy Cost",
+        "Energy Estimate": "Energy: {energy} kWh/year, cost {cost}/year",
+        "Friction Coefficient": "Friction Coefficient (m per (m³/min)²)",
+        "Friction Coefficient Help": "Pipe friction of the system curve: head loss = coefficient × (flow in m³/min)². Leave at 0 for static head only.",
+        "Operating Point Result": "On your system this pump runs at {flow} LPM and {head} m ({percent}% of the required flow)",
+        "No Operating Point": "This pump's curve does not cross your system curve within its measured range",
+        "Speed Conversion": "Include other frequencies (affinity laws)",
+        "Nearest Pumps": "#### 🎯 Closest pumps to your requirement",
+        "Flow Short (LPM)": "Flow Short (LPM)",
+        "Head Short (m)": "Head Short (m)",
+        "Solid Short (mm)": "Solid Short (mm)",
+        "Combination Suggestions": "#### 🔗 No single pump is enough - these arrangements meet your duty point",
+        "Arrangement": "Arrangement",
+        "Parallel": "Parallel",
+        "Series": "Series",
+        "Pumps": "Pumps",
+        "Pump Count": "Pump Count",
+        "Total Power (kW)": "Total Power (kW)",
+        "Speed Conversion Help": "Rescale pumps of other frequencies to the selected frequency with the affinity laws (flow × speed ratio, head × speed ratio²)",
+        "Converted Speed": "Curve converted from {native} Hz to {target} Hz with the affinity laws",
+        "Minimum Speed": "Reaches your duty point from {speed} Hz (VFD)",
+        "Speed Out Of Range": "Cannot reach your duty point within the VFD speed range",
+        "Sort Column": "Sort table by",
+        "Rank Order": "Rank order",
+        "Descending": "Descending",
         "View Product": "View Product",
         "Select Pumps": "Select pumps from the table below to view their performance curves",
         
@@ -90,6 +130,22 @@ TRANSLATIONS = {
         "Select Pump": "Select a pump to view its performance curve:",
         "No Curve Data": "No curve data available for this pump model",
         "Curve Data Loaded": "Curve data loaded: {count} pumps with curve data",
+        "Catalog Analytics": "📊 Catalog Analytics",
+        "Model Lookup": "🔎 Model Lookup",
+        "Export Results": "📦 Export Results and Datasheets",
+        "Build Export": "Build Export Package",
+        "Rendering Datasheets": "Rendering datasheets...",
+        "Export Summary": "{rows} result rows and {datasheets} datasheets packaged in {seconds} s",
+        "Export Skipped": "{count} datasheets were skipped to stay within the time limit (listed in skipped.txt)",
+        "Download Export": "📥 Download Package (.zip)",
+        "Export Too Large": "The package is {size} MB, over the {limit} MB download limit - narrow the search or choose fewer columns",
+        "Find Model": "Model number",
+        "Find Model Hint": "Type part of a model number, e.g. 0636",
+        "Model Matches": "Matching models",
+        "No Model Found": "No model matches this number.",
+        "No Curve For Model": "No curve data is available for this model.",
+        "Coverage By Category": "Coverage by category",
+        "Counts By Frequency Phase": "Pumps per frequency and phase",
         "Performance Curve": "Performance Curve - {model}",
         "Flow Rate": "Flow Rate (LPM)",
         "Head": "Head (M)",
@@ -105,6 +161,7 @@ TRANSLATIONS = {
         "Charts Update Info": "👆 Please select one or more pumps above and click 'Update Curves' to view their performance curves",
         "Loading Curve": "Loading curve data...",
         "Loading Comparison": "Loading comparison chart...",
+        "Large Comparison Mode": "Large comparison mode: {count} pumps drawn with WebGL",
         "Update Curves": "📈 Update Curves",
         "Selected Pumps": "Selected {count} pump(s) for curve visualization",
         
@@ -138,7 +195,8 @@ TRANSLATIONS = {
         # App title and headers
         "Hung Pump": "宏泵集團",
         "Pump Selection Tool": "水泵選型工具",
-        "Data loaded": "已載入資料: {n_records} 筆記錄 | 最後更新: {timestamp}",
+        "Data loaded": "已載入資料: {n_records} 筆記錄 | 最後更新: {timestamp} | {age}前檢查",
+        "Refreshing": "正在背景更新資料...",
         
         # Buttons
         "Refresh Data": "🔄 刷新資料",
@@ -213,6 +271,45 @@ TRANSLATIONS = {
         "Found Pumps": "找到 {count} 個符合的幫浦",
         "Matching Results": "### 符合幫浦結果",
         "Showing Results": "顯示全部 {count} 筆結果",
+        "Page Info": "顯示第 {start}–{end} 筆，共 {total} 筆結果",
+        "Page": "頁數",
+        "Sort Results": "結果排序方式",
+        "Best Match": "最佳匹配",
+        "ID Order": "依編號",
+        "System Operating Point": "系統運轉點",
+        "Pareto Optimal": "柏拉圖最適",
+        "Pareto Optimal Help": "在流量餘裕、揚程餘裕與功率上皆無其他幫浦能同時勝過的機型優先列出",
+        "Lifecycle Cost": "生命週期成本",
+        "Duty Hours": "每年運轉時數",
+        "Tariff": "電價 (每度)",
+        "Lifetime Years": "使用年限 (年)",
+        "Operating Power (kW)": "運轉功率 (kW)",
+        "Annual Energy (kWh)": "年用電量 (kWh)",
+        "Annual Cost": "年電費",
+        "Energy Estimate": "用電：每年 {energy} 度，電費每年 {cost}",
+        "Friction Coefficient": "摩擦係數 (m / (m³/min)²)",
+        "Friction Coefficient Help": "系統曲線的管路摩擦：損失揚程 = 係數 × (流量 m³/min)²。僅計靜揚程請保持為 0。",
+        "Operating Point Result": "在您的系統中此幫浦運轉於 {flow} LPM、{head} m（需求流量的 {percent}%）",
+        "No Operating Point": "此幫浦曲線在其量測範圍內未與您的系統曲線相交",
+        "Speed Conversion": "納入其他頻率（相似定律）",
+        "Nearest Pumps": "#### 🎯 最接近您需求的幫浦",
+        "Flow Short (LPM)": "流量不足 (LPM)",
+        "Head Short (m)": "揚程不足 (m)",
+        "Solid Short (mm)": "固體通過徑不足 (mm)",
+        "Combination Suggestions": "#### 🔗 單台幫浦不足 - 以下組合可達到您的需求點",
+        "Arrangement": "配置",
+        "Parallel": "並聯",
+        "Series": "串聯",
+        "Pumps": "幫浦",
+        "Pump Count": "台數",
+        "Total Power (kW)": "總功率 (kW)",
+        "Speed Conversion Help": "以相似定律將其他頻率的幫浦換算至所選頻率（流量 × 轉速比，揚程 × 轉速比²）",
+        "Converted Speed": "曲線已依相似定律由 {native} Hz 換算至 {target} Hz",
+        "Minimum Speed": "變頻運轉於 {speed} Hz 以上即可達到您的需求點",
+        "Speed Out Of Range": "在變頻轉速範圍內無法達到您的需求點",
+        "Sort Column": "表格排序欄位",
+        "Rank Order": "排名順序",
+        "Descending": "遞減",
         "View Product": "查看產品",
         "Select Pumps": "從下表選擇幫浦以查看其性能曲線",
         
@@ -221,6 +318,22 @@ TRANSLATIONS = {
         "Select Pump": "選擇幫浦以查看其性能曲線:",
         "No Curve Data": "此幫浦型號無曲線資料",
         "Curve Data Loaded": "曲線資料已載入: {count} 個幫浦有曲線資料",
+        "Catalog Analytics": "📊 型錄分析",
+        "Model Lookup": "🔎 型號查詢",
+        "Export Results": "📦 匯出結果與規格書",
+        "Build Export": "建立匯出檔案",
+        "Rendering Datasheets": "正在產生規格書...",
+        "Export Summary": "已打包 {rows} 筆結果與 {datasheets} 份規格書，耗時 {seconds} 秒",
+        "Export Skipped": "為控制處理時間，已略過 {count} 份規格書（列於 skipped.txt）",
+        "Download Export": "📥 下載匯出檔 (.zip)",
+        "Export Too Large": "匯出檔為 {size} MB，超過 {limit} MB 的下載上限，請縮小搜尋範圍或減少欄位",
+        "Find Model": "型號",
+        "Find Model Hint": "輸入部分型號，例如 0636",
+        "Model Matches": "符合的型號",
+        "No Model Found": "找不到符合的型號。",
+        "No Curve For Model": "此型號沒有曲線資料。",
+        "Coverage By Category": "各類別涵蓋範圍",
+        "Counts By Frequency Phase": "各頻率與相數的幫浦數量",
         "Performance Curve": "性能曲線 - {model}",
         "Flow Rate": "流量 (LPM)",
         "Head": "揚程 (M)",
@@ -236,6 +349,7 @@ TRANSLATIONS = {
         "Charts Update Info": "👆 請在上方選擇一個或多個幫浦並點擊「更新曲線」以查看其性能曲線",
         "Loading Curve": "載入曲線資料中...",
         "Loading Comparison": "載入比較圖表中...",
+        "Large Comparison Mode": "大量比較模式：以 WebGL 繪製 {count} 台幫浦",
         "Update Curves": "📈 更新曲線",
         "Selected Pumps": "已選擇 {count} 個幫浦進行曲線視覺化",
         
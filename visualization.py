@@ -1,13 +1,121 @@
+import numpy as np
+import plotly.colors
 import plotly.graph_objects as go
-import pandas as pd
-from typing import Optional, List
-from config import CHART_COLORS, ERROR_MESSAGES
+import plotly.io as pio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Tuple
+from curves import CurveStore
+from config import CHART_COLORS, CHART_RENDERING, ERROR_MESSAGES
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared by all sessions; figures are plain Python objects, so no Streamlit calls run here
+_chart_pool = ThreadPoolExecutor(
+    max_workers=CHART_RENDERING["max_workers"],
+    thread_name_prefix="curve-chart"
+)
+
+# Styling shared by every chart. In compact mode it lives once in a registered
+# template instead of being repeated on each trace and in the full plotly_white
+# template that every figure would otherwise embed.
+TRACE_DEFAULTS = {"mode": "lines+markers", "line": {"width": 3}, "marker": {"size": 6}}
+LAYOUT_DEFAULTS = {"hovermode": "closest", "showlegend": True, "height": 500}
+_AXIS_STYLE = dict(
+    gridcolor="#EBF0F8", linecolor="#EBF0F8", zerolinecolor="#EBF0F8",
+    zerolinewidth=2, ticks="", automargin=True, title=dict(standoff=15)
+)
+COMPACT_TEMPLATE = "pump_compact"
+pio.templates[COMPACT_TEMPLATE] = go.layout.Template(
+    layout=dict(
+        paper_bgcolor="white", plot_bgcolor="white", font=dict(color="#2a3f5f"),
+        colorway=pio.templates["plotly_white"].layout.colorway,
+        xaxis=_AXIS_STYLE, yaxis=_AXIS_STYLE, **LAYOUT_DEFAULTS
+    ),
+    data=dict(scatter=[go.Scatter(**TRACE_DEFAULTS)], scattergl=[go.Scattergl(**TRACE_DEFAULTS)])
+)
+
+def _trace(trace_type, **kwargs):
+    """
+    Build a trace. In compact mode, coordinates are rounded to plain lists and
+    styling equal to TRACE_DEFAULTS is left to the shared template.
+    """
+    if not CHART_RENDERING["compact_payload"]:
+        return trace_type(**kwargs)
+    for axis in ["x", "y"]:
+        kwargs[axis] = np.round(np.asarray(kwargs[axis], dtype=np.float64), CHART_RENDERING["decimals"]).tolist()
+    for key, default in TRACE_DEFAULTS.items():
+        value = kwargs.get(key)
+        if isinstance(value, dict):
+            value = {k: v for k, v in value.items() if default.get(k) != v}
+            kwargs[key] = value
+        if value == default or value == {}:
+            kwargs.pop(key, None)
+    return trace_type(**kwargs)
+
+def _update_layout(fig: go.Figure, **layout) -> None:
+    """Apply a chart's layout on top of the compact template or plotly_white."""
+    if CHART_RENDERING["compact_payload"]:
+        layout = {k: v for k, v in layout.items() if LAYOUT_DEFAULTS.get(k) != v}
+        fig.update_layout(template=COMPACT_TEMPLATE, **layout)
+    else:
+        fig.update_layout(template="plotly_white", **layout)
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a curve with Largest-Triangle-Three-Buckets, keeping its shape.
+    
+    Args:
+        x (np.ndarray): X values, sorted ascending
+        y (np.ndarray): Y values
+        n_out (int): Number of points to keep (first and last are always kept)
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Downsampled (x, y)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    
+    bucket_size = (n - 2) / (n_out - 2)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    anchor = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        # Average of the next bucket (the last point for the final bucket)
+        next_end = min(max(int((i + 2) * bucket_size) + 1, end + 1), n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Keep the point forming the largest triangle with the anchor and that average
+        areas = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(areas))
+        keep[i + 1] = anchor
+    return x[keep], y[keep]
+
+def comparison_colors(n: int) -> List[str]:
+    """
+    Colors for n compared pumps: CHART_COLORS while they suffice, otherwise
+    n distinct colors sampled from CHART_RENDERING["large_colorscale"].
+    
+    Args:
+        n (int): Number of pumps
+    
+    Returns:
+        List[str]: One color per pump
+    """
+    if n <= len(CHART_COLORS):
+        return CHART_COLORS[:n]
+    return plotly.colors.sample_colorscale(
+        CHART_RENDERING["large_colorscale"], [i / (n - 1) for i in range(n)]
+    )
+
 def create_pump_curve_chart(
-    curve_data: pd.DataFrame,
+    curves: CurveStore,
     model_no: str,
     user_flow: Optional[float] = None,
     user_head: Optional[float] = None
@@ -16,7 +124,7 @@ def create_pump_curve_chart(
     Create an interactive pump curve chart using Plotly.
     
     Args:
-        curve_data (pd.DataFrame): Pump curve data
+        curves (CurveStore): Pump curves
         model_no (str): Model number of the pump
         user_flow (Optional[float]): User's flow rate
         user_head (Optional[float]): User's head value
@@ -25,74 +133,40 @@ def create_pump_curve_chart(
         Optional[go.Figure]: Plotly figure object or None if error
     """
     try:
-        # Extract head columns (columns ending with 'M')
-        head_columns = [col for col in curve_data.columns if col.endswith('M') and col not in ['Max Head(M)']]
-        
-        # Extract pressure columns (columns with 'Kg/cm²')
-        pressure_columns = [col for col in curve_data.columns if 'Kg/cm²' in col]
-        
         fig = go.Figure()
         
-        # Find the pump data
-        pump_data = curve_data[curve_data['Model No.'] == model_no]
+        # O(1) lookup of the model's points in the curve store
+        curve = curves.curve(model_no)
         
-        if pump_data.empty:
+        if curve is None:
             logger.warning(f"No data found for model {model_no}")
             return None
         
-        pump_row = pump_data.iloc[0]
-        
-        # Create head-flow curve
-        if head_columns:
-            flows = []
-            heads = []
-            
-            for col in head_columns:
-                try:
-                    head_value = float(col.replace('M', ''))
-                    flow_value = pd.to_numeric(pump_row[col], errors='coerce')
-                    if not pd.isna(flow_value) and flow_value > 0:
-                        flows.append(flow_value)
-                        heads.append(head_value)
-                except Exception as e:
-                    logger.warning(f"Error processing column {col}: {str(e)}")
-                    continue
-            
-            if flows and heads:
-                # Sort by flow for proper curve
-                sorted_data = sorted(zip(flows, heads))
-                flows, heads = zip(*sorted_data)
-                
-                fig.add_trace(go.Scatter(
-                    x=flows,
-                    y=heads,
-                    mode='lines+markers',
-                    name=f'{model_no} - Head Curve',
-                    line=dict(color='blue', width=3),
-                    marker=dict(size=8)
-                ))
+        # Create head-flow curve (points are stored sorted by flow)
+        flows, heads = lttb(*curve, CHART_RENDERING["max_points_per_curve"])
+        if len(flows):
+            fig.add_trace(_trace(go.Scatter,
+                x=flows,
+                y=heads,
+                mode='lines+markers',
+                name=f'{model_no} - Head Curve',
+                line=dict(color='blue', width=3),
+                marker=dict(size=8)
+            ))
         
         # Add pressure curves if available
-        if pressure_columns:
-            for i, col in enumerate(pressure_columns[:3]):  # Limit to 3 pressure curves
-                try:
-                    pressure_value = float(col.split('Kg/cm²')[0])
-                    flow_value = pd.to_numeric(pump_row[col], errors='coerce')
-                    if not pd.isna(flow_value) and flow_value > 0:
-                        fig.add_trace(go.Scatter(
-                            x=[flow_value],
-                            y=[pressure_value * 10],  # Convert kg/cm² to approximate meters
-                            mode='markers',
-                            name=f'{pressure_value} Kg/cm²',
-                            marker=dict(size=10, symbol='diamond')
-                        ))
-                except Exception as e:
-                    logger.warning(f"Error processing pressure column {col}: {str(e)}")
-                    continue
+        for flow_value, pressure_value in curves.pressure_markers(model_no):
+            fig.add_trace(_trace(go.Scatter,
+                x=[flow_value],
+                y=[pressure_value * 10],  # Convert kg/cm² to approximate meters
+                mode='markers',
+                name=f'{pressure_value} Kg/cm²',
+                marker=dict(size=10, symbol='diamond')
+            ))
         
         # Add user operating point if provided
         if user_flow and user_head and user_flow > 0 and user_head > 0:
-            fig.add_trace(go.Scatter(
+            fig.add_trace(_trace(go.Scatter,
                 x=[user_flow],
                 y=[user_head],
                 mode='markers',
@@ -102,14 +176,14 @@ def create_pump_curve_chart(
             ))
         
         # Update layout
-        fig.update_layout(
+        _update_layout(
+            fig,
             title=f'Performance Curve - {model_no}',
             xaxis_title='Flow Rate (LPM)',
             yaxis_title='Head (M)',
             hovermode='closest',
             showlegend=True,
-            height=500,
-            template='plotly_white'
+            height=500
         )
         
         return fig
@@ -119,7 +193,7 @@ def create_pump_curve_chart(
         return None
 
 def create_comparison_chart(
-    curve_data: pd.DataFrame,
+    curves: CurveStore,
     model_nos: List[str],
     user_flow: Optional[float] = None,
     user_head: Optional[float] = None
@@ -128,7 +202,7 @@ def create_comparison_chart(
     Create a comparison chart for multiple pumps.
     
     Args:
-        curve_data (pd.DataFrame): Pump curve data
+        curves (CurveStore): Pump curves
         model_nos (List[str]): List of model numbers to compare
         user_flow (Optional[float]): User's flow rate
         user_head (Optional[float]): User's head value
@@ -139,50 +213,33 @@ def create_comparison_chart(
     try:
         fig = go.Figure()
         
+        # Large comparisons switch to WebGL traces and thinner, marker-free lines
+        large = len(model_nos) > CHART_RENDERING["webgl_threshold"]
+        trace_type = go.Scattergl if large else go.Scatter
+        colors = comparison_colors(len(model_nos))
+        
         for i, model_no in enumerate(model_nos):
-            pump_data = curve_data[curve_data['Model No.'] == model_no]
+            curve = curves.curve(model_no)
             
-            if pump_data.empty:
+            if curve is None:
                 logger.warning(f"No data found for model {model_no}")
                 continue
                 
-            pump_row = pump_data.iloc[0]
-            color = CHART_COLORS[i % len(CHART_COLORS)]
-            
-            # Extract head columns
-            head_columns = [col for col in curve_data.columns if col.endswith('M') and col not in ['Max Head(M)']]
-            
-            flows = []
-            heads = []
+            flows, heads = lttb(*curve, CHART_RENDERING["max_points_per_curve"])
             
-            for col in head_columns:
-                try:
-                    head_value = float(col.replace('M', ''))
-                    flow_value = pd.to_numeric(pump_row[col], errors='coerce')
-                    if not pd.isna(flow_value) and flow_value > 0:
-                        flows.append(flow_value)
-                        heads.append(head_value)
-                except Exception as e:
-                    logger.warning(f"Error processing column {col}: {str(e)}")
-                    continue
-            
-            if flows and heads:
-                # Sort by flow for proper curve
-                sorted_data = sorted(zip(flows, heads))
-                flows, heads = zip(*sorted_data)
-                
-                fig.add_trace(go.Scatter(
+            if len(flows):
+                fig.add_trace(_trace(trace_type,
                     x=flows,
                     y=heads,
-                    mode='lines+markers',
+                    mode='lines' if large else 'lines+markers',
                     name=model_no,
-                    line=dict(color=color, width=3),
+                    line=dict(color=colors[i], width=2 if large else 3),
                     marker=dict(size=6)
                 ))
         
         # Add user operating point if provided
         if user_flow and user_head and user_flow > 0 and user_head > 0:
-            fig.add_trace(go.Scatter(
+            fig.add_trace(_trace(go.Scatter,
                 x=[user_flow],
                 y=[user_head],
                 mode='markers',
@@ -192,18 +249,47 @@ def create_comparison_chart(
             ))
         
         # Update layout
-        fig.update_layout(
+        _update_layout(
+            fig,
             title='Performance Comparison',
             xaxis_title='Flow Rate (LPM)',
             yaxis_title='Head (M)',
             hovermode='closest',
             showlegend=True,
-            height=500,
-            template='plotly_white'
+            height=500
         )
         
         return fig
         
     except Exception as e:
         logger.error(f"Error creating comparison chart: {str(e)}")
-        return None 
\ No newline at end of file
+        return None
+
+def create_pump_curve_charts(
+    curves: CurveStore,
+    model_nos: List[str],
+    user_flow: Optional[float] = None,
+    user_head: Optional[float] = None
+) -> Dict[str, Optional[go.Figure]]:
+    """
+    Create individual pump curve charts for several pumps.
+    From CHART_RENDERING["parallel_threshold"] pumps on, the figures are
+    built concurrently on a shared thread pool.
+    
+    Args:
+        curves (CurveStore): Pump curves
+        model_nos (List[str]): List of model numbers
+        user_flow (Optional[float]): User's flow rate
+        user_head (Optional[float]): User's head value
+    
+    Returns:
+        Dict[str, Optional[go.Figure]]: Figure per model (None if error), in input order
+    """
+    if len(model_nos) < CHART_RENDERING["parallel_threshold"]:
+        return {model_no: create_pump_curve_chart(curves, model_no, user_flow, user_head) for model_no in model_nos}
+    
+    futures = {
+        model_no: _chart_pool.submit(create_pump_curve_chart, curves, model_no, user_flow, user_head)
+        for model_no in model_nos
+    }
+    return {model_no: future.result() for model_no, future in futures.items()}